@@ -15,7 +15,7 @@ from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall, Message
 from loguru import logger
 
-from ..utils import get_datetime
+from ..utils import get_datetime, truncate_to_budget
 
 
 @C.register_op()
@@ -32,7 +32,8 @@ class ConductResearchOp(BaseAsyncToolOp):
     def __init__(
         self,
         max_react_tool_calls: int = 20,
-        max_content_len: int = 20000,
+        max_content_tokens: int = 12000,
+        max_content_len: int | None = None,
         language: str = "zh",
         **kwargs,
     ):
@@ -42,8 +43,10 @@ class ConductResearchOp(BaseAsyncToolOp):
             max_react_tool_calls: Maximum number of ReAct iterations
                 (LLM tool-using turns) before the loop is forcibly
                 terminated.
-            max_content_len: Hard limit on the length of tool and
-                answer content that is streamed back and stored.
+            max_content_tokens: Token limit (in the op's LLM tokenizer) on
+                tool and answer content that is streamed back and stored.
+            max_content_len: Optional additional character limit on the
+                same content.
             language: Output language passed to the base operator.
             **kwargs: Additional keyword arguments forwarded to
                 :class:`BaseAsyncToolOp`.
@@ -51,7 +54,12 @@ class ConductResearchOp(BaseAsyncToolOp):
 
         super().__init__(language=language, **kwargs)
         self.max_react_tool_calls: int = max_react_tool_calls
-        self.max_content_len: int = max_content_len
+        self.max_content_tokens: int = max_content_tokens
+        self.max_content_len: int | None = max_content_len
+
+    def truncate(self, content: str) -> str:
+        """Cut tool or answer content to the content budget."""
+        return truncate_to_budget(content, self.max_content_tokens, self.max_content_len, self._llm)
 
     def build_tool_call(self) -> ToolCall:
         """Describe how external callers should invoke this tool.
@@ -169,7 +177,7 @@ class ConductResearchOp(BaseAsyncToolOp):
                 messages.append(
                     Message(
                         role=Role.TOOL,
-                        content=op.output[: self.max_content_len],
+                        content=self.truncate(op.output),
                         tool_call_id=op.tool_call.id,
                     ),
                 )
@@ -196,7 +204,7 @@ class ConductResearchOp(BaseAsyncToolOp):
 
         logger.info(f"merge_messages={merge_messages}")
         assistant_message = await self.llm.achat(messages=merge_messages)
-        assistant_message.content = assistant_message.content[: self.max_content_len]
+        assistant_message.content = self.truncate(assistant_message.content)
         chunk_type: ChunkEnum = ChunkEnum.ANSWER if self.save_answer else ChunkEnum.THINK
         await self.context.add_stream_string_and_type(assistant_message.content, chunk_type)
         self.set_output(assistant_message.content)
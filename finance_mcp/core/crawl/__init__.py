@@ -5,20 +5,46 @@ third-party libraries such as `crawl4ai`.  The operators defined here are
 registered into the FlowLLM context and can be invoked by agents to:
 
 - Crawl arbitrary web pages and return their content in Markdown format.
+- Crawl many pages under per-domain concurrency and rate limits.
 - Build longer text responses suitable for downstream LLM consumption.
+- Select named crawl profiles that block resources and prune pages.
+- Fetch server-rendered pages over plain HTTP, falling back to a browser.
+- Share a pool of warm browsers across crawls.
+- Cache crawled pages under stable keys with per-domain freshness.
+- Verify Playwright browser installs once at service startup.
 - Construct well-formed URLs for data providers such as THS (10jqka).
 
 Only the main operation classes are exported in ``__all__`` so that other
 modules can perform clear and explicit imports.
 """
 
+from .browser_pool import BrowserPool, get_browser_pool
+from .playwright_preflight import ensure_playwright_browsers, playwright_browsers_ready
+from .crawl_cache import CrawlCache
+from .crawl_profiles import CRAWL_PROFILES, CrawlProfile, get_crawl_profile
+from .http_fetcher import HttpFetcher, get_http_fetcher, js_render_reason
 from .crawl4ai_op import Crawl4aiOp, Crawl4aiLongTextOp
+from .crawl4ai_batch_op import Crawl4aiBatchOp
+from .crawl_scheduler import DomainScheduler
 from .read_local_ths_op import ReadLocalThsOp
 from .ths_url_op import ThsUrlOp
 
 __all__ = [
+    "BrowserPool",
+    "get_browser_pool",
+    "CrawlCache",
+    "CRAWL_PROFILES",
+    "CrawlProfile",
+    "get_crawl_profile",
+    "HttpFetcher",
+    "get_http_fetcher",
+    "js_render_reason",
+    "ensure_playwright_browsers",
+    "playwright_browsers_ready",
     "Crawl4aiOp",
     "Crawl4aiLongTextOp",
+    "Crawl4aiBatchOp",
+    "DomainScheduler",
     "ThsUrlOp",
     "ReadLocalThsOp",
 ]
@@ -0,0 +1,243 @@
+"""Process-wide pool of warm crawl4ai browsers.
+
+Launching Chromium dominates the latency of a single crawl. ``BrowserPool``
+keeps ``size`` started :class:`AsyncWebCrawler` instances and lets up to
+``pages_per_browser`` crawls share each of them concurrently. A browser is
+closed and relaunched after ``max_pages_per_browser`` crawls (bounding
+memory growth of long-lived Chromium processes) or as soon as it fails in a
+way that suggests it is gone, so callers never see a dead browser twice.
+"""
+
+import asyncio
+import contextlib
+from typing import AsyncIterator, Dict, List
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+from loguru import logger
+
+from .crawl_profiles import block_resources_hook
+from ..utils import get_random_user_agent
+from ..utils.common_utils import close_on_loop
+
+# Error fragments that indicate the browser or its context has died.
+BROWSER_DEAD_MARKERS = (
+    "browser has been closed",
+    "target closed",
+    "target page, context or browser has been closed",
+    "connection closed",
+    "browser.new_context",
+)
+
+
+class _BrowserSlot:
+    """One pooled browser and its usage counters."""
+
+    def __init__(self, pages_per_browser: int):
+        self.crawler: AsyncWebCrawler | None = None
+        self.semaphore = asyncio.Semaphore(pages_per_browser)
+        self.lock = asyncio.Lock()
+        self.idle = asyncio.Event()
+        self.idle.set()
+        self.assigned: int = 0
+        self.active: int = 0
+        self.pages: int = 0
+        self.healthy: bool = True
+
+
+class BrowserPool:
+    """Pool of ``size`` warm browsers serving concurrent crawls.
+
+    Example:
+        ```python
+        pool = get_browser_pool()
+        result = await pool.arun("https://example.com", CrawlerRunConfig())
+        ```
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        pages_per_browser: int = 4,
+        max_pages_per_browser: int = 200,
+        **browser_kwargs,
+    ):
+        """Initialize the pool. Browsers are launched lazily or by ``start``.
+
+        Args:
+            size: Number of browser processes.
+            pages_per_browser: Concurrent crawls allowed per browser.
+            max_pages_per_browser: Crawls served by a browser before it is
+                relaunched.
+            **browser_kwargs: Overrides of the default ``BrowserConfig``.
+        """
+        self.size = size
+        self.pages_per_browser = pages_per_browser
+        self.max_pages_per_browser = max_pages_per_browser
+        self.browser_kwargs = browser_kwargs
+
+        self.slots: List[_BrowserSlot] = [_BrowserSlot(pages_per_browser) for _ in range(size)]
+        self.stats: Dict[str, int] = {"launched": 0, "recycled": 0, "failed": 0, "pages": 0}
+        self._closed: bool = False
+
+    def create_browser_config(self) -> BrowserConfig:
+        """Build the configuration of a newly launched browser."""
+        kwargs = {
+            "headless": True,
+            "java_script_enabled": True,
+            "user_agent": get_random_user_agent(),
+            "viewport": {"width": 1280, "height": 800},
+            "verbose": False,
+            **self.browser_kwargs,
+        }
+        return BrowserConfig(**kwargs)
+
+    async def _launch(self, slot: _BrowserSlot):
+        crawler = AsyncWebCrawler(config=self.create_browser_config())
+        # Crawl profiles pass their resource blocking rules through ``CrawlerRunConfig.shared_data``.
+        crawler.crawler_strategy.set_hook("on_page_context_created", block_resources_hook)
+        await crawler.start()
+        slot.crawler, slot.pages, slot.healthy = crawler, 0, True
+        self.stats["launched"] += 1
+
+    async def _shutdown(self, slot: _BrowserSlot):
+        crawler, slot.crawler = slot.crawler, None
+        if crawler is not None:
+            try:
+                await crawler.close()
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"failed to close browser: {e}")
+
+    def _worn_out(self, slot: _BrowserSlot) -> bool:
+        return slot.pages >= self.max_pages_per_browser or not slot.healthy
+
+    async def _ensure_ready(self, slot: _BrowserSlot):
+        """Launch the browser, or relaunch it once worn out or broken.
+
+        A browser due for relaunch first drains its in-flight crawls; new
+        crawls of the slot queue on the lock meanwhile.
+        """
+        async with slot.lock:
+            if slot.crawler is not None and self._worn_out(slot):
+                await slot.idle.wait()
+                await self._shutdown(slot)
+                self.stats["recycled"] += 1
+            if slot.crawler is None:
+                await self._launch(slot)
+
+    def _pick_slot(self) -> _BrowserSlot:
+        """Prefer the least loaded slot whose browser is not due for relaunch."""
+        return min(self.slots, key=lambda slot: (slot.crawler is not None and self._worn_out(slot), slot.assigned))
+
+    async def start(self) -> "BrowserPool":
+        """Launch all browsers concurrently."""
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+        await asyncio.gather(*[self._ensure_ready(slot) for slot in self.slots])
+        return self
+
+    @contextlib.asynccontextmanager
+    async def _acquire_slot(self) -> AsyncIterator[_BrowserSlot]:
+        if self._closed:
+            raise RuntimeError("BrowserPool is closed")
+
+        slot = self._pick_slot()
+        slot.assigned += 1
+        try:
+            async with slot.semaphore:
+                await self._ensure_ready(slot)
+                slot.active += 1
+                slot.idle.clear()
+                try:
+                    yield slot
+                except Exception as e:
+                    self._check_failure(slot, str(e))
+                    raise
+                finally:
+                    slot.active -= 1
+                    slot.pages += 1
+                    self.stats["pages"] += 1
+                    if slot.active == 0:
+                        slot.idle.set()
+        finally:
+            slot.assigned -= 1
+
+    def _check_failure(self, slot: _BrowserSlot, message: str):
+        """Schedule a relaunch of ``slot`` if ``message`` says its browser died."""
+        if any(marker in message.lower() for marker in BROWSER_DEAD_MARKERS):
+            logger.warning(f"browser failed, scheduling relaunch: {message[:200]}")
+            slot.healthy = False
+            self.stats["failed"] += 1
+
+    @contextlib.asynccontextmanager
+    async def acquire(self) -> AsyncIterator[AsyncWebCrawler]:
+        """Borrow a warm crawler for one crawl."""
+        async with self._acquire_slot() as slot:
+            yield slot.crawler
+
+    async def arun(self, url: str, config=None):
+        """Crawl ``url`` on a pooled browser and return the crawl4ai result."""
+        async with self._acquire_slot() as slot:
+            result = await slot.crawler.arun(url=url, config=config)
+            # crawl4ai usually reports browser crashes as failed results.
+            if not getattr(result, "success", True):
+                self._check_failure(slot, str(getattr(result, "error_message", "") or ""))
+            return result
+
+    async def health_check(self) -> int:
+        """Probe idle browsers with a blank page and relaunch broken ones.
+
+        Returns:
+            Number of browsers that were relaunched.
+        """
+        relaunched = 0
+        for slot in self.slots:
+            if slot.crawler is None or slot.active:
+                continue
+            try:
+                result = await slot.crawler.arun(url="raw:<html><body></body></html>")
+                slot.healthy = bool(getattr(result, "success", True))
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"browser health check failed: {e}")
+                slot.healthy = False
+            if not slot.healthy:
+                await self._ensure_ready(slot)
+                relaunched += 1
+        return relaunched
+
+    async def close(self):
+        """Close all browsers. The pool cannot be used afterwards."""
+        self._closed = True
+        await asyncio.gather(*[self._shutdown(slot) for slot in self.slots])
+
+
+_default_pool: BrowserPool | None = None
+_default_pool_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get or create the default ``BrowserPool`` of the running event loop.
+
+    Browsers are bound to the loop they were launched on, so a new pool is
+    created when called from a different loop (e.g. successive
+    ``asyncio.run`` calls in scripts). The previous pool is closed on its own
+    loop; if that loop has already been closed, its browsers cannot be shut
+    down cleanly, so call :func:`close_browser_pool` before a loop ends.
+    """
+    global _default_pool, _default_pool_loop
+    loop = asyncio.get_running_loop()
+    if _default_pool is None or _default_pool_loop is not loop or _default_pool._closed:
+        if _default_pool is not None and not _default_pool._closed:
+            close_on_loop(_default_pool.close, _default_pool_loop, "browser pool")
+        _default_pool, _default_pool_loop = BrowserPool(), loop
+    return _default_pool
+
+
+async def close_browser_pool():
+    """Close the default pool if it exists, on the loop it was created on."""
+    global _default_pool
+    if _default_pool is not None:
+        pool, _default_pool = _default_pool, None
+        if _default_pool_loop is asyncio.get_running_loop():
+            await pool.close()
+        else:
+            close_on_loop(pool.close, _default_pool_loop, "browser pool")
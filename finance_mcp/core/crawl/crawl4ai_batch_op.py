@@ -0,0 +1,204 @@
+"""Batch crawling of many URLs with per-domain politeness.
+
+:class:`Crawl4aiBatchOp` crawls a list of URLs, or the THS pages of a list
+of stock codes, on the shared browser pool. Crawls are admitted by a
+:class:`~finance_mcp.core.crawl.crawl_scheduler.DomainScheduler`, so each
+site sees bounded concurrency and an adaptive request rate. Pages that look
+blocked or empty are retried after the domain has backed off, and each
+result is streamed as soon as it completes.
+"""
+
+import asyncio
+import json
+import re
+import weakref
+from typing import Dict, List, Optional
+
+from flowllm.core.context import C
+from flowllm.core.enumeration import ChunkEnum
+from flowllm.core.schema import ToolCall
+
+from .crawl4ai_op import Crawl4aiOp
+from .crawl_scheduler import DomainScheduler
+from .ths_url_op import ths_url
+
+# Page fragments served instead of content when a site throttles crawlers.
+BLOCK_MARKERS = ("访问频繁", "验证码", "请求过于频繁", "access denied", "captcha", "too many requests")
+
+# Status codes that indicate throttling rather than a missing page.
+BLOCK_STATUS_CODES = (403, 429, 503)
+
+# Status codes of pages that do not exist; never retried.
+MISSING_STATUS_CODES = (404, 410)
+
+
+@C.register_op()
+class Crawl4aiBatchOp(Crawl4aiOp):
+    """Crawl many URLs concurrently under per-domain rate limits.
+
+    Inputs are ``urls`` and/or ``codes`` with ``tags``; each code expands to
+    one THS page per tag, or to its THS index page when no tags are given. The output is a JSON list with one
+    ``{"url", "success", "content" | "error"}`` item per URL, in input order.
+    When the flow streams, every item is also emitted as a ``TOOL`` chunk as
+    soon as its crawl finishes.
+
+    Parameters
+    ----------
+    domain_concurrency:
+        Crawls of the same domain in flight at once.
+    min_interval:
+        Minimum seconds between crawl starts on one domain.
+    max_interval:
+        Upper bound of the backed-off interval of a domain.
+    max_retries:
+        Retries of a blocked or empty page.
+    min_content_chars:
+        Pages with less Markdown than this are treated as empty.
+    **kwargs:
+        Forwarded to :class:`Crawl4aiOp`.
+    """
+
+    # Schedulers shared by all batches of an event loop, keyed by their limits.
+    _schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, DomainScheduler]]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(
+        self,
+        domain_concurrency: int = 2,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        max_retries: int = 2,
+        min_content_chars: int = 200,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.domain_concurrency: int = domain_concurrency
+        self.min_interval: float = min_interval
+        self.max_interval: float = max_interval
+        self.max_retries: int = max_retries
+        self.min_content_chars: int = min_content_chars
+
+    def build_tool_call(self) -> ToolCall:
+        """Describe the batch crawl tool."""
+        return ToolCall(
+            **{
+                "description": "Crawl the content of many URLs, or of the THS pages of many stocks, using crawl4ai.",
+                "input_schema": {
+                    "urls": {
+                        "type": "string",
+                        "description": "urls to be crawled, separated by commas or newlines",
+                        "required": False,
+                    },
+                    "codes": {
+                        "type": "string",
+                        "description": "A-share stock codes whose THS pages are crawled, separated by commas",
+                        "required": False,
+                    },
+                    "tags": {
+                        "type": "string",
+                        "description": "THS page tags crawled for every code, e.g. 'company,holder'",
+                        "required": False,
+                    },
+                },
+            },
+        )
+
+    @property
+    def scheduler(self) -> DomainScheduler:
+        """Domain scheduler shared with other batches using the same limits."""
+        schedulers = self._schedulers.setdefault(asyncio.get_running_loop(), {})
+        key = (self.domain_concurrency, self.min_interval, self.max_interval)
+        if key not in schedulers:
+            schedulers[key] = DomainScheduler(
+                concurrency=self.domain_concurrency,
+                min_interval=self.min_interval,
+                max_interval=self.max_interval,
+            )
+        return schedulers[key]
+
+    @staticmethod
+    def split_items(value) -> List[str]:
+        """Split a list-like input given as a string or a list."""
+        if not value:
+            return []
+        if isinstance(value, str):
+            value = re.split(r"[,，;；\s]+", value)
+        return [str(v).strip() for v in value if str(v).strip()]
+
+    def build_urls(self) -> List[str]:
+        """Deduplicated URLs from ``urls`` and ``codes`` x ``tags``, in input order."""
+        urls = self.split_items(self.input_dict.get("urls"))
+        tags = self.split_items(self.input_dict.get("tags")) or [""]
+        urls += [ths_url(code, tag) for code in self.split_items(self.input_dict.get("codes")) for tag in tags]
+        return list(dict.fromkeys(urls))
+
+    def block_reason(self, result, error: str = "") -> Optional[str]:
+        """Why a crawl should be retried after backing off, or ``None`` if it succeeded."""
+        if error:
+            return error
+        status_code = getattr(result, "status_code", None)
+        if status_code in BLOCK_STATUS_CODES:
+            return f"status {status_code}"
+        if not getattr(result, "success", True):
+            return getattr(result, "error_message", "") or "crawl failed"
+        markdown = (result.markdown or "").strip()
+        if len(markdown) < self.min_content_chars:
+            return "empty page"
+        head = markdown[:2000].lower()
+        if any(marker in head for marker in BLOCK_MARKERS):
+            return "blocked page"
+        return None
+
+    async def crawl_one(self, url: str, options: dict) -> dict:
+        """Crawl one URL with cache lookup, scheduling and retries."""
+        if self.enable_cache:
+            cached_content, is_stale = self.crawl_cache.load(url, options)
+            if cached_content is not None:
+                if is_stale:
+                    self.revalidate(url, options)
+                return {"url": url, "success": True, "content": cached_content}
+
+        reason = ""
+        for _ in range(self.max_retries + 1):
+            result, error = None, ""
+            async with self.scheduler.slot(url):
+                try:
+                    result = await self.fetch(url, options)
+                except Exception as e:  # noqa: BLE001
+                    error = f"{type(e).__name__}: {e}"
+
+            # A missing page is final and says nothing about throttling.
+            if getattr(result, "status_code", None) in MISSING_STATUS_CODES:
+                self.scheduler.report(url, blocked=False)
+                return {"url": url, "success": False, "error": f"status {result.status_code}"}
+
+            reason = self.block_reason(result, error)
+            self.scheduler.report(url, blocked=reason is not None)
+            if reason is None:
+                # Cleaning, pruning and tokenizing are CPU-bound; keep them off the event loop, as crawl() does.
+                content = await asyncio.to_thread(self.to_content, result)
+                if self.enable_cache:
+                    self.crawl_cache.save(url, options, content)
+                return {"url": url, "success": True, "content": content}
+
+        return {"url": url, "success": False, "error": reason}
+
+    async def async_execute(self):
+        """Crawl all URLs and stream each result as it completes."""
+        urls = self.build_urls()
+        if not urls:
+            raise ValueError("Crawl4aiBatchOp requires `urls` or `codes`")
+
+        options = self.crawler_options()
+        tasks = [asyncio.create_task(self.crawl_one(url, options)) for url in urls]
+        try:
+            for future in asyncio.as_completed(tasks):
+                item = await future
+                if self.context.stream_queue is not None:
+                    await self.context.add_stream_string_and_type(json.dumps(item, ensure_ascii=False), ChunkEnum.TOOL)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        self.set_output(json.dumps([task.result() for task in tasks], ensure_ascii=False))
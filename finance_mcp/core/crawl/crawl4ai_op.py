@@ -9,23 +9,32 @@ fetches the content of a single URL and returns a Markdown representation of
 the page.  :class:`Crawl4aiLongTextOp` is a thin specialization intended for
 long-text outputs.
 
-The implementation also handles Playwright browser installation on demand and
-adds a small caching layer based on the parent :class:`BaseAsyncToolOp`.
+Pages are first fetched with a plain HTTP GET; only pages that need
+JavaScript are rendered on the warm browsers of the shared
+:class:`~finance_mcp.core.crawl.browser_pool.BrowserPool`. Playwright browsers
+are verified once per process, normally by the service preflight, and the
+module adds a caching layer based on the parent :class:`BaseAsyncToolOp`.
 """
 import asyncio
 import warnings
+from typing import Dict, List
 
 from loguru import logger
 from pydantic.warnings import PydanticDeprecatedSince20
 
 warnings.filterwarnings("ignore", category=PydanticDeprecatedSince20)
 
-from crawl4ai import BrowserConfig, CrawlerRunConfig, CacheMode, AsyncWebCrawler
+from crawl4ai import CrawlerRunConfig, CacheMode
 from flowllm.core.context import C
 from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall
 
-from ..utils import get_random_user_agent
+from ..utils import truncate_to_budget
+from .browser_pool import get_browser_pool
+from .crawl_cache import CrawlCache
+from .crawl_profiles import CrawlProfile, get_crawl_profile
+from .http_fetcher import HttpFetcher, HttpPage, get_http_fetcher, js_render_reason
+from .playwright_preflight import ensure_playwright_browsers, playwright_browsers_ready
 
 
 @C.register_op()
@@ -35,32 +44,69 @@ class Crawl4aiOp(BaseAsyncToolOp):
     The operation relies on the `crawl4ai` asynchronous crawler and integrates
     with FlowLLM as a tool operation.  It supports:
 
-    - Optional caching of responses via the base ``BaseAsyncToolOp`` cache.
-    - Configurable maximum length of the returned Markdown string.
-    - Lazy initialization of Playwright and automatic browser installation if
-      the required runtime is missing.
+    - Optional caching of responses in a :class:`CrawlCache` on top of the
+      base ``BaseAsyncToolOp`` cache, keyed by normalized URL and crawler
+      options, with per-domain TTLs and stale-while-revalidate.
+    - A token budget for the returned Markdown, counted with the tokenizer
+      of the op's (downstream) LLM.
+    - Named crawl profiles (see :mod:`.crawl_profiles`) that block
+      non-essential resources and prune pages down to their data sections.
+    - An HTTP-first fetch tier: pages are fetched with a plain GET and only
+      rendered in a warm browser from the process-wide pool when they need
+      JavaScript.
+    - A one-off Playwright browser check (with installation if missing) when
+      the service preflight has not already verified the browsers.
 
     Parameters
     ----------
+    max_content_tokens:
+        Maximum number of tokens of the crawled content to include in the
+        final result. ``None`` disables the token limit, e.g. for HTML handed
+        to a table parser, which must see whole tables.
     max_content_char_length:
-        Maximum number of characters from the crawled Markdown content to
-        include in the final result.
+        Optional additional character cap on the final result.
     enable_cache:
-        Whether to enable caching of results based on the URL hash.
+        Whether to enable caching of results.
     cache_expire_hours:
-        Cache expiration time in hours when caching is enabled.
+        Freshness in hours of pages from domains without an entry in
+        ``domain_ttl_hours``.
+    stale_hours:
+        How long after its freshness ends a cached page is still served
+        (and refreshed in the background). ``0`` disables stale serving.
+    domain_ttl_hours:
+        Per-domain freshness overriding :attr:`CrawlCache.DEFAULT_DOMAIN_TTL_HOURS`.
+    fetch_mode:
+        ``"auto"`` tries HTTP first and falls back to the browser, ``"http"``
+        never launches a browser and ``"browser"`` always renders.
+    browser_url_patterns:
+        Regexes of URLs that always need the browser in ``"auto"`` mode.
+    min_http_content_chars:
+        HTTP results with less Markdown than this fall back to the browser.
+    profile:
+        Name of the crawl profile, e.g. ``"ths"`` for THS F10 pages.
+    content_selector:
+        CSS selector of the content, tried before the profile's selectors.
+    output_format:
+        ``"markdown"`` (default) or ``"html"``, which returns the cleaned and
+        pruned HTML for structured parsers such as the THS table parser.
     **kwargs:
         Additional keyword arguments forwarded to :class:`BaseAsyncToolOp`.
     """
 
-    # Class variable to track if playwright has been installed
-    _playwright_installed = False
-
     def __init__(
         self,
-        max_content_char_length: int = 50000,
+        max_content_tokens: int | None = 32000,
+        max_content_char_length: int | None = None,
         enable_cache: bool = True,
         cache_expire_hours: float = 1,
+        stale_hours: float = 24,
+        domain_ttl_hours: Dict[str, float] | None = None,
+        fetch_mode: str = "auto",
+        browser_url_patterns: List[str] | None = None,
+        min_http_content_chars: int = 200,
+        profile: str = "default",
+        content_selector: str = "",
+        output_format: str = "markdown",
         **kwargs,
     ):
 
@@ -71,10 +117,54 @@ class Crawl4aiOp(BaseAsyncToolOp):
         )
 
         # Maximal length safeguard to avoid over-long responses in downstream LLMs.
-        self.max_content_char_length: int = max_content_char_length
-        # These configs are initialized lazily in ``async_execute``.
-        self.browser_config = None
+        self.max_content_tokens: int | None = max_content_tokens
+        self.max_content_char_length: int | None = max_content_char_length
+        self.stale_hours: float = stale_hours
+        self.domain_ttl_hours: Dict[str, float] | None = domain_ttl_hours
+        if fetch_mode not in ("auto", "http", "browser"):
+            raise ValueError(f"unknown fetch_mode: {fetch_mode}")
+        self.fetch_mode: str = fetch_mode
+        self.browser_url_patterns: List[str] = browser_url_patterns or []
+        self.min_http_content_chars: int = min_http_content_chars
+        self.profile: CrawlProfile = get_crawl_profile(profile)
+        self.content_selector: str = content_selector
+        if output_format not in ("markdown", "html"):
+            raise ValueError(f"unknown output_format: {output_format}")
+        self.output_format: str = output_format
+        # Initialized lazily in ``async_execute``; browsers come from the shared pool.
         self.crawler_config = None
+        self._crawl_cache: CrawlCache | None = None
+
+    # Background refreshes of stale pages, keyed by cache key; holds task references.
+    _revalidating: Dict[str, asyncio.Task] = {}
+
+    @property
+    def crawl_cache(self) -> CrawlCache:
+        """Page cache stored in this op's ``cache`` directory."""
+        if self._crawl_cache is None:
+            self._crawl_cache = CrawlCache(
+                self.cache,
+                default_ttl_hours=self.cache_expire_hours,
+                stale_hours=self.stale_hours,
+                domain_ttl_hours=self.domain_ttl_hours,
+            )
+        return self._crawl_cache
+
+    def crawler_options(self) -> dict:
+        """Options that shape the returned content; part of the cache key."""
+        return {
+            "fetch_mode": self.fetch_mode,
+            "profile": self.profile.name,
+            "content_selector": self.content_selector,
+            "output_format": self.output_format,
+            "crawler_config": {
+                "cache_mode": CacheMode.BYPASS,
+                "verbose": True,
+                "shared_data": self.profile.shared_data(),
+            },
+            "max_content_tokens": self.max_content_tokens,
+            "max_content_char_length": self.max_content_char_length,
+        }
 
     def build_tool_call(self) -> ToolCall:
         """Build the :class:`ToolCall` schema used to describe this operation.
@@ -103,56 +193,113 @@ class Crawl4aiOp(BaseAsyncToolOp):
         -----
         1. Read the target URL from ``self.input_dict``.
         2. If caching is enabled, try to load a cached response.
-        3. Initialize crawler configuration and ensure Playwright is available.
-        4. Use :class:`AsyncWebCrawler` to fetch the page and extract Markdown.
-        5. Truncate the content to ``max_content_char_length`` and save it as
+        3. Fetch the page over HTTP and convert it to Markdown.
+        4. If the page needs JavaScript, ensure Playwright is available and
+           render it on a pooled browser instead.
+        5. Truncate the content to ``max_content_tokens`` and save it as
            both tool output and (optionally) a cached entry.
         """
         url: str = self.input_dict["url"]
+        options = self.crawler_options()
 
         if self.enable_cache:
-            cached_result = self.cache.load(hash(url))
-            if cached_result:
-                self.set_output(cached_result["response_content"])
+            cached_content, is_stale = self.crawl_cache.load(url, options)
+            if cached_content is not None:
+                if is_stale:
+                    self.revalidate(url, options)
+                self.set_output(cached_content)
                 return
 
-        # Initialize configs lazily to avoid unnecessary browser startup
-        self.browser_config = BrowserConfig(
-            headless=True,
-            java_script_enabled=True,
-            user_agent=get_random_user_agent(),
-            viewport={"width": 1280, "height": 800},
-            verbose=True,
-        )
+        response_content = await self.crawl(url, options)
+        if self.enable_cache and response_content:
+            self.crawl_cache.save(url, options, response_content)
 
-        self.crawler_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, verbose=True)
+        self.set_output(response_content)
 
-        # Install playwright only once using class variable
-        if not Crawl4aiOp._playwright_installed:
-            process = await asyncio.create_subprocess_exec(
-                "playwright",
-                "install",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await process.communicate()
-            logger.info(f"Playwright installation completed with exit stdout={stdout} stderr={stderr}")
-            Crawl4aiOp._playwright_installed = True
+    async def fetch(self, url: str, options: dict):
+        """Fetch ``url`` over HTTP when possible, otherwise on a pooled browser.
 
-        # Run the asynchronous crawl and capture the Markdown content.
-        async with AsyncWebCrawler(config=self.browser_config) as crawler:
-            result = await crawler.arun(url=url, config=self.crawler_config)
-            response_content = result.markdown[: self.max_content_char_length]
-
-            final_result = {
-                "url": url,
-                "response_content": response_content,
-            }
+        Returns:
+            An :class:`~finance_mcp.core.crawl.http_fetcher.HttpPage` or a
+            crawl4ai result; both expose ``success``, ``status_code``,
+            ``markdown`` and ``error_message``.
+        """
+        if options["fetch_mode"] != "browser":
+            page = await get_http_fetcher().get(url, prune=self.prune if self.prunes else None)
+            reason = js_render_reason(url, page, self.min_http_content_chars, self.browser_url_patterns)
+            if reason is None or options["fetch_mode"] == "http":
+                return page
+            logger.info(f"{self.name} falls back to browser for {url}: {reason}")
+
+        self.crawler_config = CrawlerRunConfig(**options["crawler_config"])
+
+        # Normally verified by the service preflight; scripts fall back to a one-off check here.
+        if not playwright_browsers_ready():
+            await ensure_playwright_browsers()
+
+        result = await get_browser_pool().arun(url, self.crawler_config)
+        if not self.prunes or not result.html:
+            return result
+
+        # Re-convert the rendered page so both tiers prune identically.
+        markdown = await asyncio.to_thread(get_http_fetcher().convert, result.html, url, self.prune)
+        return HttpPage(
+            url,
+            status_code=result.status_code or 200,
+            html=result.html,
+            markdown=markdown,
+            error_message="" if result.success else (result.error_message or "crawl failed"),
+        )
 
-            if self.enable_cache:
-                self.cache.save(hash(url), final_result, expire_hours=self.cache_expire_hours)
+    @property
+    def prunes(self) -> bool:
+        """Whether the profile or ``content_selector`` narrows the page content."""
+        return self.profile.prunes or bool(self.content_selector)
+
+    def prune(self, html: str, url: str) -> str:
+        """Apply the crawl profile and ``content_selector`` to a page."""
+        extra = [self.content_selector] if self.content_selector else []
+        return self.profile.prune(html, url, extra)
+
+    def to_content(self, result) -> str:
+        """Markdown (or pruned HTML) of a crawl result truncated to the content budget."""
+        if self.output_format == "markdown":
+            content = result.markdown or ""
+        elif not result.success or not result.html:
+            content = ""
+        else:
+            content = HttpFetcher.clean_html(result.html)
+            if self.prunes:
+                content = self.prune(content, result.url)
+        return truncate_to_budget(
+            content,
+            self.max_content_tokens,
+            self.max_content_char_length,
+            self._llm,
+        )
 
-            self.set_output(response_content)
+    async def crawl(self, url: str, options: dict) -> str:
+        """Fetch ``url`` and return its content truncated to the content budget."""
+        result = await self.fetch(url, options)
+        return await asyncio.to_thread(self.to_content, result)
+
+    def revalidate(self, url: str, options: dict):
+        """Refresh a stale cached page in the background, once per key at a time."""
+        key = self.crawl_cache.make_key(url, options)
+        if key in Crawl4aiOp._revalidating:
+            return
+
+        async def refresh():
+            try:
+                content = await self.crawl(url, options)
+                if content:
+                    self.crawl_cache.save(url, options, content)
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"revalidation of {url} failed: {e}")
+            finally:
+                Crawl4aiOp._revalidating.pop(key, None)
+
+        Crawl4aiOp._revalidating[key] = asyncio.create_task(refresh())
 
 
 @C.register_op()
@@ -0,0 +1,141 @@
+"""Persistent cache of crawled pages with stable keys.
+
+Entries are stored in a FlowLLM :class:`CacheHandler` in two parts:
+
+* ``page_{digest}`` – a small index entry per (normalized URL, crawler
+  options) pair, recording the content hash and when the page stops being
+  fresh.
+* ``content_{sha256}`` – the Markdown itself, shared by every page with the
+  same content so mirrors and redirects are stored once.
+
+A page is fresh for the TTL of its domain. After that it is kept for
+``stale_hours`` more, during which it can still be served while the caller
+refreshes it in the background (stale-while-revalidate).
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from flowllm.core.storage.cache_handler import CacheHandler
+
+
+class CrawlCache:
+    """Crawl result cache keyed by normalized URL and crawler options."""
+
+    # Freshness per registrable domain; subdomains inherit the entry.
+    DEFAULT_DOMAIN_TTL_HOURS: Dict[str, float] = {
+        # THS company pages are refreshed once per trading day.
+        "10jqka.com.cn": 24,
+        # News sites update within the hour.
+        "eastmoney.com": 1,
+        "sina.com.cn": 1,
+        "cls.cn": 1,
+        "yicai.com": 1,
+        "stcn.com": 1,
+        "cnstock.com": 1,
+        "jrj.com.cn": 1,
+    }
+
+    # Query parameters that never change the page content.
+    TRACKING_PARAMS = frozenset({"spm", "from", "share_token", "gclid", "fbclid"})
+
+    def __init__(
+        self,
+        cache: CacheHandler,
+        default_ttl_hours: float = 1,
+        stale_hours: float = 24,
+        domain_ttl_hours: Dict[str, float] | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache: Storage backend, usually the op's ``self.cache``.
+            default_ttl_hours: Freshness of domains without an explicit TTL.
+            stale_hours: How long an expired page may still be served while
+                it is revalidated. ``0`` disables stale serving.
+            domain_ttl_hours: Per-domain override of ``default_ttl_hours``.
+        """
+        self.cache = cache
+        self.default_ttl_hours = default_ttl_hours
+        self.stale_hours = stale_hours
+        self.domain_ttl_hours: Dict[str, float] = {**self.DEFAULT_DOMAIN_TTL_HOURS, **(domain_ttl_hours or {})}
+
+    @classmethod
+    def normalize_url(cls, url: str) -> str:
+        """Canonical form of ``url`` so equivalent spellings share a cache entry.
+
+        Lower-cases scheme and host, drops default ports, fragments and
+        tracking parameters, and sorts the query string.
+        """
+        parts = urlsplit(url.strip())
+        scheme = (parts.scheme or "http").lower()
+        host = (parts.hostname or "").lower()
+        if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+            host = f"{host}:{parts.port}"
+        query = sorted(
+            (k, v)
+            for k, v in parse_qsl(parts.query, keep_blank_values=True)
+            if k not in cls.TRACKING_PARAMS and not k.startswith("utm_")
+        )
+        return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+    @staticmethod
+    def options_digest(options: dict) -> str:
+        """Digest of the crawler options that influence the cached content."""
+        payload = json.dumps(options, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def make_key(self, url: str, options: dict) -> str:
+        """Stable cache key, identical across processes and restarts."""
+        payload = f"{self.normalize_url(url)}|{self.options_digest(options)}"
+        return f"page_{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+    def ttl_hours(self, url: str) -> float:
+        """Freshness of ``url``, from the most specific matching domain."""
+        host = (urlsplit(url.strip()).hostname or "").lower()
+        labels = host.split(".")
+        for i in range(len(labels)):
+            ttl = self.domain_ttl_hours.get(".".join(labels[i:]))
+            if ttl is not None:
+                return ttl
+        return self.default_ttl_hours
+
+    def load(self, url: str, options: dict) -> Tuple[Optional[str], bool]:
+        """Look up a crawled page.
+
+        Returns:
+            ``(content, is_stale)``; ``content`` is ``None`` on a miss.
+        """
+        entry = self.cache.load(self.make_key(url, options))
+        if not entry:
+            return None, False
+
+        content = self.cache.load(f"content_{entry['content_hash']}")
+        if content is None:
+            return None, False
+        return content, datetime.now() >= datetime.fromisoformat(entry["fresh_until"])
+
+    def save(self, url: str, options: dict, content: str):
+        """Store ``content`` for ``url``, reusing an identical stored page."""
+        now = datetime.now()
+        ttl = self.ttl_hours(url)
+        keep_hours = ttl + self.stale_hours
+
+        content_hash = hashlib.sha256(content.encode("utf-8")).hexdigest()
+        content_key = f"content_{content_hash}"
+        info = self.cache.get_info(content_key)
+        keep_until = (now + timedelta(hours=keep_hours)).isoformat()
+        # Rewrite shared content only when it would expire before this page.
+        if not info or info["is_expired"] or (info["expire_time"] or keep_until) < keep_until:
+            self.cache.save(content_key, content, expire_hours=keep_hours)
+
+        entry = {
+            "url": self.normalize_url(url),
+            "content_hash": content_hash,
+            "fetched_at": now.isoformat(),
+            "fresh_until": (now + timedelta(hours=ttl)).isoformat(),
+        }
+        self.cache.save(self.make_key(url, options), entry, expire_hours=keep_hours)
@@ -0,0 +1,175 @@
+"""Named crawl profiles: resource blocking and content pruning.
+
+A :class:`CrawlProfile` tells the crawl ops what to skip while loading a page
+and what to keep of it afterwards:
+
+* ``block_resources`` / ``block_url_patterns`` abort requests for resource
+  types (images, fonts, ...) and trackers in the browser tier, so pages
+  load faster and use less bandwidth.
+* ``content_selectors`` (and per-tag ``tag_selectors``) pick the data
+  sections of a page; candidates are tried in order and the first one that
+  matches wins, so an outdated selector degrades to the next candidate
+  instead of an empty page.
+* ``excluded_selectors`` / ``excluded_tags`` strip navigation and other
+  boilerplate before the page is converted to Markdown.
+
+Profiles are selected per flow, e.g. ``Crawl4aiLongTextOp(profile="ths")``.
+"""
+
+import re
+from typing import Dict, List, Sequence
+from urllib.parse import urlsplit
+
+from lxml import html as lxml_html
+
+# Resource types that never carry text content.
+NON_ESSENTIAL_RESOURCES = ("image", "media", "font", "stylesheet")
+
+# Analytics and ad hosts common on Chinese finance sites.
+TRACKER_URL_PATTERNS = (
+    r"hm\.baidu\.com",
+    r"cnzz\.com",
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"doubleclick\.net",
+)
+
+
+class CrawlProfile:
+    """Resource blocking and pruning rules applied to one crawl."""
+
+    def __init__(
+        self,
+        name: str,
+        block_resources: Sequence[str] = (),
+        block_url_patterns: Sequence[str] = (),
+        content_selectors: Sequence[str] = (),
+        tag_selectors: Dict[str, Sequence[str]] | None = None,
+        excluded_selectors: Sequence[str] = (),
+        excluded_tags: Sequence[str] = (),
+    ):
+        """Initialize the profile.
+
+        Args:
+            name: Profile name used in flow configs and cache keys.
+            block_resources: Playwright resource types aborted by the browser.
+            block_url_patterns: Regexes of request URLs aborted by the browser.
+            content_selectors: Candidate CSS selectors of the content, in order.
+            tag_selectors: Candidate selectors per page tag (the last path
+                segment without extension, e.g. ``holder`` for
+                ``.../600519/holder.html``), tried before ``content_selectors``.
+            excluded_selectors: CSS selectors of boilerplate to remove.
+            excluded_tags: Tag names to remove.
+        """
+        self.name = name
+        self.block_resources: List[str] = list(block_resources)
+        self.block_url_patterns: List[str] = list(block_url_patterns)
+        self.content_selectors: List[str] = list(content_selectors)
+        self.tag_selectors: Dict[str, List[str]] = {k: list(v) for k, v in (tag_selectors or {}).items()}
+        self.excluded_selectors: List[str] = list(excluded_selectors)
+        self.excluded_tags: List[str] = list(excluded_tags)
+
+    @property
+    def prunes(self) -> bool:
+        """Whether the profile changes the page content at all."""
+        return bool(self.content_selectors or self.tag_selectors or self.excluded_selectors or self.excluded_tags)
+
+    @staticmethod
+    def page_tag(url: str) -> str:
+        """Last path segment of ``url`` without its extension."""
+        segment = urlsplit(url).path.rstrip("/").rsplit("/", 1)[-1]
+        return segment.split(".", 1)[0]
+
+    def selectors_for(self, url: str, extra: Sequence[str] = ()) -> List[str]:
+        """Candidate content selectors for ``url``, most specific first."""
+        return [*extra, *self.tag_selectors.get(self.page_tag(url), []), *self.content_selectors]
+
+    def shared_data(self) -> dict:
+        """Blocking rules handed to the browser page hook via ``CrawlerRunConfig.shared_data``."""
+        return {"block_resources": self.block_resources, "block_url_patterns": self.block_url_patterns}
+
+    def prune(self, html: str, url: str, extra_selectors: Sequence[str] = ()) -> str:
+        """Strip boilerplate from ``html`` and keep the first matching content sections."""
+        if not html.strip():
+            return html
+        tree = lxml_html.fromstring(html)
+
+        removed = list(tree.iter(*self.excluded_tags)) if self.excluded_tags else []
+        for selector in self.excluded_selectors:
+            removed.extend(tree.cssselect(selector))
+        for element in removed:
+            if element.getparent() is not None:
+                element.drop_tree()
+
+        for selector in self.selectors_for(url, extra_selectors):
+            matches = tree.cssselect(selector)
+            if matches:
+                parts = "".join(lxml_html.tostring(m, encoding="unicode") for m in matches)
+                return f"<html><body>{parts}</body></html>"
+        return lxml_html.tostring(tree, encoding="unicode")
+
+
+CRAWL_PROFILES: Dict[str, CrawlProfile] = {
+    # Load everything and keep the whole page.
+    "default": CrawlProfile("default"),
+    # Generic text extraction: skip heavy resources and page chrome.
+    "lite": CrawlProfile(
+        "lite",
+        block_resources=NON_ESSENTIAL_RESOURCES,
+        block_url_patterns=TRACKER_URL_PATTERNS,
+        excluded_tags=("nav", "header", "footer", "aside", "form"),
+    ),
+    # THS F10 pages (basic.10jqka.com.cn): every tab keeps its sections in
+    # ``div.m_box`` blocks with a stable id. ``tag_selectors`` keep only the
+    # data sections of a tab, in page order, and drop the rest (related stocks,
+    # hot lists, ...); tabs without an entry, or whose ids all changed, fall
+    # back to every ``div.m_box``.
+    "ths": CrawlProfile(
+        "ths",
+        block_resources=NON_ESSENTIAL_RESOURCES,
+        block_url_patterns=(*TRACKER_URL_PATTERNS, r"stat\.10jqka\.com\.cn", r"\.10jqka\.com\.cn/.*/ad"),
+        content_selectors=("div.m_box", "#main"),
+        tag_selectors={
+            # 详细情况, 高管介绍, 发行相关, 参控股公司
+            "company": ("#detail, #manager, #publish, #share",),
+            # 股东人数, 十大流通股东, 十大股东, 十大债券持有人, 控股层级关系
+            "holder": ("#holdernum, #flowholder, #tenholder, #bondholder, #holdlevel, #holdcontrol",),
+            # 主营介绍, 运营业务数据, 主营构成分析, 主要客户及供应商, 董事会经营评述, 产品价格
+            "operate": ("#intro, #operate, #analysis, #customer, #review, #price",),
+            # 财务诊断, 财务指标, 指标变动说明, 资产负债构成, 财务报告, 杜邦分析
+            "finance": ("#diagnose, #keyindex, #change, #asset, #report, #dupont",),
+            # 解禁时间表, 总股本构成, A股结构图, 历次股本变动
+            "equity": ("#liftban, #stockcapit, #astockchart, #astockchange",),
+            # 分红诊断, 分红情况, 增发机构获配明细, 增发概况, 配股概况
+            "bonus": ("#bonusdiag, #bonus, #additionprofile, #addition, #allotment",),
+        },
+        excluded_selectors=(".header", ".footer", ".subnav", "#nav", ".m_nav", ".iwc_searchbar", ".ad", ".m_ad"),
+        excluded_tags=("nav", "form", "iframe"),
+    ),
+}
+
+
+def get_crawl_profile(name: str) -> CrawlProfile:
+    """Look up a registered profile by name."""
+    if name not in CRAWL_PROFILES:
+        raise ValueError(f"unknown crawl profile: {name}, available: {sorted(CRAWL_PROFILES)}")
+    return CRAWL_PROFILES[name]
+
+
+async def block_resources_hook(page, context=None, config=None, **kwargs):  # pylint: disable=unused-argument
+    """crawl4ai ``on_page_context_created`` hook aborting requests blocked by the crawl's profile."""
+    shared = getattr(config, "shared_data", None) or {}
+    resource_types = set(shared.get("block_resources") or ())
+    patterns = [re.compile(p) for p in shared.get("block_url_patterns") or ()]
+    if not resource_types and not patterns:
+        return page
+
+    async def handle(route):
+        request = route.request
+        if request.resource_type in resource_types or any(p.search(request.url) for p in patterns):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", handle)
+    return page
@@ -0,0 +1,101 @@
+"""Per-domain politeness scheduling for batch crawls.
+
+``DomainScheduler`` limits how many crawls of one domain run at a time and
+how often a new one may start. The start interval adapts per domain: it
+doubles (up to ``max_interval``) whenever a crawl looks blocked or empty and
+decays back towards ``min_interval`` on success, so a batch slows down only
+for the sites that push back.
+"""
+
+import asyncio
+import contextlib
+import time
+from typing import AsyncIterator, Dict
+from urllib.parse import urlsplit
+
+
+class _DomainState:
+    """Concurrency and pacing state of one domain."""
+
+    def __init__(self, concurrency: int, interval: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.lock = asyncio.Lock()
+        self.interval: float = interval
+        self.next_start: float = 0.0
+        self.blocked: int = 0
+
+
+class DomainScheduler:
+    """Admit crawls under per-domain concurrency and adaptive rate limits.
+
+    Example:
+        ```python
+        scheduler = DomainScheduler(concurrency=2, min_interval=1.0)
+        async with scheduler.slot(url):
+            result = await pool.arun(url, config)
+        scheduler.report(url, blocked=not result.success)
+        ```
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 2,
+        min_interval: float = 1.0,
+        max_interval: float = 60.0,
+        backoff_factor: float = 2.0,
+        recovery_factor: float = 0.8,
+    ):
+        """Initialize the scheduler.
+
+        Args:
+            concurrency: Crawls of one domain allowed in flight at once.
+            min_interval: Minimum seconds between crawl starts on a domain.
+            max_interval: Upper bound of the backed-off interval.
+            backoff_factor: Interval multiplier after a blocked crawl.
+            recovery_factor: Interval multiplier after a successful crawl.
+        """
+        self.concurrency = concurrency
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self.recovery_factor = recovery_factor
+        self.domains: Dict[str, _DomainState] = {}
+
+    @staticmethod
+    def domain_of(url: str) -> str:
+        """Host name used to group crawls."""
+        return (urlsplit(url).hostname or "").lower()
+
+    def _state(self, url: str) -> _DomainState:
+        domain = self.domain_of(url)
+        if domain not in self.domains:
+            self.domains[domain] = _DomainState(self.concurrency, self.min_interval)
+        return self.domains[domain]
+
+    def interval(self, url: str) -> float:
+        """Current start interval of the domain of ``url``."""
+        return self._state(url).interval
+
+    @contextlib.asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Wait for a concurrency slot and the domain's next start time."""
+        state = self._state(url)
+        async with state.semaphore:
+            # Reserve start times in arrival order so waiters do not burst together.
+            async with state.lock:
+                now = time.monotonic()
+                start = max(now, state.next_start)
+                state.next_start = start + state.interval
+            if start > now:
+                await asyncio.sleep(start - now)
+            yield
+
+    def report(self, url: str, blocked: bool):
+        """Adapt the domain interval to the outcome of a crawl."""
+        state = self._state(url)
+        if blocked:
+            state.blocked += 1
+            state.interval = min(max(state.interval, self.min_interval, 0.1) * self.backoff_factor, self.max_interval)
+            state.next_start = max(state.next_start, time.monotonic() + state.interval)
+        else:
+            state.interval = max(state.interval * self.recovery_factor, self.min_interval)
@@ -0,0 +1,202 @@
+"""Browserless fetch tier: pooled HTTP GET plus HTML-to-Markdown conversion.
+
+Most THS sections and news articles are server-rendered, so a plain GET
+returns the same content a headless browser would, at a fraction of the CPU
+and latency. ``HttpFetcher`` performs that GET on a shared keep-alive
+``httpx`` pool and converts the page with crawl4ai's Markdown generator.
+``js_render_reason`` decides whether the result is usable or the page has to
+be rendered by the browser instead.
+"""
+
+import asyncio
+import re
+from typing import Callable, Optional, Sequence
+
+import httpx
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+from lxml import html as lxml_html
+
+from ..utils import get_random_user_agent
+from ..utils.common_utils import close_on_loop
+
+# Fragments of pages that only render their content with JavaScript.
+JS_REQUIRED_MARKERS = (
+    "enable javascript",
+    "javascript is disabled",
+    "javascript is required",
+    "请开启javascript",
+    "请启用javascript",
+    '<div id="root"></div>',
+    '<div id="app"></div>',
+)
+
+# Elements that never contribute readable content.
+_DROP_TAGS = ("script", "style", "noscript", "template", "svg", "iframe")
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+# Statuses returned as-is: the page is missing, a browser would not help.
+FINAL_STATUS_CODES = (404, 410)
+
+
+class HttpPage:
+    """Fetched page exposing the crawl4ai result fields used by the crawl ops."""
+
+    def __init__(
+        self,
+        url: str,
+        status_code: int | None = None,
+        html: str = "",
+        markdown: str = "",
+        error_message: str = "",
+    ):
+        self.url = url
+        self.status_code = status_code
+        self.html = html
+        self.markdown = markdown
+        self.error_message = error_message
+        self.success = not error_message and status_code is not None and 200 <= status_code < 300
+
+
+class HttpFetcher:
+    """Fetch pages over a shared keep-alive connection pool."""
+
+    def __init__(self, timeout: float = 15.0, max_connections: int = 64):
+        """Initialize the fetcher.
+
+        Args:
+            timeout: Request timeout in seconds.
+            max_connections: Size of the connection pool.
+        """
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            headers={
+                "User-Agent": get_random_user_agent(),
+                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+                "Accept-Language": "zh-CN,zh;q=0.9,en;q=0.8",
+            },
+        )
+        self.markdown_generator = DefaultMarkdownGenerator()
+
+    async def aclose(self):
+        """Close the connection pool."""
+        await self.client.aclose()
+
+    @staticmethod
+    def decode(response: httpx.Response) -> str:
+        """Decode the body, falling back to the page's ``<meta charset>`` (THS pages are GBK)."""
+        if response.charset_encoding:
+            return response.text
+        match = _META_CHARSET.search(response.content[:4096])
+        encoding = match.group(1).decode("ascii").lower() if match else "utf-8"
+        # GB18030 is a superset of the GB2312/GBK pages often mislabel.
+        if encoding in ("gb2312", "gbk"):
+            encoding = "gb18030"
+        try:
+            return response.content.decode(encoding, errors="replace")
+        except LookupError:
+            return response.content.decode("utf-8", errors="replace")
+
+    @staticmethod
+    def clean_html(html: str) -> str:
+        """Drop scripts, styles and other non-content elements."""
+        html = _XML_DECLARATION.sub("", html)
+        if not html.strip():
+            return ""
+        tree = lxml_html.fromstring(html)
+        for element in list(tree.iter(*_DROP_TAGS)):
+            element.drop_tree()
+        return lxml_html.tostring(tree, encoding="unicode")
+
+    def to_markdown(self, html: str, url: str) -> str:
+        """Convert cleaned HTML to Markdown like the browser tier does."""
+        return self.markdown_generator.generate_markdown(html, base_url=url).raw_markdown
+
+    def convert(self, html: str, url: str, prune: Callable[[str, str], str] | None = None) -> str:
+        """Clean ``html``, optionally prune it with ``prune(html, url)``, and convert it to Markdown."""
+        html = self.clean_html(html)
+        if prune is not None:
+            html = prune(html, url)
+        return self.to_markdown(html, url)
+
+    async def get(self, url: str, prune: Callable[[str, str], str] | None = None) -> HttpPage:
+        """GET ``url`` and convert it to Markdown. Never raises.
+
+        Args:
+            url: Page to fetch.
+            prune: Optional ``(html, url) -> html`` content filter, e.g.
+                :meth:`CrawlProfile.prune`.
+        """
+        try:
+            response = await self.client.get(url)
+        except httpx.HTTPError as e:
+            return HttpPage(url, error_message=f"{type(e).__name__}: {e}")
+
+        page = HttpPage(url, status_code=response.status_code, html=self.decode(response))
+        if page.success and "html" in response.headers.get("content-type", "text/html"):
+            page.markdown = await asyncio.to_thread(self.convert, page.html, url, prune)
+        return page
+
+
+def js_render_reason(
+    url: str,
+    page: HttpPage,
+    min_content_chars: int = 200,
+    browser_url_patterns: Sequence[str] = (),
+) -> Optional[str]:
+    """Why ``page`` must be re-fetched with a browser, or ``None`` if it is usable.
+
+    Args:
+        url: Requested URL.
+        page: Result of :meth:`HttpFetcher.get`.
+        min_content_chars: Markdown shorter than this counts as an empty body;
+            JavaScript markers are honored below ten times this length.
+        browser_url_patterns: Regexes of URLs known to need rendering.
+    """
+    if any(re.search(pattern, url) for pattern in browser_url_patterns):
+        return "browser rule"
+    if page.status_code in FINAL_STATUS_CODES:
+        return None
+    if not page.success:
+        return page.error_message or f"status {page.status_code}"
+    content_chars = len(page.markdown.strip())
+    if content_chars < min_content_chars:
+        return "empty body"
+    # Many full pages carry a <noscript> hint, so markers only count on thin pages.
+    head = page.html[:20000].lower()
+    if content_chars < 10 * min_content_chars and any(marker in head for marker in JS_REQUIRED_MARKERS):
+        return "javascript required"
+    return None
+
+
+_default_fetcher: HttpFetcher | None = None
+_default_fetcher_loop: asyncio.AbstractEventLoop | None = None
+
+
+def get_http_fetcher() -> HttpFetcher:
+    """Get or create the default ``HttpFetcher`` of the running event loop.
+
+    Connection pools are bound to their loop; when called from a different
+    loop, the previous fetcher is closed on its own loop and replaced.
+    """
+    global _default_fetcher, _default_fetcher_loop
+    loop = asyncio.get_running_loop()
+    if _default_fetcher is None or _default_fetcher_loop is not loop:
+        if _default_fetcher is not None:
+            close_on_loop(_default_fetcher.aclose, _default_fetcher_loop, "http fetcher")
+        _default_fetcher, _default_fetcher_loop = HttpFetcher(), loop
+    return _default_fetcher
+
+
+async def close_http_fetcher():
+    """Close the default fetcher if it exists, on the loop it was created on."""
+    global _default_fetcher
+    if _default_fetcher is not None:
+        fetcher, _default_fetcher = _default_fetcher, None
+        if _default_fetcher_loop is asyncio.get_running_loop():
+            await fetcher.aclose()
+        else:
+            close_on_loop(fetcher.aclose, _default_fetcher_loop, "http fetcher")
@@ -0,0 +1,118 @@
+"""Startup checks for the Playwright browsers used by crawl4ai.
+
+Playwright records the browser builds it expects in ``browsers.json`` inside
+its driver package and installs each build into
+``<browsers path>/<name>-<revision>``, writing an ``INSTALLATION_COMPLETE``
+marker when done. Comparing the two is a few ``stat`` calls, so services
+verify browsers once at startup and only fall back to ``playwright install``
+when a build is actually missing.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import weakref
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from loguru import logger
+
+# Builds used by headless (``chromium-headless-shell``) and headful Chromium.
+DEFAULT_BROWSERS = ("chromium", "chromium-headless-shell")
+
+_browsers_ready: bool = False
+_install_attempted: bool = False
+_install_locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = weakref.WeakKeyDictionary()
+
+
+def playwright_browsers_path() -> Path:
+    """Directory Playwright installs browsers into, honoring ``PLAYWRIGHT_BROWSERS_PATH``."""
+    env_path = os.getenv("PLAYWRIGHT_BROWSERS_PATH")
+    if env_path == "0":
+        import playwright
+
+        return Path(playwright.__file__).parent / "driver" / "package" / ".local-browsers"
+    if env_path:
+        return Path(env_path).expanduser()
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "ms-playwright"
+    if sys.platform == "win32":
+        return Path(os.getenv("LOCALAPPDATA", Path.home() / "AppData" / "Local")) / "ms-playwright"
+    return Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "ms-playwright"
+
+
+def expected_browser_revisions(names: Sequence[str] = DEFAULT_BROWSERS) -> Dict[str, str]:
+    """Browser revisions pinned by the installed ``playwright`` package."""
+    import playwright
+
+    browsers_json = Path(playwright.__file__).parent / "driver" / "package" / "browsers.json"
+    browsers = json.loads(browsers_json.read_text(encoding="utf-8"))["browsers"]
+    return {b["name"]: b["revision"] for b in browsers if b["name"] in names}
+
+
+def missing_playwright_browsers(names: Sequence[str] = DEFAULT_BROWSERS) -> List[str]:
+    """Return the names of browsers whose pinned revision is not fully installed."""
+    root = playwright_browsers_path()
+    missing = []
+    for name, revision in expected_browser_revisions(names).items():
+        browser_dir = root / f"{name.replace('-', '_')}-{revision}"
+        if not (browser_dir / "INSTALLATION_COMPLETE").exists():
+            missing.append(name)
+    return missing
+
+
+def playwright_browsers_ready() -> bool:
+    """Whether a previous :func:`ensure_playwright_browsers` call succeeded."""
+    return _browsers_ready
+
+
+async def ensure_playwright_browsers(install: bool = True, names: Sequence[str] = DEFAULT_BROWSERS) -> bool:
+    """Verify the browsers once per process, installing missing ones if allowed.
+
+    Args:
+        install: Run ``playwright install`` for missing browsers. The
+            installation is attempted at most once per process.
+        names: Playwright browser names to check.
+
+    Returns:
+        ``True`` if all browsers are installed.
+    """
+    global _browsers_ready, _install_attempted
+    if _browsers_ready:
+        return True
+
+    # Startup and request handling may run on different event loops.
+    install_lock = _install_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+    async with install_lock:
+        if _browsers_ready:
+            return True
+
+        try:
+            missing = missing_playwright_browsers(names)
+        except (ImportError, OSError, KeyError, ValueError) as e:
+            logger.warning(f"cannot inspect playwright browsers: {e}")
+            return False
+
+        if missing and install and not _install_attempted:
+            _install_attempted = True
+            logger.info(f"installing playwright browsers: {missing}")
+            process = await asyncio.create_subprocess_exec(
+                sys.executable,
+                "-m",
+                "playwright",
+                "install",
+                *missing,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, stderr = await process.communicate()
+            logger.info(f"Playwright installation completed with exit stdout={stdout} stderr={stderr}")
+            missing = missing_playwright_browsers(names)
+
+        if missing:
+            logger.warning(f"playwright browsers are missing: {missing}")
+            return False
+
+        _browsers_ready = True
+        return True
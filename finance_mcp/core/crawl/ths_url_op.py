@@ -10,6 +10,13 @@ from flowllm.core.op import BaseAsyncOp
 from loguru import logger
 
 
+def ths_url(code: str, tag: str = "") -> str:
+    """Return the THS page of ``code`` for the sub-page ``tag``, or its index page without a tag."""
+    if not tag:
+        return f"https://basic.10jqka.com.cn/{code}/"
+    return f"https://basic.10jqka.com.cn/{code}/{tag}.html#stockpage"
+
+
 @C.register_op()
 class ThsUrlOp(BaseAsyncOp):
     """Build a THS (10jqka) stock information URL.
@@ -23,7 +30,8 @@ class ThsUrlOp(BaseAsyncOp):
     ----------
     tag:
         Optional path segment appended before the ``.html`` suffix.  This can
-        be used to navigate to different subpages for the same stock.
+        be used to navigate to different subpages for the same stock; without
+        it the stock's index page is used.
     **kwargs:
         Additional keyword arguments forwarded to :class:`BaseAsyncOp`.
     """
@@ -40,5 +48,5 @@ class ThsUrlOp(BaseAsyncOp):
         the URL and logs it for traceability.
         """
 
-        self.context.url = f"https://basic.10jqka.com.cn/{self.context.code}/{self.tag}.html#stockpage"
+        self.context.url = ths_url(self.context.code, self.tag)
         logger.info(f"{self.name} url={self.context.url}")
@@ -6,14 +6,22 @@ This package exposes high-level async ops that help:
   language queries and enrich them with security codes.
 * Extract query-relevant content spans from long unstructured text using
   large language models.
+* Parse THS page tables into typed JSON and DataFrames, answering table
+  lookups without an LLM call.
 
-Only the main operator classes are exported in ``__all__``.
+The main operator classes and the THS table parser are exported in
+``__all__``.
 """
 
 from .extract_entities_code_op import ExtractEntitiesCodeOp
 from .extract_long_text_op import ExtractLongTextOp
+from .ths_table_extract_op import ThsTableExtractOp
+from .ths_table_parser import ThsTable, parse_ths_tables
 
 __all__ = [
     "ExtractLongTextOp",
     "ExtractEntitiesCodeOp",
+    "ThsTableExtractOp",
+    "ThsTable",
+    "parse_ths_tables",
 ]
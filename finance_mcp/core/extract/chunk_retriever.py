@@ -0,0 +1,194 @@
+"""Query-aware selection of long-text chunks for LLM extraction.
+
+Instead of sending the head of a long page to the LLM, the text is split
+into heading-aligned chunks which are ranked against the query with BM25
+(optionally fused with embedding similarity) and packed into the budget in
+document order. Relevant sections at the tail of a page survive, and
+unrelated sections no longer cost tokens.
+
+Chinese text is tokenized into character bigrams, which needs no
+segmentation dictionary and works well for the short domain terms used in
+finance queries (``股东``, ``分红``, ``营业收入``, ...).
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Callable, List, Sequence
+
+_TOKEN = re.compile(r"[一-鿿]+|[a-zA-Z]+|\d+(?:\.\d+)?")
+_HEADING = re.compile(r"^(#{1,6}\s|\*\*[^*]+\*\*\s*$)")
+_BLANK_LINES = re.compile(r"\n\s*\n")
+
+
+def tokenize(text: str) -> List[str]:
+    """Character bigrams of Chinese runs plus lowercase words and numbers."""
+    tokens: List[str] = []
+    for run in _TOKEN.findall(text):
+        if "一" <= run[0] <= "鿿":
+            tokens.extend(run[i : i + 2] for i in range(max(len(run) - 1, 1)))
+        else:
+            tokens.append(run.lower())
+    return tokens
+
+
+def _pack(parts: Sequence[str], chunk_chars: int, separator: str) -> List[str]:
+    """Greedily join ``parts`` into pieces of at most ``chunk_chars`` characters."""
+    pieces, current = [], ""
+    for part in parts:
+        while len(part) > chunk_chars:
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(part[:chunk_chars])
+            part = part[chunk_chars:]
+        if current and len(current) + len(separator) + len(part) > chunk_chars:
+            pieces.append(current)
+            current = ""
+        current = f"{current}{separator}{part}" if current else part
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def split_chunks(text: str, chunk_chars: int = 1000) -> List[str]:
+    """Split Markdown into chunks of at most about ``chunk_chars`` characters.
+
+    Chunks start at headings where possible. A section longer than
+    ``chunk_chars`` is split on blank lines, then lines; its heading is
+    repeated on every piece so table rows stay attributable to their table.
+    """
+    sections: List[List[str]] = [[]]
+    for line in text.splitlines():
+        if _HEADING.match(line) and sections[-1]:
+            sections.append([])
+        sections[-1].append(line)
+
+    chunks = []
+    for lines in sections:
+        section = "\n".join(lines).strip()
+        if not section:
+            continue
+        if len(section) <= chunk_chars:
+            chunks.append(section)
+            continue
+
+        heading = lines[0].strip() if _HEADING.match(lines[0]) else ""
+        body = section[len(heading) :].strip() if heading else section
+        budget = max(chunk_chars - len(heading) - 1, chunk_chars // 2)
+        paragraphs = [p.strip() for p in _BLANK_LINES.split(body) if p.strip()]
+        parts = [line for p in paragraphs for line in (_pack(p.splitlines(), budget, "\n") if len(p) > budget else [p])]
+        for piece in _pack(parts, budget, "\n\n"):
+            chunks.append(f"{heading}\n{piece}" if heading else piece)
+    return chunks
+
+
+class BM25:
+    """Okapi BM25 over a fixed list of tokenized documents."""
+
+    def __init__(self, documents: Sequence[Sequence[str]], k1: float = 1.5, b: float = 0.75):
+        """Index ``documents``.
+
+        Args:
+            documents: Token lists, one per chunk.
+            k1: Term frequency saturation.
+            b: Length normalization strength.
+        """
+        self.k1 = k1
+        self.b = b
+        self.term_freqs = [Counter(doc) for doc in documents]
+        self.lengths = [len(doc) for doc in documents]
+        self.avg_length = sum(self.lengths) / len(documents) if documents else 0.0
+        doc_freqs = Counter(term for tf in self.term_freqs for term in tf)
+        n = len(documents)
+        self.idf = {term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freqs.items()}
+
+    def scores(self, query: Sequence[str]) -> List[float]:
+        """BM25 score of every document for the query tokens."""
+        terms = set(query) & self.idf.keys()
+        result = []
+        for tf, length in zip(self.term_freqs, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_length or 1))
+            result.append(sum(self.idf[t] * tf[t] * (self.k1 + 1) / (tf[t] + norm) for t in terms if t in tf))
+        return result
+
+
+def normalize_scores(scores: Sequence[float]) -> List[float]:
+    """Min-max scale scores to ``[0, 1]``; all zeros when they are constant."""
+    low, high = min(scores, default=0.0), max(scores, default=0.0)
+    if high <= low:
+        return [0.0 for _ in scores]
+    return [(s - low) / (high - low) for s in scores]
+
+
+def cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    """Cosine similarity of two vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def select_chunks(
+    chunks: Sequence[str],
+    scores: Sequence[float],
+    max_size: int,
+    top_k: int | None = None,
+    separator: str = "\n\n",
+    length: Callable[[str], int] = len,
+) -> str:
+    """Join the best-scoring chunks that fit ``max_size``, in document order.
+
+    Sizes are measured with ``length``, e.g. a token counter. Chunks without
+    any score are skipped; if no chunk scores, the leading chunks are kept,
+    matching plain truncation.
+    """
+    ranked = sorted((i for i in range(len(chunks)) if scores[i] > 0), key=lambda i: -scores[i])
+    head = not ranked
+    if head:
+        ranked = list(range(len(chunks)))
+    if top_k is not None:
+        ranked = ranked[:top_k]
+
+    chosen, used, separator_size = [], 0, length(separator)
+    for i in ranked:
+        cost = length(chunks[i]) + (separator_size if chosen else 0)
+        if used + cost > max_size:
+            if head:
+                break
+            continue
+        chosen.append(i)
+        used += cost
+    return separator.join(chunks[i] for i in sorted(chosen))
+
+
+def split_windows(
+    text: str,
+    window_size: int,
+    overlap_size: int = 0,
+    chunk_chars: int = 1000,
+    length: Callable[[str], int] = len,
+) -> List[str]:
+    """Split ``text`` into chunk-aligned windows of at most about ``window_size``.
+
+    Sizes are measured with ``length``, e.g. a token counter. Consecutive
+    windows share trailing chunks of up to ``overlap_size``, so facts on a
+    window boundary are seen whole at least once.
+    """
+    chunks = split_chunks(text, chunk_chars)
+    sizes = [length(chunk) + 1 for chunk in chunks]
+    windows, start = [], 0
+    while start < len(chunks):
+        end, size = start, 0
+        while end < len(chunks) and (end == start or size + sizes[end] <= window_size):
+            size += sizes[end]
+            end += 1
+        windows.append("\n\n".join(chunks[start:end]))
+        if end >= len(chunks):
+            break
+
+        next_start, overlap = end, 0
+        while next_start - 1 > start and overlap + sizes[next_start - 1] <= overlap_size:
+            next_start -= 1
+            overlap += sizes[next_start]
+        start = next_start
+    return windows
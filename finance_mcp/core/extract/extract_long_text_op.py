@@ -4,14 +4,29 @@ The main operator defined here takes a long text and a query, then asks
 an LLM to return only the portions of the text that are relevant to the
 user query. Inputs and outputs are designed to be compatible with the
 FlowLLM operator framework.
+
+Texts longer than the budget are not cut at the tail: they are split into
+chunks, ranked against the query (see :mod:`.chunk_retriever`), and only
+the best chunks are sent. Documents that need every part read (annual
+reports, long announcements) can use the map-reduce mode instead, which
+extracts from overlapping windows concurrently and merges the partial
+answers with a reduce prompt.
 """
 
+import asyncio
+from typing import List
+
 from flowllm.core.context import C
 from flowllm.core.enumeration import Role
 from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall, Message
+from loguru import logger
+
+from ..utils import TokenCounter, get_datetime, get_token_counter, truncate_to_budget
+from .chunk_retriever import BM25, cosine, normalize_scores, select_chunks, split_chunks, split_windows, tokenize
 
-from ..utils import get_datetime
+# Answers of the extraction prompt when a text has nothing relevant.
+NO_CONTENT_MARKERS = ("No relevant content found", "未找到相关内容", "没有找到相关内容", "未找到与查询相关")
 
 
 @C.register_op()
@@ -19,25 +34,69 @@ class ExtractLongTextOp(BaseAsyncToolOp):
     """Async op that extracts relevant snippets from a long text.
 
     The op expects a ``long_text`` field containing the full context and a
-    ``query`` describing what information the user is looking for. The
-    long text can be truncated with ``max_content_char_length`` to control
-    token cost and latency.
+    ``query`` describing what information the user is looking for. Long
+    texts are reduced to their query-relevant chunks within
+    ``max_content_tokens`` tokens of the op's LLM to control token cost and
+    latency.
     """
 
     file_path: str = __file__
 
-    def __init__(self, max_content_char_length: int = 50000, **kwargs):
+    def __init__(
+        self,
+        max_content_tokens: int = 32000,
+        max_content_char_length: int | None = None,
+        chunk_chars: int = 1000,
+        top_k: int | None = None,
+        use_embedding: bool = False,
+        embedding_weight: float = 0.5,
+        map_reduce: bool = False,
+        map_concurrency: int = 4,
+        map_overlap_tokens: int = 500,
+        **kwargs,
+    ):
         """Initialize the op.
 
         Args:
-            max_content_char_length: Maximum number of characters from
-                ``long_text`` that will be sent to the LLM. Longer content
-                is safely truncated from the tail.
+            max_content_tokens: Maximum number of tokens (of the op's LLM)
+                from ``long_text`` that will be sent to the LLM. Longer
+                content is reduced to its best-matching chunks.
+            max_content_char_length: Optional additional character cap on
+                the content sent outside map-reduce mode.
+            chunk_chars: Target chunk size for retrieval.
+            top_k: Optional cap on the number of chunks sent.
+            use_embedding: Fuse BM25 with the similarity from the op's
+                ``embedding_model`` (one extra embedding call per text).
+            embedding_weight: Weight of the embedding similarity in the fused
+                score; BM25 gets the rest.
+            map_reduce: Read over-long texts whole: extract from windows of
+                ``max_content_tokens`` concurrently, then merge the
+                partial answers, instead of sending the best chunks once.
+            map_concurrency: Maximum number of concurrent LLM calls in the
+                map and reduce phases.
+            map_overlap_tokens: Tokens shared by consecutive windows.
             **kwargs: Additional keyword arguments passed to ``BaseAsyncToolOp``.
         """
 
         super().__init__(**kwargs)
+        self.max_content_tokens = max_content_tokens
         self.max_content_char_length = max_content_char_length
+        self.chunk_chars = chunk_chars
+        self.top_k = top_k
+        self.use_embedding = use_embedding
+        self.embedding_weight = embedding_weight
+        self.map_reduce = map_reduce
+        self.map_concurrency = map_concurrency
+        self.map_overlap_tokens = map_overlap_tokens
+
+    @property
+    def token_counter(self) -> TokenCounter:
+        """Tokenizer of the LLM the content is sent to."""
+        return get_token_counter(self._llm)
+
+    def content_length(self, text: str) -> int:
+        """Size of ``text`` in the units of the content budget (LLM tokens)."""
+        return self.token_counter.count(text)
 
     def build_tool_call(self) -> ToolCall:
         """Describe the tool-call schema for this operator.
@@ -67,24 +126,121 @@ class ExtractLongTextOp(BaseAsyncToolOp):
     async def async_execute(self):
         """Execute the extraction by prompting the LLM.
 
-        The long text is truncated if it exceeds ``max_content_char_length``.
+        Long texts are reduced to their relevant chunks, or read whole in
+        map-reduce mode, to fit ``max_content_tokens``.
         The prompt includes the current datetime so that the LLM can reason
         about time-sensitive content when necessary.
         """
 
         long_text: str = self.input_dict["long_text"]
-        # Avoid sending extremely long content to the LLM to save tokens.
-        long_text = long_text[: self.max_content_char_length]
         query: str = self.input_dict["query"]
+        self.set_output(await self.extract(long_text, query))
 
-        extract_content_prompt = self.prompt_format(
-            prompt_name="extract_content_prompt",
-            long_text=long_text,
-            datetime=get_datetime(),
-            query=query,
-        )
-        assistant_message = await self.llm.achat(
-            messages=[Message(role=Role.USER, content=extract_content_prompt)],
+    async def extract(self, long_text: str, query: str) -> str:
+        """Ask the LLM for the parts of ``long_text`` relevant to ``query``."""
+        if self.map_reduce and self.content_length(long_text) > self.max_content_tokens:
+            return await self.map_reduce_extract(long_text, query)
+        # Avoid sending extremely long content to the LLM to save tokens.
+        long_text = await self.retrieve(long_text, query)
+        return await self.ask("extract_content_prompt", long_text=long_text, query=query)
+
+    async def ask(self, prompt_name: str, **kwargs) -> str:
+        """Fill ``prompt_name`` with ``kwargs`` and the current datetime and return the LLM answer."""
+        prompt = self.prompt_format(prompt_name=prompt_name, datetime=get_datetime(), **kwargs)
+        assistant_message = await self.llm.achat(messages=[Message(role=Role.USER, content=prompt)])
+        # The raw assistant content is the extraction result.
+        return assistant_message.content
+
+    async def map_reduce_extract(self, long_text: str, query: str) -> str:
+        """Extract from overlapping windows concurrently, then merge the partial answers."""
+        windows = split_windows(
+            long_text,
+            self.max_content_tokens,
+            self.map_overlap_tokens,
+            self.chunk_chars,
+            length=self.content_length,
         )
-        # The raw assistant content is used as the op output.
-        self.set_output(assistant_message.content)
+        semaphore = asyncio.Semaphore(self.map_concurrency)
+
+        async def map_one(window: str) -> str:
+            async with semaphore:
+                return await self.ask("extract_content_prompt", long_text=window, query=query)
+
+        partials = await asyncio.gather(*[map_one(w) for w in windows])
+        relevant = [p for p in partials if p and p.strip() and not self.is_empty_answer(p)]
+        logger.info(f"{self.name} mapped {len(windows)} windows, {len(relevant)} with relevant content")
+        if not relevant:
+            return partials[0] if partials else ""
+        return await self.reduce(relevant, query, semaphore)
+
+    @staticmethod
+    def is_empty_answer(answer: str) -> bool:
+        """Whether a partial answer only states that nothing relevant was found."""
+        return len(answer) < 200 and any(marker in answer for marker in NO_CONTENT_MARKERS)
+
+    async def reduce(self, partials: List[str], query: str, semaphore: asyncio.Semaphore) -> str:
+        """Merge partial answers, in budget-sized groups of at least two, until one remains."""
+        if len(partials) == 1:
+            return partials[0]
+
+        groups: List[List[str]] = [[]]
+        size = 0
+        for partial in partials:
+            partial_size = self.content_length(partial)
+            if len(groups[-1]) >= 2 and size + partial_size > self.max_content_tokens:
+                groups.append([])
+                size = 0
+            groups[-1].append(partial)
+            size += partial_size
+        if len(groups) > 1 and len(groups[-1]) == 1:
+            groups[-2].extend(groups.pop())
+
+        async def reduce_one(group: List[str]) -> str:
+            share = self.max_content_tokens // len(group)
+            parts = "\n\n".join(
+                f"## Part {i + 1}\n{self.token_counter.truncate(p, share)}" for i, p in enumerate(group)
+            )
+            async with semaphore:
+                return await self.ask("reduce_content_prompt", partial_answers=parts, query=query)
+
+        reduced = await asyncio.gather(*[reduce_one(g) for g in groups])
+        return await self.reduce(list(reduced), query, semaphore)
+
+    async def embedding_scores(self, chunks: List[str], query: str) -> List[float]:
+        """Cosine similarity of every chunk to the query, embedded in model-sized batches."""
+        model = self.embedding_model
+        batch_size = max(getattr(model, "max_batch_size", 10) - 1, 1)
+        batches = [chunks[i : i + batch_size] for i in range(0, len(chunks), batch_size)]
+        results = await asyncio.gather(*[model.async_get_embeddings([query, *batch]) for batch in batches])
+        scores = []
+        for embeddings in results:
+            query_embedding, *chunk_embeddings = embeddings
+            scores.extend(cosine(query_embedding, e) for e in chunk_embeddings)
+        return scores
+
+    async def retrieve(self, long_text: str, query: str) -> str:
+        """Reduce ``long_text`` to the chunks most relevant to ``query`` within the budget."""
+        if not query.strip() or self.content_length(long_text) <= self.max_content_tokens:
+            return truncate_to_budget(
+                long_text,
+                self.max_content_tokens,
+                self.max_content_char_length,
+                self._llm,
+            )
+
+        chunks = split_chunks(long_text, self.chunk_chars)
+        scores = BM25([tokenize(c) for c in chunks]).scores(tokenize(query))
+        if self.use_embedding:
+            try:
+                similarities = await self.embedding_scores(chunks, query)
+                scores = [
+                    (1 - self.embedding_weight) * b + self.embedding_weight * e
+                    for b, e in zip(normalize_scores(scores), normalize_scores(similarities))
+                ]
+            except Exception as e:  # noqa: BLE001
+                logger.warning(f"{self.name} embedding scoring failed, using BM25 only: {e}")
+
+        selected = select_chunks(chunks, scores, self.max_content_tokens, self.top_k, length=self.content_length)
+        selected = truncate_to_budget(selected, max_chars=self.max_content_char_length)
+        logger.info(f"{self.name} sends {len(selected)} of {len(long_text)} chars from {len(chunks)} chunks")
+        return selected
@@ -0,0 +1,128 @@
+"""Op answering THS F10 queries from the page tables, without an LLM when possible.
+
+Most questions about THS tabs (top holders, main business composition,
+bonus history, equity changes, ...) are lookups of one or two tables.
+:class:`ThsTableExtractOp` parses the page HTML with
+:func:`~finance_mcp.core.extract.ths_table_parser.parse_ths_tables`, picks
+the tables whose title, headers and row labels share the most character
+bigrams with the query, and returns them as typed JSON.
+
+The LLM of :class:`ExtractLongTextOp` is only used for free-text questions:
+queries asking for reasons or assessments get the matched tables as context,
+and queries no table matches get the page converted to Markdown.
+"""
+
+import asyncio
+from typing import List, Set
+
+from flowllm.core.context import C
+from flowllm.core.schema import ToolCall
+from loguru import logger
+
+from ..crawl.http_fetcher import get_http_fetcher
+from .chunk_retriever import tokenize
+from .extract_long_text_op import ExtractLongTextOp
+from .ths_table_parser import ThsTable, parse_ths_tables, tables_to_json
+
+# Query words asking for reasoning rather than data. Words that also name THS
+# sections, such as 分析 (主营构成分析, 杜邦分析) or 影响, are deliberately left out.
+FREE_TEXT_MARKERS = ("为什么", "原因", "如何", "怎么", "怎样", "评价", "前景", "看法", "why", "how")
+
+
+@C.register_op()
+class ThsTableExtractOp(ExtractLongTextOp):
+    """Return the THS page tables relevant to a query as typed JSON.
+
+    Expects ``long_text`` to be whole page HTML, e.g. from
+    ``Crawl4aiLongTextOp(profile="ths", output_format="html",
+    max_content_tokens=None)``; truncated HTML would yield partial tables. The
+    output is a JSON list of ``{"title", "columns", "rows"}`` objects within
+    ``max_content_tokens``, or the LLM answer for free-text questions.
+    """
+
+    def __init__(self, max_rows_per_table: int = 50, min_match_ratio: float = 0.5, **kwargs):
+        """Initialize the op.
+
+        Args:
+            max_rows_per_table: Rows kept per returned table (THS lists such
+                as bonus history are sorted newest first).
+            min_match_ratio: Tables scoring at least this share of the best
+                table's score are returned alongside it.
+            **kwargs: Additional keyword arguments passed to ``ExtractLongTextOp``.
+        """
+        super().__init__(**kwargs)
+        self.max_rows_per_table = max_rows_per_table
+        self.min_match_ratio = min_match_ratio
+
+    def build_tool_call(self) -> ToolCall:
+        """Describe the tool-call schema for this operator."""
+        return ToolCall(
+            **{
+                "description": "Parse the data tables of a THS page and return those relevant to the query as JSON.",
+                "input_schema": {
+                    "long_text": {
+                        "type": "string",
+                        "description": "HTML of the THS page.",
+                        "required": True,
+                    },
+                    "query": {
+                        "type": "string",
+                        "description": "User query describing what information to extract.",
+                        "required": True,
+                    },
+                },
+            },
+        )
+
+    @staticmethod
+    def score(table: ThsTable, query_grams: Set[str]) -> int:
+        """Number of query bigrams found in the title, headers and row labels of ``table``."""
+        frame = table.frame
+        labels = frame.iloc[:, 0].dropna().astype(str).tolist() if len(frame.columns) else []
+        text = " ".join([table.title, *map(str, frame.columns), *labels])
+        return len(query_grams & set(tokenize(text)))
+
+    def to_json(self, tables: List[ThsTable]) -> str:
+        """Serialize ``tables`` within ``max_content_tokens``.
+
+        Rows per table are halved until the JSON fits; if single rows still do
+        not, trailing tables are dropped. The JSON is never cut mid-table.
+        """
+        max_rows = self.max_rows_per_table
+        text = tables_to_json(tables, max_rows)
+        while self.content_length(text) > self.max_content_tokens and (max_rows > 1 or len(tables) > 1):
+            if max_rows > 1:
+                max_rows //= 2
+            else:
+                tables = tables[:-1]
+            text = tables_to_json(tables, max_rows)
+        return text
+
+    def select(self, tables: List[ThsTable], query: str) -> List[ThsTable]:
+        """Tables matching ``query``; all tables for an empty query, none if nothing matches."""
+        query_grams = set(tokenize(query))
+        if not query_grams:
+            return tables
+        scores = [self.score(table, query_grams) for table in tables]
+        best = max(scores, default=0)
+        if best < min(2, len(query_grams)):
+            return []
+        return [t for t, s in zip(tables, scores) if s >= max(best * self.min_match_ratio, 1)]
+
+    async def async_execute(self):
+        """Answer from the parsed tables, falling back to the LLM for free-text questions."""
+        html: str = self.input_dict["long_text"]
+        query: str = self.input_dict.get("query", "") or ""
+
+        tables = await asyncio.to_thread(parse_ths_tables, html)
+        matched = self.select(tables, query)
+        free_text = any(marker in query.lower() for marker in FREE_TEXT_MARKERS)
+        logger.info(f"{self.name} parsed {len(tables)} tables, {len(matched)} match, free_text={free_text}")
+
+        if matched and not free_text:
+            self.set_output(self.to_json(matched))
+        elif matched:
+            self.set_output(await self.extract(self.to_json(matched), query))
+        else:
+            markdown = await asyncio.to_thread(get_http_fetcher().convert, html, "")
+            self.set_output(await self.extract(markdown, query))
@@ -0,0 +1,245 @@
+"""Deterministic parser of the data tables on THS F10 pages.
+
+THS pages (holders, main business composition, bonus history, equity
+changes, ...) publish their data as HTML tables with merged header cells,
+Chinese magnitude suffixes (``万``/``亿``) and ``--`` placeholders.
+``parse_ths_tables`` turns every table of a page into a typed
+:class:`pandas.DataFrame` without any LLM call:
+
+* ``rowspan``/``colspan`` cells are expanded so every row has every column;
+  stacked header rows are joined as ``"营业收入_金额"``.
+* Key-value tables (alternating label and value cells) become two columns,
+  ``字段`` and ``值``.
+* A column whose non-empty cells are all numbers becomes ``float``
+  (``1.2亿`` -> ``1.2e8``, ``12.5%`` -> ``12.5``); all-date columns become
+  ISO dates; placeholders become missing values.
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+import pandas as pd
+from lxml import html as lxml_html
+
+# Cell texts meaning "no value".
+MISSING_VALUES = frozenset({"", "-", "--", "---", "—", "——", "暂无", "不适用", "无", "null", "None"})
+
+# Chinese magnitude suffixes.
+MAGNITUDES: Dict[str, float] = {"万亿": 1e12, "亿": 1e8, "千万": 1e7, "百万": 1e6, "万": 1e4, "千": 1e3}
+
+_NUMBER = re.compile(
+    r"^(?P<sign>[+-]?)(?P<number>\d+(?:\.\d+)?)\s*(?P<magnitude>万亿|亿|千万|百万|万|千)?\s*"
+    r"(?P<percent>%)?\s*(?:元|股|户|次|倍|个|人|家|美元|港元)?$",
+)
+_DATE = re.compile(r"^(\d{4})[-/.年]?(\d{1,2})[-/.月]?(\d{1,2})日?$")
+_SPACES = re.compile(r"\s+")
+_HEADINGS = ("h1", "h2", "h3", "h4", "caption")
+
+
+def clean_text(text: str) -> str:
+    """Collapse whitespace and strip label colons."""
+    return _SPACES.sub(" ", text or "").strip().rstrip("：:").strip()
+
+
+def parse_number(text: str) -> Optional[float]:
+    """Parse a THS number such as ``-1,234.5万`` or ``12.3%``; ``None`` if not a number."""
+    match = _NUMBER.match(text.replace(",", "").replace("，", "").strip())
+    if not match:
+        return None
+    value = float(match.group("number")) * MAGNITUDES.get(match.group("magnitude") or "", 1)
+    return -value if match.group("sign") == "-" else value
+
+
+def parse_date(text: str) -> Optional[str]:
+    """Parse ``2024-03-31``, ``20240331`` or ``2024年3月31日`` to ISO format."""
+    match = _DATE.match(text.strip())
+    if not match:
+        return None
+    year, month, day = (int(g) for g in match.groups())
+    if not (1 <= month <= 12 and 1 <= day <= 31 and 1900 <= year <= 2100):
+        return None
+    return f"{year:04d}-{month:02d}-{day:02d}"
+
+
+class ThsTable:
+    """One parsed table with its title."""
+
+    def __init__(self, title: str, frame: pd.DataFrame):
+        self.title = title
+        self.frame = frame
+
+    def to_dict(self, max_rows: int | None = None) -> dict:
+        """JSON-friendly ``{"title", "columns", "rows"}``; missing values are ``None``."""
+        frame = self.frame if max_rows is None else self.frame.head(max_rows)
+        rows = frame.astype(object).where(frame.notna(), None).values.tolist()
+        return {"title": self.title, "columns": [str(c) for c in frame.columns], "rows": rows}
+
+
+def _rows(table) -> List[list]:
+    """Non-empty rows of ``table`` itself, excluding rows of nested tables."""
+    return [
+        tr
+        for tr in table.xpath("./tr | ./thead/tr | ./tbody/tr | ./tfoot/tr")
+        if tr.xpath("./th | ./td")
+    ]
+
+
+def _expand(table) -> tuple[List[List[str]], List[List[bool]]]:
+    """Expand merged cells into a text grid and a parallel is-``<th>`` grid."""
+    grid, header_grid = [], []
+    pending: Dict[int, tuple[int, str, bool]] = {}
+    for tr in _rows(table):
+        row, header_row = [], []
+        cells = tr.xpath("./th | ./td")
+        col, index = 0, 0
+        while index < len(cells) or col in pending:
+            if col in pending:
+                remaining, text, is_header = pending.pop(col)
+                if remaining > 1:
+                    pending[col] = (remaining - 1, text, is_header)
+                row.append(text)
+                header_row.append(is_header)
+                col += 1
+                continue
+
+            cell = cells[index]
+            index += 1
+            text = clean_text(cell.text_content())
+            is_header = cell.tag == "th" or cell.getparent().getparent().tag == "thead"
+            colspan = int(cell.get("colspan") or 1) if str(cell.get("colspan") or 1).isdigit() else 1
+            rowspan = int(cell.get("rowspan") or 1) if str(cell.get("rowspan") or 1).isdigit() else 1
+            for _ in range(max(colspan, 1)):
+                if rowspan > 1:
+                    pending[col] = (rowspan - 1, text, is_header)
+                row.append(text)
+                header_row.append(is_header)
+                col += 1
+        grid.append(row)
+        header_grid.append(header_row)
+    return grid, header_grid
+
+
+def _title(table) -> str:
+    """Caption of ``table`` or the nearest heading before it, searching up to three ancestor levels.
+
+    The search stops at the first preceding element holding another table: a
+    heading before that belongs to the other table, so ``table`` is untitled.
+    """
+    caption = table.find("caption")
+    if caption is not None and clean_text(caption.text_content()):
+        return clean_text(caption.text_content())[:50]
+
+    node = table
+    for _ in range(4):
+        for sibling in node.itersiblings(preceding=True):
+            if not isinstance(sibling.tag, str):
+                continue
+            classes = sibling.get("class") or ""
+            if sibling.tag in _HEADINGS or re.search(r"\b(hd|title|tit)\b", classes):
+                text = clean_text(sibling.text_content())
+                if text:
+                    return text[:50]
+            if sibling.tag == "table" or sibling.find(".//table") is not None:
+                return ""
+        node = node.getparent()
+        if node is None:
+            break
+    return ""
+
+
+def _unique(columns: List[str]) -> List[str]:
+    """Name empty columns by position and suffix duplicates."""
+    seen: Dict[str, int] = {}
+    result = []
+    for i, column in enumerate(columns):
+        column = column or f"列{i + 1}"
+        if column in seen:
+            seen[column] += 1
+            column = f"{column}_{seen[column]}"
+        else:
+            seen[column] = 0
+        result.append(column)
+    return result
+
+
+def _typed(columns: List[str], body: List[List[str]]) -> pd.DataFrame:
+    """Build the frame, converting all-date and all-number columns and blanking placeholders.
+
+    Dates are tried first so ``20240331``-style report dates are not read as numbers.
+    """
+    data = {}
+    for i, column in enumerate(columns):
+        values = [None if row[i] in MISSING_VALUES else row[i] for row in body]
+        present = [v for v in values if v is not None]
+        for parse, dtype in ((parse_date, object), (parse_number, float)):
+            parsed = [None if v is None else parse(v) for v in values]
+            if present and all(p is not None for v, p in zip(values, parsed) if v is not None):
+                data[column] = pd.Series(parsed, dtype=dtype)
+                break
+        else:
+            data[column] = pd.Series(values, dtype=object)
+    return pd.DataFrame(data, columns=columns)
+
+
+def _to_frame(grid: List[List[str]], header_grid: List[List[bool]]) -> Optional[pd.DataFrame]:
+    """Split the header rows off ``grid`` and build the typed frame; ``None`` for empty tables."""
+    width = max((len(row) for row in grid), default=0)
+    if width == 0 or not any(any(row) for row in grid):
+        return None
+    grid = [row + [""] * (width - len(row)) for row in grid]
+    header_grid = [row + [False] * (width - len(row)) for row in header_grid]
+
+    header_rows = 0
+    while header_rows < len(grid) - 1 and all(header_grid[header_rows]):
+        header_rows += 1
+
+    # Key-value layout: label and value cells alternate within rows.
+    if header_rows == 0 and width % 2 == 0 and all(
+        all(header_grid[r][c] for c in range(0, width, 2)) and not any(header_grid[r][c] for c in range(1, width, 2))
+        for r in range(len(grid))
+    ):
+        pairs = [(row[c], row[c + 1]) for row in grid for c in range(0, width, 2) if row[c]]
+        return _typed(["字段", "值"], [list(pair) for pair in pairs])
+
+    if header_rows == 0:
+        header_rows = 1
+    columns = []
+    for c in range(width):
+        parts: List[str] = []
+        for r in range(header_rows):
+            if grid[r][c] and (not parts or parts[-1] != grid[r][c]):
+                parts.append(grid[r][c])
+        columns.append("_".join(parts))
+
+    body = [row for row in grid[header_rows:] if any(row)]
+    return _typed(_unique(columns), body)
+
+
+def parse_ths_tables(html: str, min_rows: int = 1) -> List[ThsTable]:
+    """Parse every data table of a THS page.
+
+    Args:
+        html: Page HTML, raw or pruned by a crawl profile.
+        min_rows: Tables with fewer body rows are skipped (layout tables).
+
+    Returns:
+        Tables in document order. Nested tables are parsed on their own.
+    """
+    if not html or not html.strip():
+        return []
+    tree = lxml_html.fromstring(html)
+
+    tables = []
+    for table in tree.iter("table"):
+        grid, header_grid = _expand(table)
+        frame = _to_frame(grid, header_grid)
+        if frame is None or len(frame) < min_rows:
+            continue
+        tables.append(ThsTable(_title(table), frame))
+    return tables
+
+
+def tables_to_json(tables: List[ThsTable], max_rows: int | None = None) -> str:
+    """Serialize parsed tables as compact JSON."""
+    return json.dumps([table.to_dict(max_rows) for table in tables], ensure_ascii=False, default=str)
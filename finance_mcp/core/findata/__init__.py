@@ -5,16 +5,39 @@ including:
 
 * ``TushareClient`` – a thin wrapper around the Tushare HTTP API that
   returns results as pandas ``DataFrame`` objects.
+* ``AsyncTushareClient`` – an ``httpx``-based async counterpart with
+  concurrent pagination, fan-out and a token-bucket rate limiter.
+* ``TushareCache`` – a persistent Parquet store that serves repeated
+  requests without network and only fetches missing date ranges.
+* ``TushareSyncer`` – an incremental sync engine that only pulls trading
+  days newer than the last synced date of each stock.
+* ``SingleFlight`` – coalesces concurrent identical requests into one
+  network call and counts how many were shared.
+* ``LocalProApi`` – an offline ``pro_api`` stand-in that serves prefetched
+  frames to sandboxed analysis code.
+* ``analytics`` – vectorized indicator kernels (returns, volatility,
+  drawdown, moving averages, RSI, MACD, beta, turnover) exposed to
+  generated code as ``ta``.
 * ``HistoryCalculateOp`` – an async FlowLLM operator that generates and
   executes analysis code on top of historical data.
 
 Only the main public classes are exported via ``__all__``.
 """
 
+from .async_tushare_client import AsyncTushareClient
 from .history_calculate_op import HistoryCalculateOp
+from .local_pro_api import LocalProApi
+from .single_flight import SingleFlight
+from .tushare_cache import TushareCache
 from .tushare_client import TushareClient
+from .tushare_sync import TushareSyncer
 
 __all__ = [
     "TushareClient",
+    "AsyncTushareClient",
+    "TushareCache",
+    "TushareSyncer",
+    "SingleFlight",
+    "LocalProApi",
     "HistoryCalculateOp",
 ]
@@ -0,0 +1,193 @@
+"""Vectorized indicator kernels for generated analysis code.
+
+The functions in this module are exposed to ``HistoryCalculateOp`` sandboxes
+as the ``ta`` namespace, so generated code can answer common questions with
+one call instead of hand-written pandas loops. All inputs are price or
+indicator sequences in **ascending** trade-date order; when a ``Series`` is
+passed the result keeps its index, otherwise a NumPy array is returned.
+Leading positions without enough history are ``NaN``.
+"""
+
+from types import SimpleNamespace
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+TRADING_DAYS_PER_YEAR = 252
+
+
+def _values(x) -> np.ndarray:
+    return np.asarray(x, dtype=np.float64)
+
+
+def _wrap(values: np.ndarray, like, name: str | None = None):
+    if isinstance(like, pd.Series):
+        return pd.Series(values, index=like.index, name=name or like.name)
+    return values
+
+
+def _rolling_windows(x: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """Return a ``NaN`` result buffer and the sliding windows of ``x``."""
+    out = np.full(len(x), np.nan)
+    if window <= 0 or len(x) < window:
+        return out, np.empty((0, max(window, 1)))
+    return out, sliding_window_view(x, window)
+
+
+def returns(close, periods: int = 1, log: bool = False):
+    """Simple (or log) return over ``periods`` rows."""
+    x = _values(close)
+    out = np.full(len(x), np.nan)
+    if len(x) > periods:
+        ratio = x[periods:] / x[:-periods]
+        out[periods:] = np.log(ratio) if log else ratio - 1
+    return _wrap(out, close)
+
+
+def cumulative_return(close) -> float:
+    """Total return from the first to the last value."""
+    x = _values(close)
+    return float(x[-1] / x[0] - 1) if len(x) > 1 else float("nan")
+
+
+def annualized_return(close, periods_per_year: int = TRADING_DAYS_PER_YEAR) -> float:
+    """Compound annual growth rate implied by the sequence."""
+    x = _values(close)
+    if len(x) < 2:
+        return float("nan")
+    return float((x[-1] / x[0]) ** (periods_per_year / (len(x) - 1)) - 1)
+
+
+def sma(x, window: int):
+    """Simple moving average over ``window`` rows."""
+    v = _values(x)
+    out, windows = _rolling_windows(v, window)
+    out[window - 1 :] = windows.mean(axis=1)
+    return _wrap(out, x)
+
+
+def ema(x, span: int):
+    """Exponential moving average with ``alpha = 2 / (span + 1)``, seeded by the first value."""
+    v = pd.Series(_values(x)).ewm(span=span, adjust=False).mean().to_numpy()
+    return _wrap(v, x)
+
+
+def rolling_volatility(
+    close,
+    window: int = 20,
+    annualize: bool = True,
+    periods_per_year: int = TRADING_DAYS_PER_YEAR,
+):
+    """Rolling standard deviation of daily returns, annualized by default."""
+    r = _values(returns(close))
+    out, windows = _rolling_windows(r, window)
+    out[window - 1 :] = windows.std(axis=1, ddof=1)
+    if annualize:
+        out *= np.sqrt(periods_per_year)
+    return _wrap(out, close)
+
+
+def drawdown(close):
+    """Drawdown from the running peak, ``0`` at new highs and negative below."""
+    x = _values(close)
+    return _wrap(x / np.maximum.accumulate(x) - 1, close)
+
+
+def max_drawdown(close) -> float:
+    """Largest peak-to-trough decline, as a negative fraction."""
+    x = _values(close)
+    return float(np.min(x / np.maximum.accumulate(x) - 1)) if len(x) else float("nan")
+
+
+def rsi(close, window: int = 14):
+    """Relative strength index with Wilder smoothing, in ``[0, 100]``."""
+    delta = np.diff(_values(close), prepend=np.nan)
+    smooth = pd.DataFrame({"gain": np.clip(delta, 0, None), "loss": np.clip(-delta, 0, None)})
+    smooth = smooth.ewm(alpha=1 / window, adjust=False, min_periods=window).mean().to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = 100 - 100 / (1 + smooth[:, 0] / smooth[:, 1])
+    out[(smooth[:, 1] == 0) & (smooth[:, 0] > 0)] = 100
+    return _wrap(out, close, "rsi")
+
+
+def macd(close, fast: int = 12, slow: int = 26, signal: int = 9) -> pd.DataFrame:
+    """MACD in the common A-share convention.
+
+    Returns:
+        ``DataFrame`` with ``dif`` (fast EMA - slow EMA), ``dea`` (signal EMA
+        of ``dif``) and ``macd`` (``2 * (dif - dea)``).
+    """
+    x = _values(close)
+    dif = _values(ema(x, fast)) - _values(ema(x, slow))
+    dea = _values(ema(dif, signal))
+    index = close.index if isinstance(close, pd.Series) else None
+    return pd.DataFrame({"dif": dif, "dea": dea, "macd": 2 * (dif - dea)}, index=index)
+
+
+def beta(close, index_close, window: int | None = None):
+    """Beta of daily returns against a benchmark.
+
+    Both sequences must be aligned on the same trade dates. Without
+    ``window`` a single float over the whole period is returned, otherwise
+    a rolling beta.
+    """
+    r = _values(returns(close))[1:]
+    m = _values(returns(index_close))[1:]
+    if window is None:
+        valid = ~(np.isnan(r) | np.isnan(m))
+        r, m = r[valid], m[valid]
+        if len(r) < 2:
+            return float("nan")
+        return float(np.cov(r, m, ddof=1)[0, 1] / np.var(m, ddof=1))
+
+    out = np.full(len(r) + 1, np.nan)
+    if len(r) >= window:
+        rw, mw = sliding_window_view(r, window), sliding_window_view(m, window)
+        rc, mc = rw - rw.mean(axis=1, keepdims=True), mw - mw.mean(axis=1, keepdims=True)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[window:] = (rc * mc).sum(axis=1) / (mc * mc).sum(axis=1)
+    return _wrap(out, close, "beta")
+
+
+def turnover_stats(turnover_rate, window: int = 20) -> Dict[str, float]:
+    """Summary of recent turnover versus its longer history.
+
+    Returns:
+        ``latest``, ``mean``/``median``/``max`` over the last ``window`` rows,
+        ``history_mean`` over all rows, and ``ratio`` of the recent mean to
+        the history mean.
+    """
+    x = _values(turnover_rate)
+    x = x[~np.isnan(x)]
+    if not len(x):
+        return {k: float("nan") for k in ["latest", "mean", "median", "max", "history_mean", "ratio"]}
+    recent = x[-window:]
+    history_mean = float(x.mean())
+    return {
+        "latest": float(x[-1]),
+        "mean": float(recent.mean()),
+        "median": float(np.median(recent)),
+        "max": float(recent.max()),
+        "history_mean": history_mean,
+        "ratio": float(recent.mean() / history_mean) if history_mean else float("nan"),
+    }
+
+
+# Namespace injected into sandboxes as ``ta``. Functions pickle by reference,
+# so workers resolve them by importing this module.
+ANALYTICS = SimpleNamespace(
+    returns=returns,
+    cumulative_return=cumulative_return,
+    annualized_return=annualized_return,
+    sma=sma,
+    ema=ema,
+    rolling_volatility=rolling_volatility,
+    drawdown=drawdown,
+    max_drawdown=max_drawdown,
+    rsi=rsi,
+    macd=macd,
+    beta=beta,
+    turnover_stats=turnover_stats,
+)
@@ -0,0 +1,298 @@
+"""Async Tushare API client."""
+
+import asyncio
+import os
+import time
+from typing import AsyncIterator, List
+
+import httpx
+import pandas as pd
+from loguru import logger
+
+from .single_flight import SingleFlight
+from .tushare_client import TushareClient, _loads
+
+
+class TokenBucket:
+    """Async token-bucket rate limiter.
+
+    Tokens refill continuously at ``rate_per_minute / 60`` per second up to
+    ``capacity``. Each ``acquire`` consumes one token and waits when the
+    bucket is empty, so callers never exceed the configured per-minute quota.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        """Initialize the bucket.
+
+        Args:
+            rate_per_minute: Sustained number of acquisitions allowed per minute.
+            capacity: Burst size. Defaults to one tenth of the minute quota.
+        """
+        self.rate: float = rate_per_minute / 60
+        self.capacity: float = capacity or max(1.0, rate_per_minute / 10)
+        self.tokens: float = self.capacity
+        self.updated_at: float = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Take one token, sleeping until it becomes available."""
+        async with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1
+                self.updated_at = time.monotonic()
+
+            self.tokens -= 1
+
+
+class AsyncTushareClient:
+    """Async Tushare API client.
+
+    Pages of one query are fetched concurrently in windows of
+    ``page_concurrency`` offsets, and ``arequest_many`` fans a query out over
+    many parameter sets. All traffic shares one keep-alive ``httpx`` pool, a
+    global concurrency cap and a token bucket matching the Tushare quota.
+    Concurrent identical requests are coalesced through
+    ``TushareClient.single_flight``.
+    """
+
+    def __init__(
+        self,
+        request_limit_size: int = 10000,
+        timeout: float = 30.0,
+        url: str = "http://api.waditu.com/dataapi",
+        max_concurrency: int = 8,
+        page_concurrency: int = 4,
+        rate_per_minute: float = 200,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        parse_dates: bool = False,
+        enable_single_flight: bool = True,
+    ):
+        """Initialize client.
+
+        Args:
+            request_limit_size: Max records per request. Default 10000.
+            timeout: Request timeout in seconds. Default 30.0.
+            url: Tushare HTTP endpoint.
+            max_concurrency: Global cap on in-flight HTTP requests.
+            page_concurrency: Number of pages of one query fetched at once.
+            rate_per_minute: Tushare per-minute quota of the account.
+            max_retries: Retries on 5xx / 429 responses and rate-limit codes.
+            backoff_factor: Base delay in seconds for exponential backoff.
+            parse_dates: Convert known date fields to ``datetime64``.
+            enable_single_flight: Coalesce concurrent identical requests.
+        """
+        self.token = os.getenv("TUSHARE_API_TOKEN")
+        if not self.token:
+            raise ValueError("TUSHARE_API_TOKEN not set")
+
+        self.url = url
+        self.request_limit_size = request_limit_size
+        self.page_concurrency = page_concurrency
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.parse_dates = parse_dates
+        self.enable_single_flight = enable_single_flight
+
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.rate_limiter = TokenBucket(rate_per_minute)
+        self.client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency),
+        )
+
+    async def aclose(self):
+        """Close the underlying connection pool."""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> "AsyncTushareClient":
+        return self
+
+    async def __aexit__(self, exc_type=None, exc_val=None, exc_tb=None):
+        await self.aclose()
+        return False
+
+    def _build_data_dict(self, api_name: str, fields: List[str] | None, offset: int, **kwargs) -> dict:
+        data_dict: dict = {
+            "api_name": api_name,
+            "token": self.token,
+            "params": {
+                "offset": offset,
+                "limit": self.request_limit_size,
+                **kwargs,
+            },
+        }
+        if fields:
+            data_dict["fields"] = fields
+        return data_dict
+
+    async def _apost_page(self, data_dict: dict) -> tuple[List[str], list, bool]:
+        """Post a single page request under the concurrency cap and rate limit.
+
+        Returns:
+            (fields, items, has_more)
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.rate_limiter.acquire()
+            async with self.semaphore:
+                response = await self.client.post(self.url, json=data_dict)
+
+            data = None
+            retryable = response.status_code in TushareClient.RETRY_STATUS_CODES
+            if not retryable:
+                response.raise_for_status()
+                data = _loads(response.content)
+                retryable = bool(data) and data.get("code") in TushareClient.RATE_LIMIT_CODES
+
+            if retryable and attempt < self.max_retries:
+                delay = self.backoff_factor * (2**attempt)
+                logger.warning(f"tushare throttled api={data_dict['api_name']}, retry in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+
+            response.raise_for_status()
+            return TushareClient._parse_response(data)
+
+        raise RuntimeError(f"Retries exhausted for API: {data_dict['api_name']}")
+
+    async def arequest(
+        self,
+        api_name: str,
+        fields: List[str] | None = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Request data from API, fetching pages concurrently.
+
+        The first page is fetched alone and its row count taken as the page
+        size; if more data exists, the following pages are requested
+        ``page_concurrency`` offsets at a time until the server reports no
+        more data. A page shorter than the page size restarts the window at
+        the offset where it ended, so no rows are skipped.
+
+        Args:
+            api_name: API endpoint name.
+            fields: Optional field list. None returns all fields.
+            **kwargs: Additional API parameters.
+
+        Returns:
+            DataFrame with requested data.
+        """
+        if self.enable_single_flight:
+            key = SingleFlight.make_key(api_name, kwargs, fields, scope=(self.url, self.token))
+            df = await TushareClient.single_flight.ado(key, lambda: self._arequest_remote(api_name, fields, **kwargs))
+        else:
+            df = await self._arequest_remote(api_name, fields, **kwargs)
+
+        if self.parse_dates:
+            df = TushareClient._convert_dates(df)
+        return df
+
+    async def _arequest_remote(
+        self,
+        api_name: str,
+        fields: List[str] | None = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Request all pages of a query from the network."""
+        columns, items, has_more = await self._apost_page(self._build_data_dict(api_name, fields, 0, **kwargs))
+        chunks = TushareClient._decode_page(api_name, columns, items, {})
+        # The server may cap pages below ``request_limit_size``; stride by what it actually returns.
+        page_size = offset = len(items)
+
+        while has_more and page_size > 0:
+            offsets = [offset + i * page_size for i in range(self.page_concurrency)]
+            pages = await asyncio.gather(
+                *[self._apost_page(self._build_data_dict(api_name, fields, o, **kwargs)) for o in offsets],
+            )
+            for page_offset, (page_fields, page_items, has_more) in zip(offsets, pages):
+                if page_offset != offset:
+                    # An earlier page came back short; refetch from where it ended.
+                    has_more = True
+                    break
+                TushareClient._decode_page(api_name, page_fields, page_items, chunks)
+                offset += len(page_items)
+                if not has_more or not page_items:
+                    has_more = False
+                    break
+
+        return TushareClient._build_frame(columns, chunks)
+
+    async def aiter_pages(
+        self,
+        api_name: str,
+        fields: List[str] | None = None,
+        as_arrow: bool = False,
+        **kwargs,
+    ) -> AsyncIterator:
+        """Yield each page of a query as soon as it arrives.
+
+        The next page is requested in the background while the current one is
+        being consumed, so downstream writes or aggregations overlap with
+        pagination while peak memory stays bounded by about two pages.
+
+        Args:
+            api_name: API endpoint name.
+            fields: Optional field list. None returns all fields.
+            as_arrow: Yield ``pyarrow.RecordBatch`` instead of ``DataFrame``.
+            **kwargs: Additional API parameters.
+
+        Yields:
+            One non-empty ``DataFrame`` (or record batch) per page.
+        """
+        offset = 0
+        task = asyncio.create_task(self._apost_page(self._build_data_dict(api_name, fields, offset, **kwargs)))
+        try:
+            while task is not None:
+                page_fields, page_items, has_more = await task
+                offset += len(page_items)
+
+                task = None
+                if has_more and page_items:
+                    data_dict = self._build_data_dict(api_name, fields, offset, **kwargs)
+                    task = asyncio.create_task(self._apost_page(data_dict))
+
+                if page_items:
+                    yield TushareClient._build_page(api_name, page_fields, page_items, as_arrow)
+        finally:
+            if task is not None:
+                task.cancel()
+
+    async def arequest_many(
+        self,
+        api_name: str,
+        params_list: List[dict],
+        fields: List[str] | None = None,
+        concat: bool = True,
+        **kwargs,
+    ) -> pd.DataFrame | List[pd.DataFrame]:
+        """Fan one API out over many parameter sets concurrently.
+
+        Typical use is one entry per ``ts_code`` or per date window, e.g.
+        ``[{"ts_code": c} for c in codes]``. Concurrency and rate are bounded
+        by the client-wide semaphore and token bucket.
+
+        Args:
+            api_name: API endpoint name.
+            params_list: Per-call parameters merged over ``kwargs``.
+            fields: Optional field list. None returns all fields.
+            concat: Return one concatenated DataFrame instead of a list.
+            **kwargs: API parameters shared by every call.
+
+        Returns:
+            Concatenated DataFrame, or one DataFrame per ``params_list`` entry.
+        """
+        df_list = await asyncio.gather(
+            *[self.arequest(api_name, fields=fields, **{**kwargs, **params}) for params in params_list],
+        )
+        if not concat:
+            return list(df_list)
+
+        df_list = [x for x in df_list if len(x) > 0]
+        if not df_list:
+            return pd.DataFrame()
+        return pd.concat(df_list, axis=0, ignore_index=True)
@@ -5,16 +5,28 @@ generate Python analysis code via an LLM and then execute that code on
 historical market data.
 """
 
-import os
+import asyncio
+import hashlib
+import json
+import re
+import time
+import unicodedata
+from typing import Dict, List
 
+import pandas as pd
 from flowllm.core.context import C
-from flowllm.core.enumeration import Role
+from flowllm.core.enumeration import ChunkEnum, Role
 from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall, Message
 from flowllm.core.utils import extract_content
 from loguru import logger
 
+from .analytics import ANALYTICS
+from .local_pro_api import LocalProApi
+from .tushare_cache import TushareCache
+from .tushare_client import TushareClient
 from ..utils import get_datetime
+from ..utils.code_precheck import DEFAULT_ALLOWED_IMPORTS
 from ..utils.common_utils import exec_code
 
 
@@ -23,12 +35,80 @@ class HistoryCalculateOp(BaseAsyncToolOp):
     """Async op that lets an LLM write code for historical stock analysis.
 
     The op takes a stock code and a natural language question, then
-    delegates to the LLM to produce executable Python code that fetches
-    and analyses historical data obtained from Tushare.
+    delegates to the LLM to produce executable Python code that analyses
+    historical data obtained from Tushare.
+
+    Before the code runs, the ``daily``, ``adj_factor`` and ``daily_basic``
+    history of the stock is prefetched through a cached
+    :class:`TushareClient` and injected into the sandbox, both as ready-made
+    DataFrames and as an offline ``pro`` object, so the generated code does
+    no authentication or network I/O of its own. The ``index_daily`` history
+    of ``BENCHMARK_INDEX`` (or the requested ``index_code``) and the
+    vectorized indicator kernels of :mod:`.analytics` (as ``ta``) are
+    injected as well.
+
+    ``code`` may list several stocks. One program is then generated and run
+    over panel-shaped data: the frames hold every stock (told apart by
+    ``ts_code``) and ``close_panel`` pivots closes to trade_date × ts_code,
+    so cross-sectional questions cost one LLM call instead of one per stock.
+
+    When the code fails (exception, precheck rejection or timeout), the error
+    and a trimmed copy of the code are sent back to ``repair_llm`` for a
+    fix, up to ``max_repairs`` times within ``repair_budget`` seconds, so a
+    typo does not cost the calling agent a full tool round. Outcomes are
+    counted in ``repair_stats``.
+
+    With ``enable_cache`` the op keeps two cache levels: the generated code,
+    keyed by (stocks, index, normalized query, prompt version, day), and
+    the execution output, keyed by (stocks, index, code hash, last trade
+    date of the snapshot). Repeated questions within a trading day skip both the LLM
+    round and the execution; new market data only re-runs the cached code.
     """
 
     file_path = __file__
 
+    # APIs prefetched for the requested stocks and exposed to generated code.
+    SNAPSHOT_APIS = ("daily", "adj_factor", "daily_basic")
+
+    # Benchmark index prefetched as ``index_daily`` for beta and relative returns.
+    BENCHMARK_INDEX = "000300.SH"
+
+    # Cached clients shared by all op copies of the process, keyed by ``cache_dir``.
+    _clients: Dict[str, TushareClient] = {}
+
+    # Process-wide outcome counts of the self-repair loop.
+    repair_stats: Dict[str, int] = {"runs": 0, "first_pass": 0, "repaired": 0, "failed": 0, "repair_calls": 0}
+
+    def __init__(
+        self,
+        cache_dir: str = "cache/tushare",
+        timeout: float = 30,
+        max_repairs: int = 2,
+        repair_budget: float = 60,
+        repair_llm: str = "",
+        **kwargs,
+    ):
+        """Initialize the op.
+
+        Args:
+            cache_dir: Directory of the on-disk Tushare cache.
+            timeout: Maximum execution time of the generated code in seconds.
+            max_repairs: Maximum number of repair attempts after a failed run.
+            repair_budget: Seconds since the op started after which no new
+                repair attempt is made.
+            repair_llm: Name of a (cheaper) LLM config used for repairs.
+                Empty uses the op's own LLM.
+            **kwargs: Additional keyword arguments passed to ``BaseAsyncToolOp``.
+        """
+        super().__init__(**kwargs)
+        self.cache_dir: str = cache_dir
+        self.timeout: float = timeout
+        self.max_repairs: int = max_repairs
+        self.repair_budget: float = repair_budget
+        self.repair_llm_name: str = repair_llm
+        self._repair_llm = None
+        self._prompt_version: str | None = None
+
     def build_tool_call(self) -> ToolCall:
         """Describe the tool-call interface for this operator.
 
@@ -42,7 +122,8 @@ class HistoryCalculateOp(BaseAsyncToolOp):
                 "input_schema": {
                     "code": {
                         "type": "string",
-                        "description": "A-share stock code (e.g. '600000' or '000001').",
+                        "description": "A-share stock code (e.g. '600000' or '000001'), or several "
+                        "comma-separated codes (e.g. '600000,000001,300750') to compare them in one call.",
                         "required": True,
                     },
                     "query": {
@@ -50,38 +131,261 @@ class HistoryCalculateOp(BaseAsyncToolOp):
                         "description": "User question about the stock's historical performance.",
                         "required": True,
                     },
+                    "index_code": {
+                        "type": "string",
+                        "description": f"Benchmark or sector index code (default '{self.BENCHMARK_INDEX}').",
+                        "required": False,
+                    },
                 },
             },
         )
 
+    @property
+    def client(self) -> TushareClient:
+        """Get or create the process-wide cached Tushare client of this op's ``cache_dir``."""
+        clients = HistoryCalculateOp._clients
+        if self.cache_dir not in clients:
+            clients[self.cache_dir] = TushareClient(cache=TushareCache(cache_dir=self.cache_dir))
+        return clients[self.cache_dir]
+
+    @staticmethod
+    def normalize_codes(code: str) -> List[str]:
+        """Split a code list and qualify plain numeric codes with their exchange.
+
+        Examples: '00'/'30' → 'SZ', '60'/'68' → 'SH', '92' → 'BJ'.
+        """
+        codes = []
+        for item in re.split(r"[,，;；\s]+", code.strip()):
+            if not item:
+                continue
+            if item[:2] in ["00", "30"] and "." not in item:
+                item = f"{item}.SZ"
+            elif item[:2] in ["60", "68"] and "." not in item:
+                item = f"{item}.SH"
+            elif item[:2] in ["92"] and "." not in item:
+                item = f"{item}.BJ"
+            if item not in codes:
+                codes.append(item)
+        return codes
+
+    async def fetch_snapshot(self, codes: List[str], index_code: str | None = None) -> Dict[str, pd.DataFrame]:
+        """Fetch the full history of ``SNAPSHOT_APIS`` for a batch of stocks.
+
+        Each API yields one long, panel-shaped frame covering all ``codes``
+        (told apart by ``ts_code``), newest trade date first. The index
+        history is added as ``index_daily``. Requests run concurrently in
+        worker threads; every stock is fetched through the per-code cache
+        path, so popular tickers stay cached across batches, and concurrent
+        identical calls are coalesced by the client's single-flight group.
+        """
+        requests = [(api_name, code) for api_name in self.SNAPSHOT_APIS for code in codes]
+        requests.append(("index_daily", index_code or self.BENCHMARK_INDEX))
+        frames = await asyncio.gather(
+            *[asyncio.to_thread(self.client.request, api_name, ts_code=ts_code) for api_name, ts_code in requests],
+        )
+
+        grouped: Dict[str, List[pd.DataFrame]] = {}
+        for (api_name, _), df in zip(requests, frames):
+            grouped.setdefault(api_name, []).append(df)
+
+        snapshot = {}
+        for api_name, df_list in grouped.items():
+            df = pd.concat([x for x in df_list if len(x)] or df_list[:1], axis=0, ignore_index=True)
+            if len(df_list) > 1 and "trade_date" in df:
+                df = df.sort_values(by=["trade_date", "ts_code"], ascending=[False, True], ignore_index=True)
+            snapshot[api_name] = df
+        return snapshot
+
+    @staticmethod
+    def build_close_panel(daily_df: pd.DataFrame) -> pd.DataFrame:
+        """Pivot daily closes into a trade_date × ts_code panel in ascending date order."""
+        if len(daily_df) == 0:
+            return pd.DataFrame()
+        return daily_df.pivot_table(index="trade_date", columns="ts_code", values="close").sort_index()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        """Normalize a question so trivially different phrasings share a key."""
+        query = unicodedata.normalize("NFKC", query).lower()
+        query = re.sub(r"\s+", " ", query).strip()
+        return query.rstrip("?？.。!！ ")
+
+    @property
+    def prompt_version(self) -> str:
+        """Digest of the code prompt templates and model, invalidating cached code on change."""
+        if self._prompt_version is None:
+            # Resolve the model name without instantiating the LLM client.
+            if isinstance(self._llm, str):
+                model_name = C.service_config.llm[self._llm].model_name
+            else:
+                model_name = self._llm.model_name
+            payload = "\n".join([self.get_prompt("code_prompt"), self.get_prompt("code_example"), model_name])
+            self._prompt_version = hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+        return self._prompt_version
+
+    @staticmethod
+    def make_cache_key(prefix: str, *parts: str) -> str:
+        """Build a file-name safe cache key from its parts."""
+        payload = json.dumps(parts, ensure_ascii=False)
+        return f"{prefix}_{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+    @staticmethod
+    def hash_code(source: str) -> str:
+        """Digest of generated code, used in output cache keys."""
+        return hashlib.sha1(source.encode("utf-8")).hexdigest()
+
     async def async_execute(self):
-        """Generate and execute analysis code for the given stock code.
+        """Generate and execute analysis code for the given stock code(s).
 
-        The method normalizes the stock code to the Tushare format, calls
-        the LLM to generate Python analysis code, and finally executes that
-        code using ``exec_code``.
+        The method normalizes the stock codes to the Tushare format, starts
+        prefetching their history, calls the LLM to generate Python analysis
+        code (unless cached), and finally executes that code on the
+        prefetched data using ``exec_code`` (unless its output for the
+        latest trade date is cached).
         """
 
-        code: str = self.input_dict["code"]
-        # Normalize plain numeric codes into exchange-qualified codes.
-        # Examples: '00'/'30' → 'SZ', '60'/'68' → 'SH', '92' → 'BJ'.
-        if code[:2] in ["00", "30"]:
-            code = f"{code}.SZ"
-        elif code[:2] in ["60", "68"]:
-            code = f"{code}.SH"
-        elif code[:2] in ["92"]:
-            code = f"{code}.BJ"
+        start_time = time.monotonic()
+        codes = self.normalize_codes(self.input_dict["code"])
+        if not codes:
+            raise ValueError("code is empty")
+        code = ",".join(codes)
+        index_code: str = self.input_dict.get("index_code") or self.BENCHMARK_INDEX
 
         query: str = self.input_dict["query"]
 
-        import tushare as ts
+        # Prefetch market data while the LLM is writing the code.
+        snapshot_task = asyncio.create_task(self.fetch_snapshot(codes, index_code))
+
+        # Generated code is only reused on the same day, since the prompt
+        # asks for date ranges relative to the current date.
+        code_key = self.make_cache_key(
+            "code",
+            code,
+            index_code,
+            self.normalize_query(query),
+            self.prompt_version,
+            get_datetime("%Y%m%d"),
+        )
+        result_code = self.cache.load(code_key) if self.enable_cache else None
+        if result_code:
+            logger.info(f"load {code_key} from cache")
+        else:
+            result_code = await self.generate_code(code, index_code, query, snapshot_task)
+
+        frames = await snapshot_task
+        last_trade_date = str(frames["daily"]["trade_date"].max()) if len(frames["daily"]) else ""
+        output_key = self.make_cache_key("output", code, index_code, self.hash_code(result_code), last_trade_date)
+        if self.enable_cache:
+            cached_output = self.cache.load(output_key)
+            if cached_output:
+                logger.info(f"load {output_key} from cache")
+                self.set_output(cached_output)
+                return
+
+        global_vars = {f"{api_name}_df": df for api_name, df in frames.items()}
+        global_vars["codes"] = codes
+        global_vars["close_panel"] = self.build_close_panel(frames["daily"])
+        global_vars["pro"] = LocalProApi(frames)
+        global_vars["ta"] = ANALYTICS
+
+        async def stream_fn(chunk: str):
+            await self.context.add_stream_string_and_type(chunk, ChunkEnum.TOOL)
+
+        async def run(source: str) -> tuple[bool, str]:
+            return await exec_code(
+                source,
+                timeout=self.timeout,
+                global_vars=global_vars,
+                stream_fn=stream_fn if self.context.stream_queue is not None else None,
+                return_status=True,
+                allowed_imports=DEFAULT_ALLOWED_IMPORTS,
+                strict=True,
+            )
+
+        # Execute the generated Python code, repairing it on failure.
+        success, result = await run(result_code)
+        repairs = 0
+        while not success and repairs < self.max_repairs and time.monotonic() - start_time < self.repair_budget:
+            repairs += 1
+            logger.warning(f"repair {repairs}/{self.max_repairs} code={code} error={result}")
+            result_code = await self.repair_code(code, index_code, query, result_code, result)
+            success, result = await run(result_code)
+        self.record_repair(success, repairs)
+
+        # Only code that ran successfully is worth reusing.
+        if self.enable_cache and success and result:
+            output_key = self.make_cache_key("output", code, index_code, self.hash_code(result_code), last_trade_date)
+            self.cache.save(code_key, result_code, expire_hours=self.cache_expire_hours)
+            self.cache.save(output_key, result, expire_hours=self.cache_expire_hours)
+        self.set_output(result)
+
+    @classmethod
+    def record_repair(cls, success: bool, repairs: int):
+        """Update ``repair_stats`` with the outcome of one execution."""
+        stats = cls.repair_stats
+        stats["runs"] += 1
+        stats["repair_calls"] += repairs
+        if success:
+            stats["repaired" if repairs else "first_pass"] += 1
+        else:
+            stats["failed"] += 1
+        logger.info(f"history_calculate repair_stats={stats}")
+
+    @staticmethod
+    def trim_code(source: str, max_lines: int = 200) -> str:
+        """Drop blank and comment-only lines and prefix original line numbers.
+
+        Line numbers are kept so the LLM can match them against the error
+        message, while comments and padding no longer cost prompt tokens.
+        """
+        lines = [
+            f"{i:>3}| {line.rstrip()}"
+            for i, line in enumerate(source.splitlines(), start=1)
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+        if len(lines) > max_lines:
+            lines = lines[:max_lines] + [f"... ({len(lines) - max_lines} more lines)"]
+        return "\n".join(lines)
 
-        # Initialize the Tushare pro API using the token from environment.
-        ts.set_token(token=os.getenv("TUSHARE_API_TOKEN", ""))
+    @property
+    def repair_llm(self):
+        """LLM used for repairs, created lazily from ``repair_llm``."""
+        if not self.repair_llm_name:
+            return self.llm
+        if self._repair_llm is None:
+            llm_config = C.service_config.llm[self.repair_llm_name]
+            llm_cls = C.get_llm_class(llm_config.backend)
+            self._repair_llm = llm_cls(model_name=llm_config.model_name, **llm_config.params)
+        return self._repair_llm
 
+    async def repair_code(self, code: str, index_code: str, query: str, source: str, error: str) -> str:
+        """Ask the repair LLM to fix ``source`` given the ``error`` it raised."""
+        repair_prompt: str = self.prompt_format(
+            prompt_name="repair_prompt",
+            code=code,
+            index_code=index_code,
+            query=query,
+            current_date=get_datetime(),
+            source=self.trim_code(source),
+            error=error[-2000:],
+        )
+        messages = [Message(role=Role.USER, content=repair_prompt)]
+
+        def get_code(message: Message):
+            """Extract Python code from the assistant response."""
+
+            return extract_content(message.content, language_tag="python")
+
+        result_code = await self.repair_llm.achat(messages=messages, callback_fn=get_code)
+        logger.info(f"repaired_code=\n{result_code}")
+        return result_code
+
+    async def generate_code(self, code: str, index_code: str, query: str, snapshot_task: asyncio.Task) -> str:
+        """Ask the LLM for analysis code, cancelling the prefetch on failure."""
         code_prompt: str = self.prompt_format(
             prompt_name="code_prompt",
             code=code,
+            index_code=index_code,
             query=query,
             current_date=get_datetime(),
             example=self.get_prompt("code_example"),
@@ -95,11 +399,13 @@ class HistoryCalculateOp(BaseAsyncToolOp):
 
             return extract_content(message.content, language_tag="python")
 
-        result_code = await self.llm.achat(messages=messages, callback_fn=get_code)
+        try:
+            result_code = await self.llm.achat(messages=messages, callback_fn=get_code)
+        except BaseException:
+            snapshot_task.cancel()
+            raise
         logger.info(f"result_code=\n{result_code}")
-
-        # Execute the generated Python code and set the execution result.
-        self.set_output(exec_code(result_code))
+        return result_code
 
     async def async_default_execute(self, e: Exception = None, **_kwargs):
         """Fill outputs with a default failure message when execution fails."""
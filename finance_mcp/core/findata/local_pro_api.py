@@ -0,0 +1,76 @@
+"""Offline stand-in for ``tushare.pro_api()`` backed by prefetched frames."""
+
+from typing import Dict, List
+
+import pandas as pd
+
+
+class LocalProApi:
+    """Serve ``pro.<api>(...)`` calls from DataFrames prepared in advance.
+
+    Instances are handed to sandboxed analysis code in place of the real
+    Tushare client, so generated code can keep the familiar
+    ``pro.daily(ts_code=..., start_date=..., end_date=...)`` calls without any
+    authentication or network I/O. Only the APIs present in ``frames`` are
+    available.
+    """
+
+    def __init__(self, frames: Dict[str, pd.DataFrame]):
+        """Initialize the shim.
+
+        Args:
+            frames: Mapping from Tushare API name (e.g. ``daily``) to its data.
+        """
+        self.frames: Dict[str, pd.DataFrame] = frames
+
+    def query(
+        self,
+        api_name: str,
+        fields: str | List[str] | None = None,
+        ts_code: str | None = None,
+        trade_date: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+        **_kwargs,
+    ) -> pd.DataFrame:
+        """Filter the prefetched frame of ``api_name`` like Tushare would.
+
+        Args:
+            api_name: Tushare API name.
+            fields: Comma separated string or list of columns to keep.
+            ts_code: One code or a comma separated list of codes.
+            trade_date: Exact trading day, ``YYYYMMDD``.
+            start_date: Inclusive lower bound, ``YYYYMMDD``.
+            end_date: Inclusive upper bound, ``YYYYMMDD``.
+
+        Returns:
+            Matching rows, newest first.
+        """
+        if api_name not in self.frames:
+            raise ValueError(f"api={api_name} is not available offline, choose from {sorted(self.frames)}")
+
+        df = self.frames[api_name]
+        if len(df) == 0:
+            return df.copy()
+
+        mask = pd.Series(True, index=df.index)
+        if ts_code:
+            mask &= df["ts_code"].isin([x.strip() for x in ts_code.split(",")])
+        if trade_date:
+            mask &= df["trade_date"] == str(trade_date)
+        if start_date:
+            mask &= df["trade_date"] >= str(start_date)
+        if end_date:
+            mask &= df["trade_date"] <= str(end_date)
+
+        df = df.loc[mask]
+        if fields:
+            columns = fields.split(",") if isinstance(fields, str) else fields
+            df = df[[x.strip() for x in columns if x.strip() in df.columns]]
+        return df.sort_values(by="trade_date", ascending=False, ignore_index=True) if "trade_date" in df else df
+
+    def __getattr__(self, api_name: str):
+        # ``frames`` is looked up through ``__dict__`` so unpickling works.
+        if api_name.startswith("__") or api_name not in self.__dict__.get("frames", {}):
+            raise AttributeError(api_name)
+        return lambda **kwargs: self.query(api_name, **kwargs)
@@ -0,0 +1,109 @@
+"""Single-flight coalescing of concurrent identical calls."""
+
+import asyncio
+import hashlib
+import json
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+class _Call:
+    """In-flight call shared by a leader thread and its followers."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Let concurrent identical calls share one execution and its result.
+
+    The first caller of a key (the leader) runs the function; callers that
+    arrive with the same key while it is in flight wait for it and receive
+    its result (or exception) instead of issuing their own call. Threads and
+    asyncio tasks are coalesced separately through :meth:`do` and :meth:`ado`;
+    tasks only with tasks of the same event loop.
+
+    ``stats`` counts ``calls`` (all requests), ``executed`` (leader runs) and
+    ``coalesced`` (requests served by another caller's run).
+    """
+
+    def __init__(self, copy_result: Callable[[Any], Any] | None = None):
+        """Initialize the group.
+
+        Args:
+            copy_result: Applied to the shared result before it is handed to
+                any caller, leader included, e.g. ``pd.DataFrame.copy`` so
+                callers cannot mutate each other's data.
+        """
+        self.copy_result = copy_result
+        self.stats: Dict[str, int] = {"calls": 0, "executed": 0, "coalesced": 0}
+
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        # In-flight futures per event loop; a future cannot be awaited from another loop.
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Future]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    @staticmethod
+    def make_key(api_name: str, params: dict, fields: List[str] | None = None, scope: tuple = ()) -> str:
+        """Build a stable key from an API name, its parameters and fields.
+
+        ``scope`` identifies the caller, e.g. ``(url, token)`` of a client, so
+        requests to different endpoints or accounts are never coalesced.
+        """
+        payload = json.dumps([scope, api_name, params, fields], sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats[name] += 1
+
+    def _share(self, result: Any) -> Any:
+        return self.copy_result(result) if self.copy_result and result is not None else result
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run ``fn`` once for all threads concurrently requesting ``key``."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            self._count("coalesced")
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return self._share(call.result)
+
+        self._count("executed")
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return self._share(call.result)
+
+    async def ado(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await ``fn()`` once for all tasks concurrently requesting ``key``."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            tasks = self._tasks.setdefault(loop, {})
+        task = tasks.get(key)
+        if task is not None:
+            self._count("coalesced")
+            return self._share(await asyncio.shield(task))
+
+        self._count("executed")
+        task = tasks[key] = asyncio.ensure_future(fn())
+        task.add_done_callback(lambda _: tasks.pop(key, None))
+        return self._share(await asyncio.shield(task))
@@ -0,0 +1,274 @@
+"""On-disk Parquet cache for Tushare responses."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import pandas as pd
+from loguru import logger
+
+
+class TushareCache:
+    """Persistent columnar cache keyed by ``(api_name, params, fields)``.
+
+    Data is stored as Parquet under ``{cache_dir}/{api_name}/{fields_digest}/``
+    in one of three partition layouts:
+
+    * ``ts_code={code}`` – per-stock history of a date-indexed API. The
+      covered date range is recorded next to the data so that requests for a
+      longer range only fetch the missing head/tail from the network.
+    * ``trade_date={date}`` – one market-wide trading day of a date-indexed API.
+    * ``query={digest}`` – any other request, cached as a whole.
+
+    TTL rules: rows of past trading days are immutable and never expire; rows
+    of the day a fetch ran on (and later) may be partial and are refetched
+    once the fetch is older than ``today_ttl_minutes``, even after the date
+    has rolled over; whole-query
+    entries expire after ``api_ttl_hours[api_name]`` (or ``default_ttl_hours``).
+    """
+
+    # Date column of Tushare APIs whose rows are keyed by trading day.
+    DATE_INDEXED_APIS: Dict[str, str] = {
+        "daily": "trade_date",
+        "weekly": "trade_date",
+        "monthly": "trade_date",
+        "adj_factor": "trade_date",
+        "daily_basic": "trade_date",
+        "moneyflow": "trade_date",
+        "stk_limit": "trade_date",
+        "fund_daily": "trade_date",
+        "index_daily": "trade_date",
+    }
+
+    # Earliest date used when a range request has no ``start_date``.
+    EARLIEST_DATE = "19900101"
+
+    def __init__(
+        self,
+        cache_dir: str = "cache/tushare",
+        today_ttl_minutes: float = 30,
+        default_ttl_hours: float = 1,
+        api_ttl_hours: Dict[str, float] | None = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Root directory of the Parquet store.
+            today_ttl_minutes: Freshness window for data that includes today.
+            default_ttl_hours: Expiration of whole-query entries.
+            api_ttl_hours: Per-API override of ``default_ttl_hours``.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.today_ttl_minutes = today_ttl_minutes
+        self.default_ttl_hours = default_ttl_hours
+        self.api_ttl_hours: Dict[str, float] = {
+            "stock_basic": 24,
+            "trade_cal": 24,
+            **(api_ttl_hours or {}),
+        }
+
+        self._lock = threading.Lock()
+        self._partition_locks: Dict[Path, threading.Lock] = {}
+
+    @staticmethod
+    def today() -> str:
+        """Return today's date in Tushare ``YYYYMMDD`` format."""
+        return datetime.now().strftime("%Y%m%d")
+
+    @staticmethod
+    def shift_date(date: str, days: int) -> str:
+        """Shift a ``YYYYMMDD`` date by ``days`` calendar days."""
+        return (datetime.strptime(date, "%Y%m%d") + timedelta(days=days)).strftime("%Y%m%d")
+
+    @staticmethod
+    def _digest(obj) -> str:
+        return hashlib.sha1(json.dumps(obj, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+    def get_partition_dir(self, api_name: str, fields: List[str] | None, key: str, value: str) -> Path:
+        """Return the directory of one partition, e.g. ``ts_code=000001.SZ``."""
+        fields_digest = self._digest(sorted(fields)) if fields else "all"
+        return self.cache_dir / api_name / fields_digest / f"{key}={value}"
+
+    def get_partition_lock(self, partition_dir: Path) -> threading.Lock:
+        """Return the lock serializing reads and writes of one partition."""
+        with self._lock:
+            return self._partition_locks.setdefault(partition_dir, threading.Lock())
+
+    @staticmethod
+    def read_partition(partition_dir: Path) -> tuple[pd.DataFrame | None, dict]:
+        """Load a partition's data and metadata; ``(None, {})`` when missing."""
+        meta_path = partition_dir / "meta.json"
+        data_path = partition_dir / "data.parquet"
+        if not meta_path.exists() or not data_path.exists():
+            return None, {}
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            return pd.read_parquet(data_path), meta
+        except Exception as e:
+            logger.warning(f"drop unreadable tushare cache partition={partition_dir}: {e}")
+            return None, {}
+
+    @staticmethod
+    def write_partition(partition_dir: Path, df: pd.DataFrame, meta: dict):
+        """Atomically persist a partition's data and metadata."""
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        data_path = partition_dir / "data.parquet"
+        meta_path = partition_dir / "meta.json"
+
+        tmp_data_path = data_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        df.to_parquet(tmp_data_path, index=False)
+        os.replace(tmp_data_path, data_path)
+
+        tmp_meta_path = meta_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_meta_path, meta_path)
+
+    def fetch(
+        self,
+        api_name: str,
+        fields: List[str] | None,
+        params: dict,
+        loader: Callable[..., pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Serve a request from the cache, calling ``loader`` only for misses.
+
+        Args:
+            api_name: API endpoint name.
+            fields: Optional field list. None means all fields.
+            params: API parameters of the request.
+            loader: ``loader(**params)`` performs the network request for the
+                same ``api_name`` and ``fields``.
+
+        Returns:
+            DataFrame with requested data.
+        """
+        date_col = self.DATE_INDEXED_APIS.get(api_name)
+        if date_col and (not fields or date_col in fields):
+            keys = set(params.keys())
+            ts_code = params.get("ts_code", "")
+            if keys <= {"ts_code", "start_date", "end_date"} and ts_code and "," not in ts_code:
+                return self._fetch_code_range(api_name, fields, params, loader, date_col)
+            if keys == {"trade_date"}:
+                return self._fetch_trade_date(api_name, fields, params, loader)
+
+        return self._fetch_query(api_name, fields, params, loader)
+
+    @staticmethod
+    def get_fetched_date(meta: dict) -> str:
+        """First day of a partition whose rows may be partial: the day it was last fetched."""
+        return meta.get("fetched_date") or datetime.fromtimestamp(meta["fetched_at"]).strftime("%Y%m%d")
+
+    def _is_fresh(self, fetched_at: float, ttl_hours: float) -> bool:
+        return time.time() - fetched_at < ttl_hours * 3600
+
+    def _fetch_code_range(
+        self,
+        api_name: str,
+        fields: List[str] | None,
+        params: dict,
+        loader: Callable[..., pd.DataFrame],
+        date_col: str,
+    ) -> pd.DataFrame:
+        """Serve a per-stock date range, fetching only uncovered head/tail."""
+        ts_code: str = params["ts_code"]
+        today = self.today()
+        start_date: str = params.get("start_date") or self.EARLIEST_DATE
+        end_date: str = min(params.get("end_date") or today, today)
+
+        partition_dir = self.get_partition_dir(api_name, fields, "ts_code", ts_code)
+        with self.get_partition_lock(partition_dir):
+            df, meta = self.read_partition(partition_dir)
+
+            segments: List[tuple[str, str]] = []
+            # First day whose rows may be partial, and when it was fetched.
+            fetched_date, fetched_at = today, time.time()
+            if df is None:
+                df = pd.DataFrame()
+                segments.append((start_date, end_date))
+                covered_start, covered_end = start_date, end_date
+            else:
+                covered_start, covered_end = meta["start_date"], meta["end_date"]
+                # Rows from the fetch day on may have been partial (intraday); treat them as uncovered once stale.
+                last_date = self.get_fetched_date(meta)
+                if covered_end >= last_date:
+                    if self._is_fresh(meta["fetched_at"], self.today_ttl_minutes / 60):
+                        # Still fresh, but stays partial: keep its fetch stamp so it is refetched later.
+                        fetched_date, fetched_at = last_date, meta["fetched_at"]
+                    else:
+                        covered_end = self.shift_date(last_date, -1)
+
+                if start_date < covered_start:
+                    segments.append((start_date, self.shift_date(covered_start, -1)))
+                if end_date > covered_end:
+                    segments.append((self.shift_date(covered_end, 1), end_date))
+                covered_start, covered_end = min(start_date, covered_start), max(end_date, covered_end)
+
+            if segments:
+                logger.info(f"tushare cache miss api={api_name} ts_code={ts_code} segments={segments}")
+                df_list = [df] + [loader(ts_code=ts_code, start_date=s, end_date=e) for s, e in segments]
+                df_list = [x for x in df_list if len(x) > 0]
+                if df_list:
+                    df = pd.concat(df_list, axis=0, ignore_index=True)
+                    df = df.drop_duplicates(subset=[date_col], keep="last")
+                    df = df.sort_values(by=date_col, ascending=False, ignore_index=True)
+
+                meta = {
+                    "start_date": covered_start,
+                    "end_date": covered_end,
+                    "fetched_date": fetched_date,
+                    "fetched_at": fetched_at,
+                }
+                self.write_partition(partition_dir, df, meta)
+
+        if len(df) == 0:
+            return df
+        mask = (df[date_col] >= start_date) & (df[date_col] <= end_date)
+        return df.loc[mask].reset_index(drop=True)
+
+    def _fetch_trade_date(
+        self,
+        api_name: str,
+        fields: List[str] | None,
+        params: dict,
+        loader: Callable[..., pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Serve one market-wide trading day; past days never expire."""
+        trade_date: str = params["trade_date"]
+        partition_dir = self.get_partition_dir(api_name, fields, "trade_date", trade_date)
+        with self.get_partition_lock(partition_dir):
+            df, meta = self.read_partition(partition_dir)
+            if df is not None:
+                if meta["fetched_date"] > trade_date or self._is_fresh(meta["fetched_at"], self.today_ttl_minutes / 60):
+                    return df
+
+            df = loader(**params)
+            meta = {"fetched_date": self.today(), "fetched_at": time.time()}
+            self.write_partition(partition_dir, df, meta)
+            return df
+
+    def _fetch_query(
+        self,
+        api_name: str,
+        fields: List[str] | None,
+        params: dict,
+        loader: Callable[..., pd.DataFrame],
+    ) -> pd.DataFrame:
+        """Serve any other request as a whole with a per-API TTL."""
+        ttl_hours = self.api_ttl_hours.get(api_name, self.default_ttl_hours)
+        partition_dir = self.get_partition_dir(api_name, fields, "query", self._digest(params))
+        with self.get_partition_lock(partition_dir):
+            df, meta = self.read_partition(partition_dir)
+            if df is not None and self._is_fresh(meta["fetched_at"], ttl_hours):
+                return df
+
+            df = loader(**params)
+            self.write_partition(partition_dir, df, {"params": params, "fetched_at": time.time()})
+            return df
@@ -1,33 +1,166 @@
 """Tushare API client."""
 
 import os
-from typing import List
+import time
+from typing import Dict, FrozenSet, Iterator, List
 
+import numpy as np
 import pandas as pd
 import requests
+from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .single_flight import SingleFlight
+from .tushare_cache import TushareCache
+
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    import json
+
+    _loads = json.loads
 
 
 class TushareClient:
-    """Tushare API client."""
+    """Tushare API client.
+
+    All requests go through a pooled, keep-alive ``requests.Session`` so that
+    paginated and bulk pulls reuse TCP (and proxy) connections instead of
+    paying a fresh handshake for every page. When a :class:`TushareCache` is
+    attached, requests are served from the on-disk store first. Identical
+    requests of clients with the same URL and token in flight at the same
+    time share one call through the process-wide ``single_flight`` group;
+    each caller receives its own copy of the result.
+    """
+
+    # HTTP status codes retried by the transport with exponential backoff.
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+    # Tushare business codes returned when the per-minute quota is exceeded.
+    RATE_LIMIT_CODES = (40203,)
+
+    # Numeric fields per API, decoded straight into float64 arrays (``None``
+    # becomes NaN) so they keep one dtype across all pages of a request. The
+    # same column name may mean something else in another API, so hints only
+    # apply to the API they are listed for; other fields and APIs fall back to
+    # per-page pandas inference (an all-missing page may then decode as object).
+    _OHLC_FIELDS = ("open", "high", "low", "close", "pre_close", "change", "pct_chg", "vol", "amount")
+    _MONEYFLOW_FIELDS = tuple(
+        f"{side}_{size}_{unit}"
+        for size in ("sm", "md", "lg", "elg")
+        for side in ("buy", "sell")
+        for unit in ("vol", "amount")
+    ) + ("net_mf_vol", "net_mf_amount")
+    FLOAT_FIELDS: Dict[str, FrozenSet[str]] = {
+        "daily": frozenset(_OHLC_FIELDS),
+        "weekly": frozenset(_OHLC_FIELDS),
+        "monthly": frozenset(_OHLC_FIELDS),
+        "index_daily": frozenset(_OHLC_FIELDS),
+        "fund_daily": frozenset(_OHLC_FIELDS),
+        "adj_factor": frozenset(["adj_factor"]),
+        "daily_basic": frozenset(
+            [
+                "close",
+                "turnover_rate",
+                "turnover_rate_f",
+                "volume_ratio",
+                "pe",
+                "pe_ttm",
+                "pb",
+                "ps",
+                "ps_ttm",
+                "dv_ratio",
+                "dv_ttm",
+                "total_share",
+                "float_share",
+                "free_share",
+                "total_mv",
+                "circ_mv",
+            ],
+        ),
+        "stk_limit": frozenset(["pre_close", "up_limit", "down_limit"]),
+        "moneyflow": frozenset(_MONEYFLOW_FIELDS),
+    }
+    # Date fields, kept as ``YYYYMMDD`` strings unless ``parse_dates`` is set.
+    DATE_FIELDS = frozenset(["trade_date", "cal_date", "pretrade_date", "ann_date", "end_date", "list_date"])
+
+    # Shared by all clients in the process; ``single_flight.stats`` reports
+    # how many calls were coalesced.
+    single_flight = SingleFlight(copy_result=pd.DataFrame.copy)
 
     def __init__(
         self,
         request_limit_size: int = 10000,
         timeout: float = 30.0,
+        url: str = "http://api.waditu.com/dataapi",
+        pool_connections: int = 4,
+        pool_maxsize: int = 16,
+        pool_block: bool = True,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        cache: TushareCache | None = None,
+        parse_dates: bool = False,
+        enable_single_flight: bool = True,
     ):
         """Initialize client.
 
         Args:
             request_limit_size: Max records per request. Default 10000.
             timeout: Request timeout in seconds. Default 30.0.
+            url: Tushare HTTP endpoint.
+            pool_connections: Number of per-host connection pools to cache.
+            pool_maxsize: Max keep-alive connections kept per host.
+            pool_block: Block instead of opening extra connections once
+                ``pool_maxsize`` is reached, capping per-host concurrency.
+            max_retries: Retries on 5xx / 429 responses and rate-limit codes.
+            backoff_factor: Base delay in seconds for exponential backoff.
+            cache: Optional on-disk cache consulted before the network.
+            parse_dates: Convert known date fields to ``datetime64``.
+            enable_single_flight: Coalesce concurrent identical requests.
         """
         self.token = os.getenv("TUSHARE_API_TOKEN")
         if not self.token:
             raise ValueError("TUSHARE_API_TOKEN not set")
 
-        self.url = "http://api.waditu.com/dataapi"
+        self.url = url
         self.request_limit_size = request_limit_size
         self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.cache = cache
+        self.parse_dates = parse_dates
+        self.enable_single_flight = enable_single_flight
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=self.RETRY_STATUS_CODES,
+            allowed_methods=frozenset(["POST"]),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        """Close the pooled session and release its connections."""
+        self.session.close()
+
+    def __enter__(self) -> "TushareClient":
+        return self
+
+    def __exit__(self, exc_type=None, exc_val=None, exc_tb=None):
+        self.close()
+        return False
 
     def request(
         self,
@@ -45,64 +178,203 @@ class TushareClient:
         Returns:
             DataFrame with requested data.
         """
+        if self.enable_single_flight:
+            key = SingleFlight.make_key(api_name, kwargs, fields, scope=(self.url, self.token))
+            df = self.single_flight.do(key, lambda: self._request_cached(api_name, fields, **kwargs))
+        else:
+            df = self._request_cached(api_name, fields, **kwargs)
+
+        if self.parse_dates:
+            df = self._convert_dates(df)
+        return df
+
+    def _request_cached(
+        self,
+        api_name: str,
+        fields: List[str] | None = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Request data through the on-disk cache when one is attached."""
+        if self.cache is not None:
+            return self.cache.fetch(
+                api_name,
+                fields,
+                kwargs,
+                loader=lambda **params: self.request_remote(api_name, fields, **params),
+            )
+        return self.request_remote(api_name, fields, **kwargs)
+
+    def iter_pages(
+        self,
+        api_name: str,
+        fields: List[str] | None = None,
+        as_arrow: bool = False,
+        **kwargs,
+    ) -> Iterator:
+        """Yield each page of a query as soon as it arrives.
+
+        Pages are decoded one at a time, so peak memory stays bounded by a
+        single page regardless of the total result size. The on-disk cache is
+        bypassed.
+
+        Args:
+            api_name: API endpoint name.
+            fields: Optional field list. None returns all fields.
+            as_arrow: Yield ``pyarrow.RecordBatch`` instead of ``DataFrame``.
+            **kwargs: Additional API parameters.
+
+        Yields:
+            One non-empty ``DataFrame`` (or record batch) per page.
+        """
+        for page_fields, page_items in self._iter_raw_pages(api_name, fields, **kwargs):
+            yield self._build_page(api_name, page_fields, page_items, as_arrow)
+
+    def _build_data_dict(self, api_name: str, fields: List[str] | None, offset: int, **kwargs) -> dict:
         data_dict: dict = {
             "api_name": api_name,
             "token": self.token,
             "params": {
-                "offset": 0,
+                "offset": offset,
                 "limit": self.request_limit_size,
                 **kwargs,
             },
         }
         if fields:
             data_dict["fields"] = fields
+        return data_dict
 
-        df_list = []
+    def _iter_raw_pages(self, api_name: str, fields: List[str] | None = None, **kwargs) -> Iterator[tuple]:
+        """Walk the offsets of a query and yield non-empty ``(fields, items)`` pages."""
+        data_dict = self._build_data_dict(api_name, fields, 0, **kwargs)
         offset = 0
 
         while True:
             data_dict["params"]["offset"] = offset
-            response = requests.post(
+            page_fields, page_items, has_more = self._post_page(data_dict)
+            if page_items:
+                yield page_fields, page_items
+            offset += len(page_items)
+
+            if not has_more or len(page_items) == 0:
+                break
+
+    def request_remote(
+        self,
+        api_name: str,
+        fields: List[str] | None = None,
+        **kwargs,
+    ) -> pd.DataFrame:
+        """Request all pages of a query from the network.
+
+        Unlike :meth:`request`, this bypasses the on-disk cache, single-flight
+        coalescing and date parsing. Used by loaders that manage the cache
+        themselves, e.g. :class:`TushareSyncer`.
+        """
+        # Each page is decoded into compact column arrays right away; the
+        # frame is assembled once from the per-column chunks at the end.
+        chunks: dict = {}
+        columns: List[str] = []
+        for page_fields, page_items in self._iter_raw_pages(api_name, fields, **kwargs):
+            columns = columns or page_fields
+            self._decode_page(api_name, page_fields, page_items, chunks)
+
+        return self._build_frame(columns, chunks)
+
+    def _post_page(self, data_dict: dict) -> tuple[List[str], list, bool]:
+        """Post a single page request, backing off on Tushare rate limits.
+
+        Returns:
+            (fields, items, has_more)
+        """
+        for attempt in range(self.max_retries + 1):
+            response = self.session.post(
                 url=self.url,
                 json=data_dict,
                 timeout=self.timeout,
             )
-            df, has_more = self._parse_response(response)
-            df_list.append(df)
-            offset += len(df)
+            response.raise_for_status()
+            data = _loads(response.content)
 
-            if not has_more or len(df) == 0:
-                break
+            if data and data.get("code") in self.RATE_LIMIT_CODES and attempt < self.max_retries:
+                delay = self.backoff_factor * (2**attempt)
+                logger.warning(f"tushare rate limited api={data_dict['api_name']}, retry in {delay:.1f}s")
+                time.sleep(delay)
+                continue
 
-        if len(df_list) == 0:
-            raise RuntimeError(f"No data returned from API: {api_name}")
+            return self._parse_response(data)
 
-        if len(df_list) == 1:
-            return df_list[0]
-        return pd.concat(df_list, axis=0, ignore_index=True)
+        raise RuntimeError(f"Retries exhausted for API: {data_dict['api_name']}")
 
     @staticmethod
-    def _parse_response(response: requests.Response) -> tuple[pd.DataFrame, bool]:
-        """Parse API response to DataFrame.
+    def _parse_response(data: dict) -> tuple[List[str], list, bool]:
+        """Validate an API response payload and return its raw page.
 
         Returns:
-            (DataFrame, has_more)
+            (fields, items, has_more)
         """
-        response.raise_for_status()
-        data = response.json()
-
         if not data:
-            return pd.DataFrame(), False
+            return [], [], False
 
         if data.get("code") != 0:
             raise ValueError(f"API error: {data.get('msg', 'Unknown error')}")
 
-        data_dict = data.get("data", {})
-        items = data_dict.get("items", [])
-        fields = data_dict.get("fields", [])
+        data_dict = data.get("data") or {}
+        items = data_dict.get("items") or []
+        fields = data_dict.get("fields") or []
         has_more = data_dict.get("has_more", False)
 
         if not items or not fields:
-            return pd.DataFrame(), False
+            return [], [], False
+
+        return fields, items, has_more
+
+    @classmethod
+    def _decode_page(cls, api_name: str, fields: List[str], items: list, chunks: dict) -> dict:
+        """Transpose one page of rows into typed per-column arrays.
+
+        Numeric fields hinted for ``api_name`` go straight to ``float64``;
+        other fields are narrowed by pandas inference (e.g. to the compact
+        string dtype) so the page's Python row objects can be freed
+        immediately. Arrays are appended to ``chunks[field]``.
+        """
+        float_fields = cls.FLOAT_FIELDS.get(api_name, frozenset())
+        for name, values in zip(fields, zip(*items)):
+            if name in float_fields:
+                column = pd.Series(np.array(values, dtype=np.float64), name=name, copy=False)
+            else:
+                column = pd.Series(np.array(values, dtype=object), name=name, copy=False).infer_objects()
+            chunks.setdefault(name, []).append(column)
+        return chunks
+
+    @staticmethod
+    def _build_frame(fields: List[str], chunks: dict) -> pd.DataFrame:
+        """Assemble decoded column chunks into a DataFrame in a single pass.
+
+        Each column is concatenated exactly once and the resulting columns
+        are handed to pandas without a further copy.
+        """
+        if not fields or not chunks:
+            return pd.DataFrame()
+
+        columns = {}
+        for name in fields:
+            parts = chunks.pop(name)
+            columns[name] = parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+        return pd.DataFrame(columns, copy=False)
+
+    @classmethod
+    def _build_page(cls, api_name: str, fields: List[str], items: list, as_arrow: bool = False):
+        """Decode a single page into a ``DataFrame`` or Arrow record batch."""
+        df = cls._build_frame(fields, cls._decode_page(api_name, fields, items, {}))
+        if as_arrow:
+            import pyarrow as pa
+
+            return pa.RecordBatch.from_pandas(df, preserve_index=False)
+        return df
 
-        return pd.DataFrame(items, columns=fields), has_more
+    @classmethod
+    def _convert_dates(cls, df: pd.DataFrame) -> pd.DataFrame:
+        """Convert known ``YYYYMMDD`` date fields to ``datetime64``."""
+        for name in cls.DATE_FIELDS.intersection(df.columns):
+            df[name] = pd.to_datetime(df[name], format="%Y%m%d", errors="coerce")
+        return df
@@ -0,0 +1,174 @@
+"""Incremental delta sync of date-indexed Tushare data into the local store."""
+
+import time
+from typing import Dict, List
+
+import pandas as pd
+from loguru import logger
+
+from .tushare_cache import TushareCache
+from .tushare_client import TushareClient
+
+
+class TushareSyncer:
+    """Keep per-stock partitions of a :class:`TushareCache` up to date.
+
+    The last synced trade date of a ``ts_code`` partition is its covered
+    ``end_date``, capped to the day before it was fetched: rows from the fetch
+    day on may have been partial (intraday). A sync only requests trading days
+    after it: when
+    many stocks are behind, each missing day is pulled once market-wide
+    (``trade_date=...``) and split per stock; when few are, each stock pulls
+    its own missing range. Stocks without any local data get a full history.
+    """
+
+    def __init__(self, client: TushareClient, cache: TushareCache | None = None, exchange: str = "SSE"):
+        """Initialize the syncer.
+
+        Args:
+            client: Client used for network requests.
+            cache: Local store to sync into. Defaults to ``client.cache``.
+            exchange: Exchange whose ``trade_cal`` defines trading days.
+        """
+        self.client = client
+        self.cache = cache or client.cache
+        if self.cache is None:
+            raise ValueError("TushareSyncer requires a TushareCache")
+        self.exchange = exchange
+
+    def get_last_synced_date(self, api_name: str, ts_code: str, fields: List[str] | None = None) -> str | None:
+        """Return the last completely synced trade date of ``ts_code``, or ``None``."""
+        partition_dir = self.cache.get_partition_dir(api_name, fields, "ts_code", ts_code)
+        _, meta = self.cache.read_partition(partition_dir)
+        if not meta.get("end_date"):
+            return None
+        return min(meta["end_date"], self.cache.shift_date(self.cache.get_fetched_date(meta), -1))
+
+    def get_trade_dates(self, start_date: str, end_date: str) -> List[str]:
+        """Return open trading days in ``[start_date, end_date]``, ascending."""
+        df = self.client.request(
+            "trade_cal",
+            exchange=self.exchange,
+            start_date=start_date,
+            end_date=end_date,
+            is_open="1",
+        )
+        if len(df) == 0:
+            return []
+        return sorted(df["cal_date"].astype(str).tolist())
+
+    def sync(
+        self,
+        api_name: str,
+        ts_codes: List[str],
+        end_date: str | None = None,
+        start_date: str | None = None,
+        fields: List[str] | None = None,
+    ) -> Dict[str, int]:
+        """Bring ``ts_codes`` up to ``end_date``, fetching only new trading days.
+
+        Args:
+            api_name: Date-indexed API name, e.g. ``daily`` or ``adj_factor``.
+            ts_codes: Stocks to sync.
+            end_date: Last date to sync. Defaults to today.
+            start_date: History start for stocks never synced before.
+            fields: Optional field list. None means all fields; ``ts_code`` and
+                the date column are added when missing, since syncing keys on them.
+
+        Returns:
+            Counters: ``full`` (stocks fetched from scratch), ``delta`` (stocks
+            that received new rows), ``days`` (market-wide days pulled) and ``rows`` (new rows).
+        """
+        date_col = TushareCache.DATE_INDEXED_APIS.get(api_name)
+        if not date_col:
+            raise ValueError(f"{api_name} is not a date-indexed API")
+        if fields:
+            fields = [*fields, *[name for name in ("ts_code", date_col) if name not in fields]]
+
+        today = self.cache.today()
+        end_date = min(end_date or today, today)
+        start_date = start_date or TushareCache.EARLIEST_DATE
+        stats = {"full": 0, "delta": 0, "days": 0, "rows": 0}
+
+        last_dates: Dict[str, str] = {}
+        for ts_code in ts_codes:
+            last_date = self.get_last_synced_date(api_name, ts_code, fields)
+            if last_date is None:
+                df = self.cache.fetch(
+                    api_name,
+                    fields,
+                    {"ts_code": ts_code, "start_date": start_date, "end_date": end_date},
+                    loader=lambda **params: self.client.request_remote(api_name, fields, **params),
+                )
+                stats["full"] += 1
+                stats["rows"] += len(df)
+            else:
+                last_dates[ts_code] = last_date
+
+        behind = {k: v for k, v in last_dates.items() if v < end_date}
+        if not behind:
+            return stats
+
+        trade_dates = self.get_trade_dates(self.cache.shift_date(min(behind.values()), 1), end_date)
+        new_rows: Dict[str, List[pd.DataFrame]] = {ts_code: [] for ts_code in behind}
+
+        if len(behind) > len(trade_dates):
+            for trade_date in trade_dates:
+                df = self.client.request_remote(api_name, fields, trade_date=trade_date)
+                stats["days"] += 1
+                if len(df) == 0:
+                    continue
+                for ts_code, df_code in df.groupby("ts_code", sort=False):
+                    if ts_code in behind and behind[ts_code] < trade_date:
+                        new_rows[ts_code].append(df_code)
+        else:
+            for ts_code, last_date in behind.items():
+                df = self.client.request_remote(
+                    api_name,
+                    fields,
+                    ts_code=ts_code,
+                    start_date=self.cache.shift_date(last_date, 1),
+                    end_date=end_date,
+                )
+                if len(df) > 0:
+                    new_rows[ts_code].append(df)
+
+        for ts_code, df_list in new_rows.items():
+            # Merged even without rows, so the sync state still advances past empty days.
+            rows = self._merge(api_name, fields, ts_code, df_list, date_col, end_date)
+            stats["rows"] += rows
+            if rows > 0:
+                stats["delta"] += 1
+
+        logger.info(f"tushare sync api={api_name} codes={len(ts_codes)} stats={stats}")
+        return stats
+
+    def _merge(
+        self,
+        api_name: str,
+        fields: List[str] | None,
+        ts_code: str,
+        df_list: List[pd.DataFrame],
+        date_col: str,
+        end_date: str,
+    ) -> int:
+        """Merge new rows into a stock partition and advance its sync state."""
+        partition_dir = self.cache.get_partition_dir(api_name, fields, "ts_code", ts_code)
+        with self.cache.get_partition_lock(partition_dir):
+            df, meta = self.cache.read_partition(partition_dir)
+            rows = sum(len(x) for x in df_list)
+            df_list = [x for x in [df, *df_list] if x is not None and len(x) > 0]
+
+            df = pd.concat(df_list, axis=0, ignore_index=True) if df_list else pd.DataFrame()
+            if len(df) > 0:
+                df = df.drop_duplicates(subset=[date_col], keep="last")
+                df = df.sort_values(by=date_col, ascending=False, ignore_index=True)
+
+            meta = {
+                **meta,
+                "end_date": max(meta.get("end_date", end_date), end_date),
+                "fetched_date": self.cache.today(),
+                "fetched_at": time.time(),
+            }
+            self.cache.write_partition(partition_dir, df, meta)
+            return rows
@@ -8,6 +8,7 @@ through a structured tool interface.
 """
 
 from flowllm.core.context import C
+from flowllm.core.enumeration import ChunkEnum
 from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall
 
@@ -25,6 +26,16 @@ class ExecuteCodeOp(BaseAsyncToolOp):
 
     file_path = __file__
 
+    def __init__(self, max_output_chars: int = 20000, **kwargs):
+        """Initialize the op.
+
+        Args:
+            max_output_chars: Cap on the captured output returned to the caller.
+            **kwargs: Additional keyword arguments passed to ``BaseAsyncToolOp``.
+        """
+        super().__init__(**kwargs)
+        self.max_output_chars: int = max_output_chars
+
     def build_tool_call(self) -> ToolCall:
         """Build the tool call schema used by FlowLLM.
 
@@ -51,10 +62,21 @@ class ExecuteCodeOp(BaseAsyncToolOp):
         The method reads the ``code`` field from ``input_dict``,
         delegates execution to :func:`exec_code`, and stores the
         textual result in the operation output. Optionally accepts
-        a ``timeout`` parameter to limit execution time.
+        a ``timeout`` parameter to limit execution time. When the op runs
+        with a stream queue, output is also streamed as ``TOOL`` chunks
+        while the code is running.
         """
         timeout = self.input_dict.get("timeout", 30)
-        result = await exec_code(self.input_dict["code"], timeout=timeout)
+
+        async def stream_fn(chunk: str):
+            await self.context.add_stream_string_and_type(chunk, ChunkEnum.TOOL)
+
+        result = await exec_code(
+            self.input_dict["code"],
+            timeout=timeout,
+            stream_fn=stream_fn if self.context.stream_queue is not None else None,
+            max_output_chars=self.max_output_chars,
+        )
         self.set_output(result)
 
     async def async_default_execute(self, e: Exception = None, **_kwargs):
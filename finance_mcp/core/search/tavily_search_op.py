@@ -2,7 +2,7 @@
 
 This module defines :class:`TavilySearchOp`, an asynchronous tool
 operation that uses the Tavily API to perform web search and optional
-content extraction with character-length constraints.
+content extraction within token budgets.
 """
 
 import json
@@ -13,6 +13,8 @@ from flowllm.core.op import BaseAsyncToolOp
 from flowllm.core.schema import ToolCall
 from loguru import logger
 
+from ..utils import get_token_counter, truncate_to_budget
+
 
 @C.register_op()
 class TavilySearchOp(BaseAsyncToolOp):
@@ -23,8 +25,10 @@ class TavilySearchOp(BaseAsyncToolOp):
     def __init__(
         self,
         enable_extract: bool = False,
-        item_max_char_count: int = 20000,
-        all_max_char_count: int = 50000,
+        item_max_tokens: int = 12000,
+        all_max_tokens: int = 32000,
+        item_max_char_count: int | None = None,
+        all_max_char_count: int | None = None,
         **kwargs,
     ):
         """Create a new Tavily search operation.
@@ -32,18 +36,21 @@ class TavilySearchOp(BaseAsyncToolOp):
         Args:
             enable_extract: Whether to call the Tavily extract endpoint
                 and return page content in addition to metadata.
-            item_max_char_count: Maximum characters to keep per item
-                when extraction is enabled.
-            all_max_char_count: Global character budget across all
-                extracted items.
+            item_max_tokens: Maximum tokens (of the op's LLM tokenizer) to
+                keep per item when extraction is enabled.
+            all_max_tokens: Global token budget across all extracted items.
+            item_max_char_count: Optional additional character cap per item.
+            all_max_char_count: Optional additional global character cap.
             **kwargs: Extra keyword arguments forwarded to
                 :class:`BaseAsyncToolOp`.
         """
 
         super().__init__(**kwargs)
         self.enable_extract: bool = enable_extract
-        self.item_max_char_count: int = item_max_char_count
-        self.all_max_char_count: int = all_max_char_count
+        self.item_max_tokens: int = item_max_tokens
+        self.all_max_tokens: int = all_max_tokens
+        self.item_max_char_count: int | None = item_max_char_count
+        self.all_max_char_count: int | None = all_max_char_count
 
         self._client = None
 
@@ -113,19 +120,29 @@ class TavilySearchOp(BaseAsyncToolOp):
         response_extract = await self.client.extract(urls=[item["url"] for item in response["results"]])
         logger.info(f"tavily.response_extract: {response_extract}")
 
+        token_counter = get_token_counter(self._llm)
         final_result = {}
+        all_token_count = 0
         all_char_count = 0
         for item in response_extract["results"]:
             url = item["url"]
-            raw_content: str = item["raw_content"]
-            if len(raw_content) > self.item_max_char_count:
-                raw_content = raw_content[: self.item_max_char_count]
-            if all_char_count + len(raw_content) > self.all_max_char_count:
-                raw_content = raw_content[: self.all_max_char_count - all_char_count]
+            raw_content: str = truncate_to_budget(
+                item["raw_content"],
+                self.item_max_tokens,
+                self.item_max_char_count,
+                self._llm,
+            )
+            raw_content = truncate_to_budget(
+                raw_content,
+                max(self.all_max_tokens - all_token_count, 0),
+                None if self.all_max_char_count is None else max(self.all_max_char_count - all_char_count, 0),
+                self._llm,
+            )
 
             if raw_content:
                 final_result[url] = url_info_dict[url]
                 final_result[url]["raw_content"] = raw_content
+                all_token_count += token_counter.count(raw_content)
                 all_char_count += len(raw_content)
 
         if not final_result:
@@ -1,13 +1,17 @@
 """Convenience re-exports for commonly used core utility functions and classes.
 
 This package exposes high-level helpers for shell execution, streaming tool calls,
-datetime formatting, HTTP user-agent generation, and managing the finance-mcp
-service lifecycle.
+datetime formatting, HTTP user-agent generation, static checks and pre-warmed
+workers for code execution, token budgeting of LLM-bound content, and managing
+the finance-mcp service lifecycle.
 """
 
+from .code_precheck import precheck_code
+from .code_worker_pool import CodeWorkerPool
 from .common_utils import run_shell_command, run_stream_op
 from .datetime_utils import get_datetime
 from .service_runner import FinanceMcpServiceRunner
+from .token_utils import TokenCounter, get_token_counter, llm_token_count_config, truncate_to_budget
 from .web_utils import get_random_user_agent
 
 __all__ = [
@@ -16,4 +20,10 @@ __all__ = [
     "run_shell_command",
     "run_stream_op",
     "FinanceMcpServiceRunner",
+    "CodeWorkerPool",
+    "precheck_code",
+    "TokenCounter",
+    "get_token_counter",
+    "llm_token_count_config",
+    "truncate_to_budget",
 ]
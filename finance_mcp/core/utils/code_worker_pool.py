@@ -0,0 +1,473 @@
+"""Pool of pre-warmed worker processes for sandboxed code execution.
+
+Starting a fresh interpreter and importing pandas / numpy / tushare for every
+snippet dominates the latency of short analysis scripts. ``CodeWorkerPool``
+keeps a few long-lived worker processes with those modules already imported
+and hands each execution to an idle one. Workers are recycled after
+``max_runs`` executions and killed (then replaced) when an execution exceeds
+its timeout, so the timeout semantics of a process-per-call sandbox are kept.
+
+Each execution additionally runs under soft ``rlimit`` caps on address space,
+CPU seconds and open files (POSIX only), its ``stdout`` is streamed back to
+the parent in chunks while it runs, and the captured output is truncated at
+``max_output_chars`` inside the worker so a runaway ``print`` loop cannot
+exhaust memory on either side.
+
+Isolation between executions on one warm worker: every script runs in a
+fresh namespace, and :class:`_InterpreterState` restores what scripts
+commonly change at module level after each run: ``builtins``,
+``os.environ``, the working directory, ``sys.path``, replaced or removed
+``sys.modules`` entries, and the top-level attributes of the warm modules
+(e.g. a monkeypatched ``pd.read_csv``). A worker whose state cannot be
+restored is recycled. Not restored, and bounded only by ``max_runs``:
+changes below the top level of a module (``pd.DataFrame.foo = ...``,
+``pd.set_option``, ``np.random.seed``), modules imported by a script (kept,
+as an import cache), and threads or open files a script leaves behind.
+"""
+
+import builtins
+import contextlib
+import functools
+import importlib
+import io
+import linecache
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import traceback
+from multiprocessing.connection import Connection
+from types import ModuleType
+from typing import Callable, Optional, Sequence
+
+from loguru import logger
+
+DEFAULT_WARM_MODULES = ("pandas", "numpy", "tushare")
+
+
+class _StreamWriter(io.TextIOBase):
+    """``stdout`` replacement that forwards text to the parent in chunks.
+
+    Text is batched and sent as ``("chunk", text)`` messages on newlines at
+    most every ``flush_interval`` seconds or once ``flush_size`` characters
+    are buffered. Anything beyond ``max_chars`` is counted but dropped.
+    """
+
+    def __init__(self, conn: Connection, max_chars: int, flush_interval: float = 0.1, flush_size: int = 4096):
+        super().__init__()
+        self.conn = conn
+        self.remaining = max_chars
+        self.omitted: int = 0
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self._buffer: list = []
+        self._size: int = 0
+        self._flushed_at: float = time.monotonic()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        kept = s[: max(self.remaining, 0)]
+        self.remaining -= len(kept)
+        self.omitted += len(s) - len(kept)
+        if kept:
+            self._buffer.append(kept)
+            self._size += len(kept)
+            if self._size >= self.flush_size or (
+                "\n" in kept and time.monotonic() - self._flushed_at >= self.flush_interval
+            ):
+                self.flush()
+        return len(s)
+
+    def flush(self):
+        if self._buffer:
+            self.conn.send(("chunk", "".join(self._buffer)))
+            self._buffer, self._size = [], 0
+            self._flushed_at = time.monotonic()
+
+
+@contextlib.contextmanager
+def _resource_limits(max_memory_mb: int | None, max_cpu_seconds: int | None, max_open_files: int | None):
+    """Lower the soft rlimits of the current process for one execution.
+
+    The memory and CPU caps are relative to the worker's current address
+    space and CPU time, so warm-up imports are not charged to the snippet.
+    Hard limits are left untouched so the soft limits can be restored.
+    """
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not available on Windows
+        yield
+        return
+
+    limits = []
+    if max_memory_mb:
+        with open("/proc/self/statm", encoding="utf-8") as f:
+            used = int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+        limits.append((resource.RLIMIT_AS, used + max_memory_mb * 2**20))
+    if max_cpu_seconds:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        limits.append((resource.RLIMIT_CPU, int(usage.ru_utime + usage.ru_stime) + max_cpu_seconds))
+    if max_open_files:
+        limits.append((resource.RLIMIT_NOFILE, max_open_files))
+
+    previous = []
+    try:
+        for name, value in limits:
+            soft, hard = resource.getrlimit(name)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            resource.setrlimit(name, (value, hard))
+            previous.append((name, (soft, hard)))
+        yield
+    finally:
+        for name, limit in reversed(previous):
+            resource.setrlimit(name, limit)
+
+
+def _format_error(e: BaseException, code: str) -> str:
+    """Format the traceback of ``e`` raised by ``code``, without the worker's own frame."""
+    # Make the source lines of ``<string>`` frames show up in the traceback.
+    linecache.cache["<string>"] = (len(code), None, code.splitlines(True), "<string>")
+    try:
+        tb = e.__traceback__.tb_next if e.__traceback__ is not None else None
+        return "".join(traceback.format_exception(type(e), e, tb)).rstrip()
+    finally:
+        linecache.cache.pop("<string>", None)
+
+
+class _InterpreterState:
+    """Snapshot of the module-level state a script may change, restored after it ran."""
+
+    def __init__(self, warm_modules: Sequence[str]):
+        self.builtins = dict(vars(builtins))
+        self.environ = dict(os.environ)
+        self.cwd = os.getcwd()
+        self.path = list(sys.path)
+        self.modules = dict(sys.modules)
+        self.namespaces = {
+            name: dict(vars(sys.modules[name])) for name in warm_modules if name in sys.modules
+        }
+
+    @staticmethod
+    def _restore_dict(target: dict, saved: dict):
+        for key in [key for key in target if key not in saved]:
+            del target[key]
+        for key, value in saved.items():
+            if target.get(key, saved) is not value:
+                target[key] = value
+
+    def restore(self):
+        """Undo changes to the snapshotted state; raises if some of it cannot be restored."""
+        self._restore_dict(vars(builtins), self.builtins)
+        if os.environ != self.environ:
+            os.environ.clear()
+            os.environ.update(self.environ)
+        if os.getcwd() != self.cwd:
+            os.chdir(self.cwd)
+        sys.path[:] = self.path
+
+        # Modules imported by the script stay as an import cache; anything else it put there goes.
+        for name in [name for name in sys.modules if name not in self.modules]:
+            module = sys.modules[name]
+            if not isinstance(module, ModuleType) or getattr(module, "__spec__", None) is None:
+                del sys.modules[name]
+        for name, module in self.modules.items():
+            if sys.modules.get(name) is not module:
+                sys.modules[name] = module
+
+        for name, namespace in self.namespaces.items():
+            self._restore_dict(vars(self.modules[name]), namespace)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile(code: str):
+    """Compile ``code`` once per worker; repeated sources reuse the bytecode."""
+    return compile(code, "<string>", "exec")
+
+
+def _run_code(
+    code: str,
+    global_vars: Optional[dict] = None,
+    stdout: Optional[io.TextIOBase] = None,
+) -> tuple[str, str]:
+    """Execute ``code`` in a fresh namespace with ``stdout`` redirected.
+
+    Returns:
+        ``("success", "")`` or ``("error", traceback)``. Output is delivered
+        through ``stdout`` only.
+    """
+    try:
+        namespace = {"__name__": "__main__", **(global_vars or {})}
+        with contextlib.redirect_stdout(stdout or io.StringIO()):
+            exec(_compile(code), namespace)  # noqa: S102
+        return "success", ""
+    except MemoryError:
+        return "error", "Code execution exceeded the memory limit"
+    except BaseException as e:  # noqa: BLE001
+        return "error", _format_error(e, code)
+
+
+def _worker_main(conn: Connection, warm_modules: Sequence[str], limits: tuple) -> None:
+    """Entry point of a worker process.
+
+    Imports ``warm_modules``, reports readiness, then serves
+    ``(code, global_vars, max_output_chars)`` jobs from ``conn`` until it is
+    closed. Each job streams ``("chunk", text)`` messages and ends with a
+    ``(status, message, omitted_chars, recycle)`` message; ``recycle`` asks
+    the parent to replace the worker because its state could not be restored.
+    """
+    for module_name in warm_modules:
+        try:
+            importlib.import_module(module_name)
+        except Exception:  # noqa: BLE001
+            pass
+    conn.send(("ready", None))
+
+    while True:
+        try:
+            code, global_vars, max_output_chars = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        state = _InterpreterState(warm_modules)
+        writer = _StreamWriter(conn, max_output_chars)
+        with _resource_limits(*limits):
+            status, message = _run_code(code, global_vars, writer)
+        writer.flush()
+        try:
+            state.restore()
+            recycle = False
+        except Exception:  # noqa: BLE001
+            recycle = True
+        conn.send((status, message, writer.omitted, recycle))
+
+
+class _Worker:
+    """A worker process and the parent end of its pipe."""
+
+    def __init__(self, ctx, warm_modules: Sequence[str], limits: tuple):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, tuple(warm_modules), limits), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.runs: int = 0
+        self.ready: bool = False
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Block until the worker has finished warming up."""
+        if not self.ready:
+            try:
+                self.ready = self.conn.poll(timeout) and self.conn.recv()[0] == "ready"
+            except (EOFError, OSError):
+                self.ready = False
+        return self.ready
+
+    def kill(self):
+        """Terminate the process, escalating to ``kill`` if needed."""
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join(timeout=1)
+            if self.process.is_alive():
+                self.process.kill()
+        self.process.join(timeout=1)
+
+
+class CodeWorkerPool:
+    """Fixed-size pool of warm worker processes executing Python snippets.
+
+    Example:
+        ```python
+        pool = CodeWorkerPool(size=2)
+        print(pool.run("import pandas as pd; print(pd.__version__)"))
+        pool.close()
+        ```
+    """
+
+    def __init__(
+        self,
+        size: int = 4,
+        max_runs: int = 50,
+        warm_modules: Sequence[str] = DEFAULT_WARM_MODULES,
+        startup_timeout: float = 60,
+        start_method: str | None = None,
+        max_memory_mb: int | None = 2048,
+        max_cpu_seconds: int | None = 60,
+        max_open_files: int | None = 256,
+        max_output_chars: int = 20000,
+    ):
+        """Initialize the pool. Workers are started lazily on first use.
+
+        Args:
+            size: Number of worker processes.
+            max_runs: Executions served by one worker before it is replaced,
+                bounding state leaked past the per-run restore (see the
+                module docstring).
+            warm_modules: Modules imported by each worker before serving jobs.
+            startup_timeout: Seconds to wait for a new worker to warm up.
+            start_method: ``multiprocessing`` start method. ``None`` uses the
+                platform default.
+            max_memory_mb: Extra address space one execution may allocate.
+            max_cpu_seconds: CPU seconds one execution may consume.
+            max_open_files: Cap on open file descriptors during an execution.
+            max_output_chars: Default cap on captured output per execution.
+        """
+        self.size = size
+        self.max_runs = max_runs
+        self.warm_modules = tuple(warm_modules)
+        self.startup_timeout = startup_timeout
+        self.limits = (max_memory_mb, max_cpu_seconds, max_open_files)
+        self.max_output_chars = max_output_chars
+
+        self._ctx = multiprocessing.get_context(start_method)
+        self._idle: queue.Queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._started: bool = False
+        self._closed: bool = False
+
+    def start(self) -> "CodeWorkerPool":
+        """Spawn all workers so they warm up in the background."""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("CodeWorkerPool is closed")
+            if not self._started:
+                self._started = True
+                for _ in range(self.size):
+                    self._idle.put(_Worker(self._ctx, self.warm_modules, self.limits))
+        return self
+
+    def _acquire(self) -> _Worker:
+        """Take an idle, warmed-up worker, replacing dead ones."""
+        self.start()
+        while True:
+            worker = self._idle.get()
+            if worker.process.is_alive() and worker.wait_ready(self.startup_timeout):
+                return worker
+            logger.warning(f"code worker pid={worker.process.pid} unavailable, replacing it")
+            self._replace(worker)
+
+    def _release(self, worker: _Worker):
+        """Return ``worker`` to the pool, recycling it after ``max_runs``."""
+        if self._closed:
+            worker.kill()
+        elif worker.runs >= self.max_runs:
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+
+    def _replace(self, worker: _Worker):
+        worker.kill()
+        if not self._closed:
+            self._idle.put(_Worker(self._ctx, self.warm_modules, self.limits))
+
+    def run(
+        self,
+        code: str,
+        timeout: Optional[float] = 30,
+        global_vars: Optional[dict] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        max_output_chars: Optional[int] = None,
+    ) -> str:
+        """Same as :meth:`execute` but only return the output text."""
+        return self.execute(code, timeout, global_vars, on_chunk, max_output_chars)[1]
+
+    def execute(
+        self,
+        code: str,
+        timeout: Optional[float] = 30,
+        global_vars: Optional[dict] = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        max_output_chars: Optional[int] = None,
+    ) -> tuple[bool, str]:
+        """Execute ``code`` on a warm worker and return its captured output.
+
+        Args:
+            code: Python source code to execute.
+            timeout: Maximum execution time in seconds, not counting the wait
+                for an idle worker. ``None`` waits indefinitely.
+            global_vars: Picklable names injected into the code's namespace.
+            on_chunk: Called from the calling thread with each chunk of
+                output as it is produced.
+            max_output_chars: Override of the pool's output cap.
+
+        Returns:
+            ``(success, text)`` where ``text`` is the captured ``stdout``
+            (truncated to the output cap), followed on failure by the
+            traceback or a timeout / limit message.
+        """
+        max_output_chars = self.max_output_chars if max_output_chars is None else max_output_chars
+        worker = self._acquire()
+        try:
+            worker.conn.send((code, global_vars, max_output_chars))
+        except BaseException:
+            self._release(worker)
+            raise
+
+        chunks = []
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            if not worker.conn.poll(remaining):
+                self._replace(worker)
+                return False, self._join_output(chunks, f"Code execution timed out after {timeout} seconds")
+
+            try:
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                # The worker died mid-execution: CPU limit, ``os._exit`` or a crash.
+                self._replace(worker)
+                if worker.process.exitcode == -signal.SIGXCPU:
+                    return False, self._join_output(chunks, "Code execution exceeded the CPU time limit")
+                return False, self._join_output(chunks, "No output")
+
+            if message[0] != "chunk":
+                break
+            chunks.append(message[1])
+            if on_chunk is not None:
+                on_chunk(message[1])
+
+        status, error, omitted, recycle = message
+        worker.runs += 1
+        if recycle:
+            logger.warning(f"code worker pid={worker.process.pid} state could not be restored, replacing it")
+            self._replace(worker)
+        else:
+            self._release(worker)
+        if omitted:
+            chunks.append(f"\n... [output truncated, {omitted} more characters]")
+        if status == "error":
+            return False, self._join_output(chunks, error)
+        return True, "".join(chunks)
+
+    @staticmethod
+    def _join_output(chunks: list, message: str) -> str:
+        """Append a failure ``message`` to any output produced so far."""
+        return "".join(chunks).rstrip("\n") + "\n" + message if chunks else message
+
+    def close(self):
+        """Stop all idle workers. Busy workers are stopped when released."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                break
+
+
+_default_pool: CodeWorkerPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def get_code_worker_pool() -> CodeWorkerPool:
+    """Get or create the process-wide default ``CodeWorkerPool``."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = CodeWorkerPool()
+        return _default_pool
@@ -6,16 +6,22 @@ This module currently provides:
   that returns decoded stdout/stderr.
 * ``run_stream_op``: helper to execute a ``BaseAsyncToolOp`` and yield streaming
   chunks while printing them to stdout.
-* ``exec_code``: very small sandbox that executes arbitrary Python code and
-  captures printed output for debugging or experimentation.
+* ``close_on_loop``: close a resource bound to another (e.g. finished)
+  event loop on that loop.
+* ``exec_code``: very small sandbox that executes arbitrary Python code on a
+  pool of pre-warmed, resource-limited worker processes and captures (or
+  streams) printed output.
 """
 
 import asyncio
-import contextlib
-from io import StringIO
-from typing import Optional, Tuple
+import threading
+from typing import Awaitable, Callable, Iterable, Optional, Tuple
 
 from flowllm.core.op import BaseAsyncToolOp
+from loguru import logger
+
+from .code_precheck import precheck_code
+from .code_worker_pool import get_code_worker_pool
 
 
 async def run_shell_command(cmd: str, timeout: Optional[float] = 30) -> Tuple[str, str, int]:
@@ -99,70 +105,105 @@ async def run_stream_op(op: BaseAsyncToolOp, enable_print: bool = True, **kwargs
         await task
 
 
-import multiprocessing
-def _exec_code_in_process(queue: multiprocessing.Queue, code: str) -> None:
-    """Helper function to execute code in a subprocess.
+def close_on_loop(close: Callable[[], Awaitable[None]], loop: asyncio.AbstractEventLoop, name: str) -> bool:
+    """Run ``close()`` on ``loop``, which owns the resource, without waiting for it.
 
-    This function runs in a separate process and communicates results
-    back via a multiprocessing Queue.
+    Browsers and connection pools can only be closed on the loop they were
+    created on. A loop running in another thread gets the coroutine
+    scheduled; a stopped loop is run once more in a helper thread.
 
     Args:
-        queue: Queue to put the execution result into.
-        code: Python source code to execute.
-    """
-    try:
-        redirected_output = StringIO()
-        with contextlib.redirect_stdout(redirected_output):
-            exec(code)  # noqa: S102
-        queue.put(("success", redirected_output.getvalue()))
-    except BaseException as e:  # noqa: BLE001
-        queue.put(("error", str(e)))
+        close: Coroutine function that closes the resource.
+        loop: Event loop the resource is bound to. Must not be the current one.
+        name: Resource name, for logs.
 
-
-async def exec_code(code: str, timeout: Optional[float] = 30) -> str:
+    Returns:
+        ``False`` if ``loop`` is already closed and the resource was left to
+        garbage collection.
+    """
+    if loop.is_closed():
+        logger.warning(f"{name} outlived its event loop and cannot be closed; close it before the loop ends")
+        return False
+    if loop.is_running():
+        asyncio.run_coroutine_threadsafe(close(), loop)
+    else:
+        threading.Thread(target=loop.run_until_complete, args=(close(),), name=f"close-{name}").start()
+    return True
+
+
+async def exec_code(
+    code: str,
+    timeout: Optional[float] = 30,
+    global_vars: Optional[dict] = None,
+    stream_fn: Optional[Callable[[str], Awaitable[None]]] = None,
+    max_output_chars: Optional[int] = None,
+    return_status: bool = False,
+    allowed_imports: Optional[Iterable[str]] = None,
+    strict: bool = False,
+) -> str | Tuple[bool, str]:
     """Execute arbitrary Python code and capture its printed output.
 
-    The code is executed in a separate process and any text written to
-    ``stdout`` is captured and returned as a string. If an exception occurs,
-    its string representation is returned instead. If execution exceeds the
-    timeout, the process is terminated and an error message is returned.
+    The code is first validated statically by
+    :func:`~finance_mcp.core.utils.code_precheck.precheck_code`; rejected
+    code returns the reason without reaching a worker. Valid code is
+    executed in a pre-warmed worker process of the shared
+    :class:`~finance_mcp.core.utils.code_worker_pool.CodeWorkerPool` (with
+    pandas, numpy and tushare already imported) under soft memory, CPU and
+    open-file limits, and any text written to ``stdout`` is captured and
+    returned as a string. If an exception occurs, the output printed so far
+    is returned followed by the traceback. If execution exceeds the timeout,
+    the worker is killed and replaced and an error message is returned.
 
     Args:
         code: Python source code to execute.
         timeout: Maximum time in seconds to wait for code execution. ``None``
             disables the timeout and waits indefinitely. Defaults to 30 seconds.
+        global_vars: Extra names (for example prefetched DataFrames) injected
+            into the global namespace of the executed code. Values must be
+            picklable.
+        stream_fn: Optional coroutine function awaited with each chunk of
+            output while the code is still running.
+        max_output_chars: Cap on the captured output; longer output is
+            truncated. ``None`` uses the pool default.
+        return_status: Return ``(success, text)`` so callers can tell
+            output from error messages.
+        allowed_imports: Top-level modules the code may import, e.g.
+            ``DEFAULT_ALLOWED_IMPORTS``. ``None`` (the default) allows any
+            import.
+        strict: Also reject banned builtin calls (``eval``, ``exit``, ...),
+            dunder attribute escapes and ``while True`` loops without an
+            exit before execution. Off by default.
 
     Returns:
-        Captured ``stdout`` output, the exception message if execution fails,
-        or a timeout error message if execution exceeds the timeout.
+        Captured ``stdout`` output, followed by the traceback if execution
+        fails or by a timeout error message if execution exceeds the
+        timeout. Wrapped in a ``(success, text)`` tuple when
+        ``return_status`` is set.
     """
-
-    def _run_in_process() -> str:
-        """Run code execution in a subprocess with timeout handling."""
-        queue: multiprocessing.Queue = multiprocessing.Queue()
-        process = multiprocessing.Process(
-            target=_exec_code_in_process,
-            args=(queue, code),
-        )
-        process.start()
-        process.join(timeout=timeout)
-
-        if process.is_alive():
-            # Process is still running, terminate it
-            process.terminate()
-            process.join(timeout=1)
-            if process.is_alive():
-                # Force kill if terminate didn't work
-                process.kill()
-                process.join(timeout=1)
-            return f"Code execution timed out after {timeout} seconds"
-
-        # Process finished, get the result
-        if not queue.empty():
-            status, result = queue.get_nowait()
-            return result
-
-        return "No output"
-
-    # Run the blocking process operation in a thread to avoid blocking the event loop
-    return await asyncio.to_thread(_run_in_process)
\ No newline at end of file
+    error = precheck_code(code, allowed_imports, strict)
+    if error:
+        result = (False, f"Code rejected before execution: {error}")
+        return result if return_status else result[1]
+
+    pool = get_code_worker_pool()
+    if stream_fn is None:
+        # Run the blocking worker round-trip in a thread to avoid blocking the event loop
+        result = await asyncio.to_thread(pool.execute, code, timeout, global_vars, None, max_output_chars)
+        return result if return_status else result[1]
+
+    # Chunks are handed from the worker thread to the loop in order; the
+    # sentinel is queued only after the thread has delivered its last chunk.
+    loop = asyncio.get_running_loop()
+    chunk_queue: asyncio.Queue = asyncio.Queue()
+
+    def on_chunk(chunk: str):
+        loop.call_soon_threadsafe(chunk_queue.put_nowait, chunk)
+
+    task = asyncio.ensure_future(
+        asyncio.to_thread(pool.execute, code, timeout, global_vars, on_chunk, max_output_chars),
+    )
+    task.add_done_callback(lambda _: chunk_queue.put_nowait(None))
+    while (chunk := await chunk_queue.get()) is not None:
+        await stream_fn(chunk)
+    result = await task
+    return result if return_status else result[1]
@@ -0,0 +1,193 @@
+"""Token counting and token-budget truncation for LLM-bound content.
+
+Character limits misjudge what content costs a model: with the Qwen
+tokenizer a Chinese character is about 0.65 tokens, while English prose is
+about 0.3-0.4 tokens per character. Ops therefore budget the content they
+pass on in tokens of the model that reads it.
+
+:func:`get_token_counter` returns a cached counter for an op's ``llm``
+setting, following the ``token_count`` section of that LLM's flowllm
+config, the same backend ``BaseOp.token_count`` uses:
+
+* ``openai`` uses the ``tiktoken`` encoding of the configured model.
+* ``hf`` uses the ``transformers`` tokenizer of the configured model.
+* Other registered backends are wrapped as they are; truncation then
+  searches for the longest prefix within the budget.
+* ``base``, flowllm's default, only estimates characters / 4. It is
+  treated as "not configured": OpenAI model names use ``tiktoken``, and
+  everything else, including the Qwen models finance-mcp is configured
+  with, uses the Qwen vocabulary bundled with ``dashscope``.
+
+The bundled Qwen vocabulary is also the intended fallback when the service
+config is not loaded or the configured tokenizer cannot be loaded (e.g. a
+``tiktoken`` or Hugging Face download while offline); for other model
+families it is a close approximation.
+"""
+
+import json
+import os
+from functools import lru_cache
+from typing import Callable, List
+
+from flowllm.core.context import C
+from flowllm.core.enumeration import Role
+from flowllm.core.schema import Message
+from loguru import logger
+
+# Model name prefixes served by tiktoken encodings.
+OPENAI_MODEL_PREFIXES = ("gpt-", "o1", "o3", "o4", "text-embedding-3", "text-embedding-ada")
+
+
+class TokenCounter:
+    """Count and truncate text in the tokens of one tokenizer."""
+
+    def __init__(self, name: str, encode: Callable[[str], List[int]], decode: Callable[[List[int]], str]):
+        """Initialize the counter.
+
+        Args:
+            name: Tokenizer name, for logs.
+            encode: Text to token ids.
+            decode: Token ids to text.
+        """
+        self.name = name
+        self.encode = encode
+        self.decode = decode
+
+    def count(self, text: str) -> int:
+        """Number of tokens in ``text``."""
+        return len(self.encode(text)) if text else 0
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """The longest prefix of ``text`` within ``max_tokens`` tokens."""
+        if not text:
+            return text
+        ids = self.encode(text)
+        if len(ids) <= max_tokens:
+            return text
+        # A cut inside a multi-byte character decodes to a replacement character.
+        return self.decode(ids[: max(max_tokens, 0)]).rstrip("�")
+
+
+class FlowllmTokenCounter(TokenCounter):
+    """Adapter for flowllm token counters, which only count messages."""
+
+    def __init__(self, name: str, counter):
+        """Initialize the adapter.
+
+        Args:
+            name: Backend name, for logs.
+            counter: A flowllm ``BaseToken`` instance.
+        """
+        super().__init__(name, encode=None, decode=None)
+        self.counter = counter
+
+    def count(self, text: str) -> int:
+        """Number of tokens of ``text`` sent as one user message."""
+        return self.counter.token_count([Message(role=Role.USER, content=text)]) if text else 0
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """The longest prefix of ``text`` within ``max_tokens`` tokens, by binary search."""
+        if not text or self.count(text) <= max_tokens:
+            return text
+        low, high = 0, len(text)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.count(text[:middle]) <= max_tokens:
+                low = middle
+            else:
+                high = middle - 1
+        return text[:low]
+
+
+def _tiktoken_counter(model_name: str) -> TokenCounter:
+    """Counter with the ``tiktoken`` encoding of ``model_name``, as flowllm's ``openai`` backend."""
+    import tiktoken
+
+    try:
+        encoding = tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        encoding = tiktoken.get_encoding("o200k_base")
+    return TokenCounter(encoding.name, lambda text: encoding.encode(text, disallowed_special=()), encoding.decode)
+
+
+def _hf_counter(model_name: str, params: dict) -> TokenCounter:
+    """Counter with the Hugging Face tokenizer of ``model_name``, as flowllm's ``hf`` backend."""
+    params = dict(params)
+    if params.pop("use_mirror", True):
+        os.environ.setdefault("HF_ENDPOINT", "https://hf-mirror.com")
+
+    from transformers import AutoTokenizer
+
+    params.setdefault("use_fast", False)
+    tokenizer = AutoTokenizer.from_pretrained(model_name, **params)
+    return TokenCounter(
+        model_name,
+        lambda text: tokenizer.encode(text, add_special_tokens=False),
+        lambda ids: tokenizer.decode(ids, skip_special_tokens=True),
+    )
+
+
+def _qwen_counter() -> TokenCounter:
+    """Counter with the Qwen vocabulary bundled with ``dashscope``; works offline."""
+    from dashscope import get_tokenizer
+
+    tokenizer = get_tokenizer("qwen-turbo")
+    return TokenCounter("qwen", tokenizer.encode, tokenizer.decode)
+
+
+@lru_cache(maxsize=16)
+def _build_token_counter(backend: str, model_name: str, params_json: str) -> TokenCounter:
+    """Build the counter of a ``token_count`` config; cached per config."""
+    params = json.loads(params_json)
+    if backend == "base" and model_name.lower().startswith(OPENAI_MODEL_PREFIXES):
+        backend = "openai"
+    try:
+        if backend == "openai":
+            return _tiktoken_counter(model_name)
+        if backend == "hf":
+            return _hf_counter(model_name, params)
+        if backend != "base":
+            return FlowllmTokenCounter(backend, C.get_token_counter_class(backend)(model_name=model_name, **params))
+    except Exception as e:  # noqa: BLE001
+        logger.warning(f"{backend} token counter for {model_name} unavailable, using the Qwen tokenizer: {e}")
+    return _qwen_counter()
+
+
+def llm_token_count_config(llm="default") -> tuple[str, str, dict]:
+    """``(backend, model_name, params)`` of the token counter of an op's ``llm`` setting.
+
+    ``llm`` is a config name or an LLM instance. An instance, or a name
+    whose config is not loaded, yields the ``base`` backend with whatever
+    model name is known, which selects the fallback tokenizers.
+    """
+    if not isinstance(llm, str):
+        return "base", getattr(llm, "model_name", "") or "", {}
+    try:
+        llm_config = C.service_config.llm[llm]
+    except (AttributeError, KeyError, TypeError):
+        return "base", "", {}
+    token_count = llm_config.token_count
+    return token_count.backend, token_count.model_name or llm_config.model_name, token_count.params
+
+
+def get_token_counter(llm="default") -> TokenCounter:
+    """Get the cached :class:`TokenCounter` of an op's ``llm`` setting."""
+    backend, model_name, params = llm_token_count_config(llm)
+    return _build_token_counter(backend, model_name, json.dumps(params, sort_keys=True, default=str))
+
+
+def truncate_to_budget(
+    text: str,
+    max_tokens: int | None = None,
+    max_chars: int | None = None,
+    llm="default",
+) -> str:
+    """Cut ``text`` to ``max_chars`` characters, then to ``max_tokens`` tokens of ``llm``.
+
+    Either limit may be ``None`` to disable it.
+    """
+    if max_chars is not None:
+        text = text[:max_chars]
+    if max_tokens is not None:
+        text = get_token_counter(llm).truncate(text, max_tokens)
+    return text
@@ -4,13 +4,24 @@ This module exposes a thin wrapper around :class:`flowllm.core.application.Appli
 that wires it to the finance-mcp configuration system. The :class:`FinanceMcpApp`
 class is intended to be used as a context manager from the command line, where the
 CLI arguments are forwarded directly to the underlying FlowLLM application.
+
+Before serving, the application runs a preflight that verifies the Playwright
+browsers needed by crawl flows and, optionally, launches the shared browser
+pool on the service event loop so the first crawl does not pay for either.
+Both run through the service hooks of :mod:`finance_mcp.service`.
 """
 
 import sys
+from typing import Dict
 
 from flowllm.core.application import Application
+from loguru import logger
 
 from .config import ConfigParser
+from .core.crawl.browser_pool import close_browser_pool, get_browser_pool
+from .core.crawl.http_fetcher import close_http_fetcher
+from .core.crawl.playwright_preflight import ensure_playwright_browsers
+from .service import SERVICE_HOOKS
 
 
 class FinanceMcpApp(Application):
@@ -18,7 +29,8 @@ class FinanceMcpApp(Application):
 
     This subclass simply pre-configures the base :class:`Application` with the
     finance-mcp specific configuration parser and sensible defaults. All heavy
-    lifting (service lifecycle, routing, etc.) is delegated to the parent class.
+    lifting (service lifecycle, routing, etc.) is delegated to the parent class,
+    apart from the crawler preflight whose results are kept in ``readiness``.
     """
 
     def __init__(
@@ -29,6 +41,9 @@ class FinanceMcpApp(Application):
         embedding_api_key: str = None,
         embedding_api_base: str = None,
         config_path: str = None,
+        check_browsers: bool = True,
+        install_browsers: bool = True,
+        prewarm_browsers: bool = False,
         **kwargs,
     ):
         """Initialize the Finance MCP application.
@@ -74,6 +89,47 @@ class FinanceMcpApp(Application):
             **kwargs,
         )
 
+        self.check_browsers: bool = check_browsers
+        self.install_browsers: bool = install_browsers
+        self.prewarm_browsers: bool = bool(self.service_config.metadata.get("prewarm_browsers", prewarm_browsers))
+        # Component name -> whether it is ready, shared with the ``/ready`` endpoint.
+        self.readiness: Dict[str, bool] = SERVICE_HOOKS.readiness
+
+    @property
+    def ready(self) -> bool:
+        """Whether every checked component passed its preflight."""
+        return SERVICE_HOOKS.ready
+
+    def uses_crawler(self) -> bool:
+        """Whether any enabled flow runs a crawl4ai operation."""
+        return any(
+            "Crawl4ai" in (flow_config.flow_content or "")
+            for name, flow_config in self.service_config.flow.items()
+            if self.filter_flows(name)
+        )
+
+    async def async_start(self):
+        """Start the application, verify crawler browsers once and register the service hooks."""
+        await super().async_start()
+        if self.check_browsers and self.uses_crawler():
+            self.readiness["browsers"] = await ensure_playwright_browsers(install=self.install_browsers)
+        if self.prewarm_browsers and self.uses_crawler():
+            self.readiness["browser_pool"] = False
+        SERVICE_HOOKS.add_startup(self.async_prewarm)
+        SERVICE_HOOKS.add_shutdown(close_browser_pool)
+        SERVICE_HOOKS.add_shutdown(close_http_fetcher)
+
+    async def async_prewarm(self):
+        """Launch the shared browser pool on the running (service) event loop."""
+        if "browser_pool" not in self.readiness or not self.readiness.get("browsers", True):
+            return
+        try:
+            await get_browser_pool().start()
+            self.readiness["browser_pool"] = True
+            logger.info("browser pool prewarmed")
+        except Exception as e:  # noqa: BLE001
+            logger.exception(f"browser pool prewarm failed: {e}")
+
 
 def main() -> None:
     """Run the Finance MCP service as a command-line application.
@@ -0,0 +1,99 @@
+"""FlowLLM services of the Finance MCP application.
+
+FlowLLM builds the service of the configured ``backend`` from its service
+registry. The subclasses below are registered under the stock names
+(``mcp`` and ``http``), so they replace FlowLLM's services once
+:mod:`finance_mcp` is imported. Both run :data:`SERVICE_HOOKS` on the
+service's own event loop through public lifespan APIs: startup callbacks
+before requests are served and shutdown callbacks when the service stops.
+The HTTP service additionally exposes ``GET /ready``.
+"""
+
+import contextlib
+import os
+from typing import Awaitable, Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastmcp import FastMCP
+from flowllm.core.context import C
+from flowllm.core.service import HttpService, MCPService
+from loguru import logger
+
+
+class ServiceHooks:
+    """Startup and shutdown callbacks plus the readiness of checked components."""
+
+    def __init__(self):
+        self.startup: List[Callable[[], Awaitable[None]]] = []
+        self.shutdown: List[Callable[[], Awaitable[None]]] = []
+        # Component name -> whether it is ready; only checked components are listed.
+        self.readiness: Dict[str, bool] = {}
+
+    @property
+    def ready(self) -> bool:
+        """Whether every checked component passed its preflight."""
+        return all(self.readiness.values())
+
+    def add_startup(self, callback: Callable[[], Awaitable[None]]):
+        """Register a startup callback once."""
+        if callback not in self.startup:
+            self.startup.append(callback)
+
+    def add_shutdown(self, callback: Callable[[], Awaitable[None]]):
+        """Register a shutdown callback once."""
+        if callback not in self.shutdown:
+            self.shutdown.append(callback)
+
+    async def run_startup(self):
+        """Await the startup callbacks in registration order."""
+        for callback in self.startup:
+            await callback()
+
+    async def run_shutdown(self):
+        """Await every shutdown callback, logging failures instead of raising."""
+        for callback in self.shutdown:
+            try:
+                await callback()
+            except Exception as e:  # noqa: BLE001
+                logger.exception(f"service shutdown hook failed: {e}")
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, _server=None):
+        """FastMCP lifespan running the startup and shutdown callbacks."""
+        await self.run_startup()
+        try:
+            yield {}
+        finally:
+            await self.run_shutdown()
+
+
+SERVICE_HOOKS = ServiceHooks()
+
+
+@C.register_service("mcp")
+class FinanceMcpService(MCPService):
+    """``MCPService`` whose FastMCP server runs ``SERVICE_HOOKS`` in its lifespan."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        # Tools are only added in ``run``, so the server can still be rebuilt with a lifespan.
+        self.mcp = FastMCP(name=os.getenv("FLOW_APP_NAME"), lifespan=SERVICE_HOOKS.lifespan)
+
+
+@C.register_service("http")
+class FinanceHttpService(HttpService):
+    """``HttpService`` running ``SERVICE_HOOKS`` on FastAPI startup and shutdown."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.app.get("/ready")(self.readiness_check)
+        self.app.router.add_event_handler("startup", SERVICE_HOOKS.run_startup)
+        self.app.router.add_event_handler("shutdown", SERVICE_HOOKS.run_shutdown)
+
+    @staticmethod
+    def readiness_check() -> JSONResponse:
+        """Answer 200 once every checked component is ready, 503 until then."""
+        return JSONResponse(
+            {"ready": SERVICE_HOOKS.ready, "components": SERVICE_HOOKS.readiness},
+            status_code=200 if SERVICE_HOOKS.ready else 503,
+        )
@@ -0,0 +1,102 @@
+"""Benchmark of the ``ta`` analytics kernels against naive pandas code.
+
+The naive versions mirror what generated analysis code typically looks like
+(row loops over ``iloc`` and per-window ``rolling`` slices). Each pair is
+checked for equal results on a synthetic 5000-day price series and timed.
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from finance_mcp.core.findata.analytics import ANALYTICS as ta
+
+DAYS = 5000
+rng = np.random.default_rng(0)
+CLOSE = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, DAYS))))
+INDEX_CLOSE = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, DAYS))))
+
+
+def naive_sma(close: pd.Series, window: int) -> pd.Series:
+    """Moving average with a row loop."""
+    values = [np.nan] * len(close)
+    for i in range(window - 1, len(close)):
+        values[i] = close.iloc[i - window + 1 : i + 1].mean()
+    return pd.Series(values)
+
+
+def naive_max_drawdown(close: pd.Series) -> float:
+    """Running peak and drawdown with a row loop."""
+    peak, worst = close.iloc[0], 0.0
+    for i in range(len(close)):
+        peak = max(peak, close.iloc[i])
+        worst = min(worst, close.iloc[i] / peak - 1)
+    return worst
+
+
+def naive_rsi(close: pd.Series, window: int = 14) -> pd.Series:
+    """Wilder RSI with a row loop."""
+    values = [np.nan] * len(close)
+    avg_gain = avg_loss = 0.0
+    for i in range(1, len(close)):
+        change = close.iloc[i] - close.iloc[i - 1]
+        gain, loss = max(change, 0), max(-change, 0)
+        if i < window:
+            avg_gain += gain / window
+            avg_loss += loss / window
+            continue
+        if i == window:
+            avg_gain += gain / window
+            avg_loss += loss / window
+        else:
+            avg_gain = (avg_gain * (window - 1) + gain) / window
+            avg_loss = (avg_loss * (window - 1) + loss) / window
+        values[i] = 100 - 100 / (1 + avg_gain / avg_loss) if avg_loss else 100.0
+    return pd.Series(values)
+
+
+def naive_rolling_beta(close: pd.Series, index_close: pd.Series, window: int) -> pd.Series:
+    """Rolling beta recomputed from scratch per window."""
+    r, m = close.pct_change(), index_close.pct_change()
+    values = [np.nan] * len(close)
+    for i in range(window, len(close)):
+        rw, mw = r.iloc[i - window + 1 : i + 1], m.iloc[i - window + 1 : i + 1]
+        values[i] = rw.cov(mw) / mw.var()
+    return pd.Series(values)
+
+
+def bench(name: str, naive, fast, check) -> None:
+    """Time both implementations and verify they agree."""
+    t1 = time.perf_counter()
+    expected = naive()
+    naive_time = time.perf_counter() - t1
+
+    t1 = time.perf_counter()
+    actual = fast()
+    fast_time = time.perf_counter() - t1
+
+    assert check(expected, actual), name
+    print(f"{name:<12} naive={naive_time * 1000:9.1f}ms  ta={fast_time * 1000:7.2f}ms  x{naive_time / fast_time:,.0f}")
+
+
+def main() -> None:
+    """Run all benchmarks."""
+
+    def same(a, b):
+        return np.allclose(np.asarray(a, dtype=float), np.asarray(b, dtype=float), equal_nan=True)
+
+    bench("sma(30)", lambda: naive_sma(CLOSE, 30), lambda: ta.sma(CLOSE, 30), same)
+    bench("max_drawdown", lambda: naive_max_drawdown(CLOSE), lambda: ta.max_drawdown(CLOSE), same)
+    # The naive RSI seeds with a simple mean, so compare after the seed has decayed.
+    bench("rsi(14)", lambda: naive_rsi(CLOSE), lambda: ta.rsi(CLOSE), lambda a, b: same(a[500:], b[500:]))
+    bench(
+        "beta(60)",
+        lambda: naive_rolling_beta(CLOSE, INDEX_CLOSE, 60),
+        lambda: ta.beta(CLOSE, INDEX_CLOSE, 60),
+        same,
+    )
+
+
+if __name__ == "__main__":
+    main()
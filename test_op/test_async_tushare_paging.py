@@ -0,0 +1,54 @@
+"""Pagination of ``AsyncTushareClient`` against a server that caps page sizes.
+
+A mocked ``httpx`` transport serves a fixed table and returns at most
+``SERVER_PAGE_CAP`` rows per request, fewer than the client's
+``request_limit_size``, as Tushare does for some endpoints.
+"""
+
+import asyncio
+import json
+import os
+
+import httpx
+
+os.environ.setdefault("TUSHARE_API_TOKEN", "local-test")
+
+from finance_mcp.core.findata import AsyncTushareClient  # noqa: E402
+
+FIELDS = ["ts_code", "trade_date", "close"]
+ROWS = [["000001.SZ", f"2024{i // 28 + 1:02d}{i % 28 + 1:02d}", float(i)] for i in range(53)]
+SERVER_PAGE_CAP = 7
+
+
+def capped_handler(request: httpx.Request) -> httpx.Response:
+    """Serve ``ROWS`` from the requested offset, at most ``SERVER_PAGE_CAP`` at a time."""
+    params = json.loads(request.content)["params"]
+    offset, limit = params["offset"], min(params["limit"], SERVER_PAGE_CAP)
+    items = ROWS[offset : offset + limit]
+    data = {"fields": FIELDS, "items": items, "has_more": offset + len(items) < len(ROWS)}
+    return httpx.Response(200, json={"code": 0, "msg": "", "data": data})
+
+
+async def fetch_all() -> list:
+    client = AsyncTushareClient(request_limit_size=20, page_concurrency=3, enable_single_flight=False)
+    await client.client.aclose()
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(capped_handler))
+    async with client:
+        df = await client.arequest("daily")
+    return df["close"].tolist()
+
+
+def test_capped_pages_return_every_row():
+    """All rows arrive, once each and in order, when pages are capped below the limit."""
+    closes = asyncio.run(fetch_all())
+    assert closes == [row[2] for row in ROWS], closes
+
+
+def main():
+    """Run the checks without pytest."""
+    test_capped_pages_return_every_row()
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Manual check of the batch crawler on THS pages of a few stocks.
+
+`Crawl4aiBatchOp` is run inside a `FinanceMcpApp` context with a stream
+queue, so every page is printed as soon as it is crawled, followed by the
+per-domain intervals the scheduler settled on.
+"""
+
+import asyncio
+import json
+import time
+
+from finance_mcp import FinanceMcpApp
+from finance_mcp.core.crawl import Crawl4aiBatchOp
+
+
+async def main() -> None:
+    """Crawl several THS pages of several stocks and print them as they arrive."""
+    t1 = time.time()
+    async with FinanceMcpApp():
+        op = Crawl4aiBatchOp(enable_cache=False, domain_concurrency=3, min_interval=1.0)
+        stream_queue = asyncio.Queue()
+        task = asyncio.create_task(
+            op.async_call(codes="601899,600519,000001", tags="company,holder,equity", stream_queue=stream_queue),
+        )
+
+        while not task.done() or not stream_queue.empty():
+            try:
+                chunk = await asyncio.wait_for(stream_queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                continue
+            item = json.loads(chunk.chunk)
+            print(f"{time.time() - t1:6.1f}s {item['success']} {item['url']} {len(item.get('content', ''))} chars")
+        await task
+
+        print({domain: round(state.interval, 2) for domain, state in op.scheduler.domains.items()})
+
+    print(f"Total time: {time.time() - t1:.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
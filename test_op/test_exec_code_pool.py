@@ -0,0 +1,101 @@
+"""Benchmark of ``exec_code`` on warm workers versus a process per call.
+
+A short pandas snippet, typical of generated analysis code, is executed
+repeatedly. The legacy path starts a new ``multiprocessing.Process`` and
+imports pandas for every call; the current path reuses a warm
+``CodeWorkerPool`` worker. A timeout run checks that a hung snippet is
+still killed and its worker replaced.
+
+``test_worker_isolation`` checks that module-level changes of one script
+do not leak into the next one on the same warm worker.
+"""
+
+import asyncio
+import io
+import multiprocessing
+import time
+
+from finance_mcp.core.utils.code_worker_pool import CodeWorkerPool, _run_code, get_code_worker_pool
+from finance_mcp.core.utils.common_utils import exec_code
+
+RUNS = 20
+CODE = """
+import pandas as pd
+df = pd.DataFrame({"close": range(100)})
+print(df["close"].rolling(5).mean().iloc[-1])
+"""
+
+
+def _legacy_target(queue: multiprocessing.Queue, code: str):
+    output = io.StringIO()
+    _run_code(code, stdout=output)
+    queue.put(output.getvalue())
+
+
+def exec_code_legacy(code: str) -> str:
+    """Process-per-call execution as used before the worker pool."""
+    queue: multiprocessing.Queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_legacy_target, args=(queue, code))
+    process.start()
+    process.join(timeout=30)
+    return queue.get_nowait()
+
+
+LEAKY_CODE = """
+import builtins, os, sys
+import pandas as pd
+print("before failure")
+pd.read_csv = None
+builtins.eval = None
+os.environ["LEAKED_BY_SCRIPT"] = "1"
+sys.modules["json"] = None
+raise ValueError("boom")
+"""
+
+CHECK_CODE = """
+import os, sys
+import pandas as pd
+print(callable(pd.read_csv), eval("1 + 1"), "LEAKED_BY_SCRIPT" in os.environ, sys.modules["json"] is not None)
+"""
+
+
+def test_worker_isolation():
+    """A failing script returns its output and traceback and leaves no module-level changes behind."""
+    pool = CodeWorkerPool(size=1)
+    try:
+        success, text = pool.execute(LEAKY_CODE)
+        assert not success
+        assert text.startswith("before failure\n")
+        assert "Traceback" in text and 'line 9' in text and text.endswith("ValueError: boom")
+
+        assert pool.execute(CHECK_CODE) == (True, "True 2 False True\n")
+    finally:
+        pool.close()
+
+
+async def main():
+    """Compare per-call latency of both paths."""
+    t1 = time.perf_counter()
+    for _ in range(RUNS):
+        exec_code_legacy(CODE)
+    legacy = (time.perf_counter() - t1) / RUNS
+
+    get_code_worker_pool().start()
+    print("warm-up:", (await exec_code(CODE)).strip())
+    t1 = time.perf_counter()
+    for _ in range(RUNS):
+        await exec_code(CODE)
+    pooled = (time.perf_counter() - t1) / RUNS
+
+    print(f"process per call: {legacy * 1000:.1f}ms/run")
+    print(f"warm worker pool: {pooled * 1000:.1f}ms/run")
+
+    t1 = time.perf_counter()
+    print(await exec_code("import time\nwhile time.time() > 0: pass", timeout=1), f"({time.perf_counter() - t1:.1f}s)")
+    print("after timeout:", (await exec_code(CODE)).strip())
+    get_code_worker_pool().close()
+
+
+if __name__ == "__main__":
+    test_worker_isolation()
+    asyncio.run(main())
@@ -0,0 +1,103 @@
+"""Benchmark of chunk retrieval against head truncation for ExtractLongTextOp.
+
+For every (page, query) case the text that would be sent to the LLM is
+built twice at the same token budget: the head of the page, as before,
+and the BM25-selected chunks of :meth:`ExtractLongTextOp.retrieve`. The
+benchmark reports Qwen tokens sent and recall, the share of the expected facts
+(section titles, plus the last table row of the section on synthetic
+pages) contained in the text sent. No LLM is called.
+
+Saved THS pages are read from ``tool_cache/ths_pages/<code>_<tag>.md``
+(Markdown as returned by ``Crawl4aiOp``); without them, synthetic pages of
+the same shape are used.
+"""
+
+import asyncio
+import random
+from pathlib import Path
+
+from finance_mcp.core.extract import ExtractLongTextOp
+from finance_mcp.core.utils import get_token_counter, truncate_to_budget
+
+PAGES_DIR = Path("tool_cache/ths_pages")
+BUDGET_TOKENS = 4000
+
+# (tag, query, facts expected in the text sent); facts are section titles on real pages.
+CASES = [
+    ("holder", "十大流通股东有哪些，持股比例多少", ["十大流通股东"]),
+    ("holder", "股东人数变化", ["股东人数"]),
+    ("operate", "主营构成分析，各产品收入占比", ["主营构成分析"]),
+    ("bonus", "历年分红方案", ["分红情况"]),
+    ("equity", "限售股解禁时间表", ["解禁时间表"]),
+    ("finance", "杜邦分析 净资产收益率", ["杜邦分析"]),
+]
+
+SECTIONS = {
+    "holder": ["股东人数", "十大流通股东", "十大股东", "十大债券持有人", "控股层级关系"],
+    "operate": ["主营介绍", "运营业务数据", "主营构成分析", "主要客户及供应商", "董事会经营评述"],
+    "bonus": ["分红诊断", "增发机构获配明细", "增发概况", "配股概况", "分红情况"],
+    "equity": ["总股本构成", "A股结构图", "历次股本变动", "解禁时间表"],
+    "finance": ["财务诊断", "财务指标", "指标变动说明", "资产负债构成", "财务报告", "杜邦分析"],
+}
+
+
+def synthetic_page(tag: str, rng: random.Random, last_rows: dict) -> str:
+    """A THS-like Markdown page: navigation, then one table per section.
+
+    The last row of every section is recorded in ``last_rows`` by title.
+    """
+    parts = ["[首页](/) | [公司资料](/company) | [股东研究](/holder) | [经营分析](/operate)\n"]
+    for title in SECTIONS[tag]:
+        rows = [
+            f"| {2024 - i}-12-31 | {rng.uniform(1, 900):.2f}亿 | {rng.uniform(-30, 30):.2f}% | 机构{rng.randint(1, 99)} |"
+            for i in range(rng.randint(20, 60))
+        ]
+        last_rows[title] = rows[-1]
+        parts.append(f"## {title}\n\n| 报告期 | 金额 | 同比 | 备注 |\n| --- | --- | --- | --- |\n" + "\n".join(rows) + "\n")
+    return "\n".join(parts)
+
+
+def load_pages() -> tuple[dict, dict]:
+    """Saved pages keyed by tag, or synthetic ones, and the known last rows of their sections."""
+    pages, last_rows = {}, {}
+    for path in sorted(PAGES_DIR.glob("*.md")):
+        tag = path.stem.rsplit("_", 1)[-1]
+        pages.setdefault(tag, path.read_text(encoding="utf-8"))
+    if pages:
+        print(f"using {len(pages)} saved pages from {PAGES_DIR}")
+        return pages, last_rows
+    print(f"no saved pages in {PAGES_DIR}, using synthetic pages")
+    rng = random.Random(0)
+    return {tag: synthetic_page(tag, rng, last_rows) for tag in SECTIONS}, last_rows
+
+
+async def main():
+    """Compare head truncation and retrieval on every case."""
+    counter = get_token_counter()
+    pages, last_rows = load_pages()
+    op = ExtractLongTextOp(max_content_tokens=BUDGET_TOKENS)
+
+    totals = {"head": [0, 0.0], "retrieve": [0, 0.0]}
+    print(f"{'query':<24} {'page tok':>8} {'head tok':>8} {'recall':>6} {'retr tok':>8} {'recall':>6}")
+    for tag, query, facts in CASES:
+        page = pages.get(tag)
+        if page is None:
+            continue
+        facts = facts + [last_rows[f] for f in facts if f in last_rows]
+        sent = {"head": truncate_to_budget(page, BUDGET_TOKENS), "retrieve": await op.retrieve(page, query)}
+        row = [f"{query[:22]:<24}", f"{counter.count(page):>8}"]
+        for name, text in sent.items():
+            tokens = counter.count(text)
+            recall = sum(fact in text for fact in facts) / len(facts)
+            totals[name][0] += tokens
+            totals[name][1] += recall
+            row += [f"{tokens:>8}", f"{recall:>6.2f}"]
+        print(" ".join(row))
+
+    n = len([c for c in CASES if c[0] in pages])
+    for name, (tokens, recall) in totals.items():
+        print(f"{name:<8} avg tokens sent {tokens / n:8.0f}  avg recall {recall / n:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
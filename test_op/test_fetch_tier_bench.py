@@ -0,0 +1,128 @@
+"""Benchmark of the HTTP fetch tier against the headless browser tier.
+
+A local server (in its own process, so its CPU is not counted) serves a
+synthetic GBK-encoded page shaped like a THS section: navigation, scripts
+and several data tables. Both tiers fetch it ``PAGES`` times with
+``CONCURRENCY`` requests in flight and report wall-clock throughput and
+throughput per core, i.e. pages per CPU-second consumed by this process and
+its children (Chromium included).
+"""
+
+import asyncio
+import multiprocessing
+import os
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import psutil
+from crawl4ai import CacheMode, CrawlerRunConfig
+
+from finance_mcp.core.crawl.browser_pool import BrowserPool
+from finance_mcp.core.crawl.http_fetcher import HttpFetcher, js_render_reason
+
+PAGES = 200
+CONCURRENCY = 8
+PORT = 8765
+
+
+def build_page() -> bytes:
+    """A THS-like page: scripts, navigation and wide financial tables."""
+    nav = "".join(f'<li><a href="/600519/{tag}.html">{tag}</a></li>' for tag in ["company", "holder", "finance"])
+    rows = "".join(
+        f"<tr><td>2024-{m:02d}</td><td>{1000 + m * 17.5:.2f}</td><td>{m * 1.3:.2f}%</td><td>盈利</td></tr>"
+        for m in range(1, 13)
+    )
+    tables = "".join(
+        f"<h2>主要财务指标 {i}</h2><table><tr><th>报告期</th><th>营业收入</th><th>同比</th><th>备注</th></tr>{rows}</table>"
+        for i in range(20)
+    )
+    scripts = "<script>" + "var x = 1;" * 2000 + "</script>"
+    page = (
+        '<html><head><meta charset="gbk"><title>贵州茅台</title>'
+        f"{scripts}</head><body><ul>{nav}</ul><h1>贵州茅台(600519) 财务分析</h1>{tables}</body></html>"
+    )
+    return page.encode("gbk")
+
+
+def serve(port: int):
+    """Serve the synthetic page until terminated."""
+    body = build_page()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):  # noqa: N802
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def cpu_seconds(exclude_pid: int) -> float:
+    """CPU time of this process and its children, except the page server."""
+    process = psutil.Process()
+    total = sum(process.cpu_times()[:2])
+    for child in process.children(recursive=True):
+        if child.pid == exclude_pid:
+            continue
+        try:
+            total += sum(child.cpu_times()[:2])
+        except psutil.NoSuchProcess:
+            pass
+    return total
+
+
+async def run_tier(name: str, fetch, server_pid: int):
+    """Fetch the page ``PAGES`` times and print throughput figures."""
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    url = f"http://127.0.0.1:{PORT}/600519/finance.html"
+
+    async def one():
+        async with semaphore:
+            return await fetch(url)
+
+    await one()  # warm-up (connection pool / browser launch)
+    cpu, t1 = cpu_seconds(server_pid), time.perf_counter()
+    results = await asyncio.gather(*[one() for _ in range(PAGES)])
+    wall, cpu = time.perf_counter() - t1, cpu_seconds(server_pid) - cpu
+
+    chars = len(results[0].markdown or "")
+    print(
+        f"{name:<8} {PAGES / wall:8.1f} pages/s  {PAGES / cpu:8.1f} pages/CPU-s  "
+        f"{cpu / PAGES * 1000:6.1f} CPU-ms/page  markdown={chars} chars",
+    )
+    return results[0]
+
+
+async def main():
+    """Run both tiers against the local page server."""
+    server = multiprocessing.Process(target=serve, args=(PORT,), daemon=True)
+    server.start()
+    time.sleep(0.5)
+
+    try:
+        fetcher = HttpFetcher()
+        page = await run_tier("http", fetcher.get, server.pid)
+        print("js_render_reason:", js_render_reason(page.url, page))
+        await fetcher.aclose()
+
+        pool = BrowserPool(size=2, pages_per_browser=CONCURRENCY // 2)
+        config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+        try:
+            await run_tier("browser", lambda url: pool.arun(url, config), server.pid)
+        except Exception as e:  # noqa: BLE001
+            print(f"browser  skipped: {type(e).__name__}: {str(e).splitlines()[0]}")
+        finally:
+            await pool.close()
+    finally:
+        server.terminate()
+
+    print(f"cores available: {os.cpu_count()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
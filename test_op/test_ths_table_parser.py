@@ -0,0 +1,135 @@
+"""Checks of ``parse_ths_tables`` and ``ThsTableExtractOp`` on a synthetic THS page.
+
+The page mimics the THS F10 layout: ``m_box`` sections with an ``hd`` title,
+tables with merged header and body cells, magnitude suffixes, placeholders
+and label/value tables. No network or LLM is used.
+"""
+
+from finance_mcp.core.crawl.crawl_profiles import get_crawl_profile
+from finance_mcp.core.extract import ThsTableExtractOp
+from finance_mcp.core.extract.ths_table_parser import parse_ths_tables
+
+PAGE = """
+<html><body>
+<div class="m_box" id="holder">
+  <div class="hd"><h2>十大流通股东</h2></div>
+  <div class="bd">
+    <table>
+      <thead><tr><th>股东名称</th><th>持股数量</th><th>占流通股比例</th><th>变动</th></tr></thead>
+      <tbody>
+        <tr><td>香港中央结算有限公司</td><td>1.2亿</td><td>12.5%</td><td>增加</td></tr>
+        <tr><td>中国证券金融股份有限公司</td><td>3500万</td><td>3.65%</td><td>--</td></tr>
+      </tbody>
+    </table>
+    <table>
+      <tr><th>截止日期</th><td>2024-03-31</td><th>合计持股</th><td>1.55亿</td></tr>
+      <tr><th>公告日期</th><td>20240420</td><th>股东户数</th><td>--</td></tr>
+    </table>
+  </div>
+</div>
+<div class="m_box" id="operate">
+  <div class="hd"><h2>主营构成分析</h2></div>
+  <div class="bd">
+    <table>
+      <tr><th rowspan="2">报告期</th><th rowspan="2">产品</th><th colspan="2">营业收入</th></tr>
+      <tr><th>金额</th><th>占比</th></tr>
+      <tr><td rowspan="2">20231231</td><td>零售业务</td><td>800.5亿</td><td>48.2%</td></tr>
+      <tr><td>对公业务</td><td>860亿</td><td>51.8%</td></tr>
+      <tr><td colspan="2">合计</td><td>1660.5亿</td><td>100%</td></tr>
+    </table>
+  </div>
+</div>
+<div class="m_box" id="bonus">
+  <div class="hd"><h2>分红情况</h2></div>
+  <div class="bd">
+    <table>
+      <tr><th>报告期</th><th>每股派息</th></tr>
+      <tr><td>20240331</td><td>0.72元</td></tr>
+      <tr><td>20231231</td><td>--</td></tr>
+    </table>
+  </div>
+</div>
+</body></html>
+"""
+
+
+def test_parse_ths_tables():
+    """Titles, merged cells, stacked headers, value typing and key-value tables."""
+    holders, summary, business, bonus = parse_ths_tables(PAGE)
+
+    # Titles come from the section heading; an untitled table does not borrow the previous one.
+    assert holders.title == "十大流通股东"
+    assert summary.title == ""
+    assert business.title == "主营构成分析"
+
+    # 万/亿/% typing and placeholders.
+    assert list(holders.frame.columns) == ["股东名称", "持股数量", "占流通股比例", "变动"]
+    assert holders.frame["持股数量"].tolist() == [1.2e8, 3.5e7]
+    assert holders.frame["占流通股比例"].tolist() == [12.5, 3.65]
+    assert holders.to_dict()["rows"][1][3] is None
+
+    # Key-value table: label and value cells alternate.
+    assert list(summary.frame.columns) == ["字段", "值"]
+    pairs = dict(summary.to_dict()["rows"])
+    assert pairs["截止日期"] == "2024-03-31" and pairs["合计持股"] == "1.55亿" and pairs["股东户数"] is None
+
+    # Multi-row header with rowspan/colspan, rowspan and colspan body cells.
+    frame = business.frame
+    assert list(frame.columns) == ["报告期", "产品", "营业收入_金额", "营业收入_占比"]
+    assert frame["报告期"].tolist() == ["20231231", "20231231", "合计"]
+    assert frame["产品"].tolist() == ["零售业务", "对公业务", "合计"]
+    assert frame["营业收入_金额"].tolist() == [8.005e10, 8.6e10, 1.6605e11]
+    assert frame["营业收入_占比"].tolist() == [48.2, 51.8, 100.0]
+
+    # All-date columns become ISO dates rather than numbers.
+    assert bonus.title == "分红情况"
+    assert bonus.frame["报告期"].tolist() == ["2024-03-31", "2023-12-31"]
+    assert bonus.to_dict()["rows"] == [["2024-03-31", 0.72], ["2023-12-31", None]]
+
+
+def test_ths_table_extract_op_select_and_budget():
+    """Query-based table selection and the token budget of the JSON output."""
+    op = ThsTableExtractOp(max_content_tokens=4000)
+    tables = parse_ths_tables(PAGE)
+
+    assert [t.title for t in op.select(tables, "十大流通股东持股比例")] == ["十大流通股东"]
+    assert [t.title for t in op.select(tables, "主营构成分析 营业收入")] == ["主营构成分析"]
+    assert op.select(tables, "董事会成员名单") == []
+
+    op.max_content_tokens = 60
+    text = op.to_json(tables)
+    assert op.content_length(text) <= 60 or text.count('"title"') == 1
+    assert text.startswith("[") and text.endswith("]")
+
+
+def test_ths_profile_keeps_tab_sections():
+    """The ``ths`` profile keeps a tab's data sections and drops the other ``m_box`` blocks."""
+    page = """
+    <html><body>
+    <div class="header">nav</div>
+    <div class="m_box" id="holdernum"><table><tr><td>股东人数</td></tr></table></div>
+    <div class="m_box" id="hotstock"><table><tr><td>热门股票</td></tr></table></div>
+    <div class="m_box" id="flowholder"><table><tr><td>十大流通股东</td></tr></table></div>
+    </body></html>
+    """
+    profile = get_crawl_profile("ths")
+    pruned = profile.prune(page, "https://basic.10jqka.com.cn/600519/holder.html#stockpage")
+    assert "股东人数" in pruned and "十大流通股东" in pruned
+    assert pruned.index("股东人数") < pruned.index("十大流通股东")
+    assert "热门股票" not in pruned and "nav" not in pruned
+
+    # A tab whose section ids are unknown falls back to every ``m_box``.
+    pruned = profile.prune(page, "https://basic.10jqka.com.cn/600519/bonus.html")
+    assert "股东人数" in pruned and "热门股票" in pruned
+
+
+def main():
+    """Run the checks without pytest."""
+    test_parse_ths_tables()
+    test_ths_table_extract_op_select_and_budget()
+    test_ths_profile_keeps_tab_sections()
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
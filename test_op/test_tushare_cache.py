@@ -0,0 +1,72 @@
+"""Checks of the per-stock range partitions of ``TushareCache``.
+
+A fake loader records every range the cache requests; a fake clock moves
+the cache's notion of "today" and ``time.time()`` forward.
+"""
+
+import tempfile
+
+import pandas as pd
+
+from finance_mcp.core.findata import tushare_cache
+from finance_mcp.core.findata.tushare_cache import TushareCache
+
+
+class FakeClock:
+    """Replaces ``TushareCache.today`` and the module's ``time.time``."""
+
+    def __init__(self, today: str, now: float):
+        self.today = today
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance_day(self):
+        self.today = TushareCache.shift_date(self.today, 1)
+        self.now += 24 * 3600
+
+
+def make_cache(clock: FakeClock, cache_dir: str) -> TushareCache:
+    cache = TushareCache(cache_dir=cache_dir)
+    cache.today = lambda: clock.today
+    tushare_cache.time = clock
+    return cache
+
+
+def test_intraday_day_refetched_after_rollover():
+    """A range fetched intraday is re-requested from that day once the date rolls over."""
+    original_time = tushare_cache.time
+    clock = FakeClock("20240603", 1_717_400_000.0)
+    requests = []
+
+    def loader(ts_code, start_date, end_date):
+        requests.append((start_date, end_date))
+        return pd.DataFrame({"ts_code": [ts_code], "trade_date": [end_date], "close": [1.0]})
+
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = make_cache(clock, cache_dir)
+            params = {"ts_code": "000001.SZ", "start_date": "20240601", "end_date": "20240603"}
+            cache.fetch("daily", None, params, loader)
+            assert requests == [("20240601", "20240603")]
+
+            # Same day, within the TTL: served from the cache.
+            cache.fetch("daily", None, params, loader)
+            assert len(requests) == 1
+
+            clock.advance_day()
+            cache.fetch("daily", None, params, loader)
+            assert requests[-1] == ("20240603", "20240603"), requests
+    finally:
+        tushare_cache.time = original_time
+
+
+def main():
+    """Run the checks without pytest."""
+    test_intraday_day_refetched_after_rollover()
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Micro-benchmark for the pooled keep-alive session in ``TushareClient``.
+
+The script starts a local stand-in for the Tushare HTTP endpoint and compares
+per-request latency of bare ``requests.post`` calls (one connection per call)
+against ``TushareClient.request`` reusing pooled keep-alive connections.
+"""
+
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+os.environ.setdefault("TUSHARE_API_TOKEN", "local-benchmark")
+os.environ.setdefault("NO_PROXY", "*")
+
+from finance_mcp.core.findata import TushareClient  # noqa: E402
+
+HOST = "127.0.0.1"
+PORT = 18090
+ROUNDS = 500
+
+PAYLOAD = json.dumps(
+    {
+        "code": 0,
+        "msg": "",
+        "data": {
+            "fields": ["ts_code", "trade_date", "close"],
+            "items": [["000001.SZ", f"202501{i:02d}", 10.0 + i] for i in range(1, 21)],
+            "has_more": False,
+        },
+    },
+).encode("utf-8")
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answer every POST with a fixed Tushare-shaped payload."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):  # noqa: N802
+        """Drain the request body and reply with ``PAYLOAD``."""
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PAYLOAD)))
+        self.end_headers()
+        self.wfile.write(PAYLOAD)
+
+    def log_message(self, *_args):
+        """Silence per-request access logs."""
+
+
+def main() -> None:
+    """Run both variants against the stand-in server and print latencies."""
+    server = ThreadingHTTPServer((HOST, PORT), StandInHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://{HOST}:{PORT}/dataapi"
+    body = {"api_name": "daily", "token": "x", "params": {"ts_code": "000001.SZ"}}
+
+    t1 = time.perf_counter()
+    for _ in range(ROUNDS):
+        requests.post(url=url, json=body, timeout=10).json()
+    no_pool = (time.perf_counter() - t1) / ROUNDS * 1000
+
+    with TushareClient(url=url) as client:
+        t1 = time.perf_counter()
+        for _ in range(ROUNDS):
+            client.request("daily", ts_code="000001.SZ")
+        pooled = (time.perf_counter() - t1) / ROUNDS * 1000
+
+    server.shutdown()
+    print(f"requests.post (no pool): {no_pool:.3f} ms/request")
+    print(f"TushareClient (pooled):  {pooled:.3f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
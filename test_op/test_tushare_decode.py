@@ -0,0 +1,78 @@
+"""Benchmark of ``TushareClient`` response decoding on a 1M-row payload.
+
+The synthetic ``daily`` payload is split into 10k-row pages, as Tushare
+returns it. The legacy path (``json`` + one ``pd.DataFrame`` per page +
+``pd.concat``) is compared with the current path (``orjson`` + per-page
+column arrays + a single final assembly) on decode time and
+``tracemalloc`` peak memory.
+"""
+
+import json
+import time
+import tracemalloc
+
+import pandas as pd
+
+from finance_mcp.core.findata.tushare_client import TushareClient, _loads
+
+ROWS = 1_000_000
+PAGE_SIZE = 10_000
+FIELDS = ["ts_code", "trade_date", "open", "high", "low", "close", "pre_close", "change", "pct_chg", "vol", "amount"]
+
+
+def build_pages() -> list[bytes]:
+    """Serialize the synthetic data set as raw Tushare JSON pages."""
+    pages = []
+    for start in range(0, ROWS, PAGE_SIZE):
+        items = [
+            [f"{i % 5000:06d}.SZ", f"2025{i % 12 + 1:02d}{i % 28 + 1:02d}"] + [10.0 + (i % 100) / 7] * 9
+            for i in range(start, start + PAGE_SIZE)
+        ]
+        payload = {"code": 0, "data": {"fields": FIELDS, "items": items, "has_more": start + PAGE_SIZE < ROWS}}
+        pages.append(json.dumps(payload).encode("utf-8"))
+    return pages
+
+
+def decode_legacy(pages: list[bytes]) -> pd.DataFrame:
+    """Per-page DataFrame construction followed by ``pd.concat``."""
+    df_list = []
+    for page in pages:
+        data = json.loads(page)["data"]
+        df_list.append(pd.DataFrame(data["items"], columns=data["fields"]))
+    return pd.concat(df_list, axis=0, ignore_index=True)
+
+
+def decode_current(pages: list[bytes]) -> pd.DataFrame:
+    """The decode path used by ``TushareClient.request_remote``."""
+    chunks: dict = {}
+    columns: list = []
+    for page in pages:
+        fields, page_items, _ = TushareClient._parse_response(_loads(page))
+        columns = columns or fields
+        TushareClient._decode_page("daily", fields, page_items, chunks)
+    return TushareClient._build_frame(columns, chunks)
+
+
+def measure(name: str, fn, pages: list[bytes]) -> None:
+    """Print wall time and traced peak memory of one decode function."""
+    t1 = time.perf_counter()
+    df = fn(pages)
+    elapsed = time.perf_counter() - t1
+    del df
+
+    tracemalloc.start()
+    df = fn(pages)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{name}: rows={len(df)} time={elapsed:.2f}s peak={peak / 2**20:.0f}MiB")
+
+
+def main() -> None:
+    """Run both decoders over the same payload."""
+    pages = build_pages()
+    measure("legacy  (json + per-page concat)", decode_legacy, pages)
+    measure("current (orjson + single build) ", decode_current, pages)
+
+
+if __name__ == "__main__":
+    main()
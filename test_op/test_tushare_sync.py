@@ -0,0 +1,72 @@
+"""Checks of ``TushareSyncer`` against a fake client serving a fixed table.
+
+The fake client answers ``trade_cal`` and ``daily`` requests from memory and
+returns only the requested fields, like Tushare does.
+"""
+
+import tempfile
+
+import pandas as pd
+
+from finance_mcp.core.findata.tushare_cache import TushareCache
+from finance_mcp.core.findata.tushare_sync import TushareSyncer
+
+TRADE_DATES = ["20240603", "20240604", "20240605"]
+CODES = ["000001.SZ", "000002.SZ", "000003.SZ"]
+
+
+class FakeClient:
+    """Stand-in for ``TushareClient``; ``000003.SZ`` is suspended after the first day."""
+
+    def __init__(self, cache: TushareCache):
+        self.cache = cache
+        self.rows = pd.DataFrame(
+            [
+                {"ts_code": code, "trade_date": day, "close": 1.0}
+                for day in TRADE_DATES
+                for code in CODES
+                if code != "000003.SZ" or day == TRADE_DATES[0]
+            ],
+        )
+
+    def request(self, api_name: str, **params) -> pd.DataFrame:
+        assert api_name == "trade_cal"
+        days = [d for d in TRADE_DATES if params["start_date"] <= d <= params["end_date"]]
+        return pd.DataFrame({"cal_date": days})
+
+    def request_remote(self, api_name: str, fields=None, **params) -> pd.DataFrame:
+        assert api_name == "daily"
+        df = self.rows
+        if "trade_date" in params:
+            df = df[df["trade_date"] == params["trade_date"]]
+        else:
+            df = df[df["ts_code"] == params["ts_code"]]
+            df = df[(df["trade_date"] >= params["start_date"]) & (df["trade_date"] <= params["end_date"])]
+        return df[fields or list(df.columns)].reset_index(drop=True)
+
+
+def test_sync_with_fields_lacking_keys():
+    """``fields`` without ``ts_code``/date still syncs; stocks without new rows are not counted."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = TushareCache(cache_dir=cache_dir)
+        cache.today = lambda: TRADE_DATES[-1]
+        syncer = TushareSyncer(FakeClient(cache), cache)
+
+        stats = syncer.sync("daily", CODES, end_date=TRADE_DATES[0], start_date=TRADE_DATES[0], fields=["close"])
+        assert stats["full"] == 3, stats
+
+        # Three stocks behind over two days: pulled market-wide and split by ts_code.
+        stats = syncer.sync("daily", CODES, fields=["close"])
+        assert stats["days"] == 2, stats
+        assert stats["delta"] == 2 and stats["rows"] == 4, stats
+        assert syncer.get_last_synced_date("daily", "000003.SZ", ["close", "ts_code", "trade_date"]) is not None
+
+
+def main():
+    """Run the checks without pytest."""
+    test_sync_with_fields_lacking_keys()
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()